@@ -10,6 +10,9 @@ import os
 import config
 from utils import emojis
 from utils import emojis
+from utils.message_router import MessageRouter
+from utils.timer_wheel import TimerWheel
+from utils.channel_actor import ChannelActorPool
 # from database.db_manager import DatabaseManager # Removed SQLite manager
 
 # Intents
@@ -27,6 +30,9 @@ class WordChainBot(commands.Bot):
             help_command=None  # Sử dụng custom help command
         )
         self.db = None
+        self.router = MessageRouter()  # Một listener on_message chung cho các game chat
+        self.timers = TimerWheel()  # Bộ hẹn giờ dùng chung cho timeout của các game
+        self.actors = ChannelActorPool()  # Hàng đợi sự kiện tuần tự theo kênh
     
     async def setup_hook(self):
         """Load all cogs and initialize services"""
@@ -57,22 +63,12 @@ class WordChainBot(commands.Bot):
             print("  Please configure Supabase to continue.")
             raise ValueError("Missing Supabase Configuration")
         
-        # Load fallback word lists từ files
-        fallback_words = {'vi': set(), 'en': set()}
-        
-        try:
-            with open(config.WORDS_VI_PATH, 'r', encoding='utf-8') as f:
-                fallback_words['vi'] = set(line.strip().lower() for line in f if line.strip())
-            print(f"  ✅ Loaded {len(fallback_words['vi'])} Vietnamese fallback words")
-        except Exception as e:
-            print(f"  ⚠️  Could not load Vietnamese words: {e}")
-        
-        try:
-            with open(config.WORDS_EN_PATH, 'r', encoding='utf-8') as f:
-                fallback_words['en'] = set(line.strip().lower() for line in f if line.strip())
-            print(f"  ✅ Loaded {len(fallback_words['en'])} English fallback words")
-        except Exception as e:
-            print(f"  ⚠️  Could not load English words: {e}")
+        # Nạp lexicon một lần (mmap file .lex), dùng chung cho fallback, validator và admin cog
+        from utils.lexicon import get_lexicon
+        fallback_words = {}
+        for lang in config.SUPPORTED_LANGUAGES:
+            fallback_words[lang] = get_lexicon(lang)
+            print(f"  ✅ Loaded {len(fallback_words[lang])} {lang} lexicon words")
         
         # Initialize service với API enabled và fallback words
         await init_dictionary_service(
@@ -87,6 +83,9 @@ class WordChainBot(commands.Bot):
         else:
             print(f"  ℹ️  Using local dictionary only")
         
+        self.add_listener(self.router.dispatch, 'on_message')
+        self.timers.start()
+        
         print("🔄 Loading cogs...")
         
         # Load cogs
@@ -110,6 +109,9 @@ class WordChainBot(commands.Bot):
             except Exception as e:
                 print(f"  ❌ Failed to load {cog}: {e}")
         
+        # Khôi phục game dở dang từ lần chạy trước
+        await self.recover_games()
+        
         # Sync commands
         print("🔄 Syncing slash commands...")
         try:
@@ -118,6 +120,44 @@ class WordChainBot(commands.Bot):
         except Exception as e:
             print(f"  ❌ Failed to sync commands: {e}")
     
+    async def recover_games(self):
+        """Cog có restore_games: nạp lại game đang dở (deadline lượt chơi, snapshot game trong RAM)"""
+        print("🔄 Recovering games...")
+        try:
+            snapshots = await self.db.pop_game_snapshots()
+        except Exception as e:
+            print(f"  ❌ Failed to load game snapshots: {e}")
+            snapshots = []
+        
+        for cog in list(self.cogs.values()):
+            restore = getattr(cog, 'restore_games', None)
+            if not restore:
+                continue
+            game_type = getattr(cog, 'GAME_TYPE', None)
+            try:
+                restored = await restore([s for s in snapshots if s['game_type'] == game_type])
+                if restored:
+                    print(f"  ♻️  {cog.qualified_name}: {restored} game(s)")
+            except Exception as e:
+                print(f"  ❌ Failed to recover {cog.qualified_name}: {e}")
+    
+    async def snapshot_games(self):
+        """Ghi snapshot các game chỉ sống trong RAM trước khi cog unload (deploy / restart)"""
+        rows = []
+        for cog in list(self.cogs.values()):
+            snapshot = getattr(cog, 'snapshot_games', None)
+            if not snapshot:
+                continue
+            for channel_id, data in snapshot().items():
+                rows.append({'channel_id': channel_id, 'game_type': cog.GAME_TYPE, 'data': data})
+        
+        if rows and self.db:
+            try:
+                await self.db.save_game_snapshots(rows)
+                print(f"  💾 Saved {len(rows)} game snapshot(s)")
+            except Exception as e:
+                print(f"  ❌ Failed to save game snapshots: {e}")
+    
     async def on_ready(self):
         """Bot is ready"""
         print("\n" + "="*50)
@@ -190,10 +230,21 @@ class WordChainBot(commands.Bot):
     async def close(self):
         """Cleanup khi bot shutdown"""
         from utils.dictionary_api import close_dictionary_service
+        from utils.http_client import close_http_session
         
         print(f"\n{emojis.END} Shutting down...")
         await close_dictionary_service()
+        await self.snapshot_games()
         await super().close()
+        # Cog đã unload, không còn ai đặt timer
+        await self.timers.stop()
+        await self.actors.close()
+        # Sau khi cog unload (donation monitor cũng dùng session chung)
+        await close_http_session()
+        
+        # Đóng database sau cùng (cog unload còn cần flush dữ liệu)
+        if self.db:
+            await self.db.close()
 
 
 def main():
@@ -4,11 +4,12 @@ Admin/Challenge Cog - Chế độ thách đấu bot và lệnh admin
 import discord
 from discord.ext import commands
 from discord import app_commands
-import random
 
 import config
 from utils import embeds, emojis
 from utils.validator import WordValidator
+from utils.lexicon import get_lexicon
+from utils.bot_engine import DEFAULT_DIFFICULTY
 
 
 class AdminCog(commands.Cog):
@@ -31,41 +32,35 @@ class AdminCog(commands.Cog):
             await ctx.send(f"❌ Failed to sync: {e}")
     
     async def cog_load(self):
-        """Load validators"""
-        # Load word lists
-        try:
-            with open(config.WORDS_VI_PATH, 'r', encoding='utf-8') as f:
-                words_vi = [line.strip() for line in f if line.strip()]
-            self.validators['vi'] = WordValidator('vi', words_vi)
-        except Exception as e:
-            print(f"❌ Error loading Vietnamese words: {e}")
-        
-        try:
-            with open(config.WORDS_EN_PATH, 'r', encoding='utf-8') as f:
-                words_en = [line.strip() for line in f if line.strip()]
-            self.validators['en'] = WordValidator('en', words_en)
-        except Exception as e:
-            print(f"❌ Error loading English words: {e}")
+        """Load validators (lexicon dùng chung với GameCog và dictionary service)"""
+        for lang in config.SUPPORTED_LANGUAGES:
+            self.validators[lang] = WordValidator(lang, get_lexicon(lang))
     
     @app_commands.command(name="challenge-bot", description="🤖 Thách đấu bot 1vs1!")
     @app_commands.describe(
         language="Chọn ngôn ngữ",
-        difficulty="Độ khó (chưa implement, bot luôn ở chế độ khó)"
+        difficulty="Độ khó của bot"
     )
     @app_commands.choices(
         language=[
             app_commands.Choice(name="🇻🇳 Tiếng Việt", value="vi"),
             app_commands.Choice(name="🇬🇧 English", value="en")
+        ],
+        difficulty=[
+            app_commands.Choice(name="🟢 Dễ", value="easy"),
+            app_commands.Choice(name="🟡 Thường", value="normal"),
+            app_commands.Choice(name="🔴 Khó", value="hard")
         ]
     )
     async def challenge_bot(
         self, 
         interaction: discord.Interaction,
         language: app_commands.Choice[str] = None,
-        difficulty: str = "hard"
+        difficulty: app_commands.Choice[str] = None
     ):
         """Thách đấu bot 1vs1"""
         lang = language.value if language else config.DEFAULT_LANGUAGE
+        level = difficulty.value if difficulty else DEFAULT_DIFFICULTY
         
         # Kiểm tra game đang chơi
         if await self.db.is_game_active(interaction.channel_id):
@@ -77,38 +72,43 @@ class AdminCog(commands.Cog):
         
         # Chọn từ đầu tiên
         validator = self.validators.get(lang)
-        if not validator:
+        if not validator or not len(validator.lexicon):
             await interaction.response.send_message(
                 f"{emojis.WRONG} Ngôn ngữ không được hỗ trợ!",
                 ephemeral=True
             )
             return
         
-        first_word = random.choice(list(validator.word_list))
+        first_word = validator.lexicon.random_word()
         
-        # Tạo game với bot
-        await self.db.create_game(
+        # Game session do GameCog quản lý
+        game_cog = self.bot.get_cog('GameCog')
+        if not game_cog:
+            await interaction.response.send_message(
+                f"{emojis.WRONG} Game nối từ chưa sẵn sàng!",
+                ephemeral=True
+            )
+            return
+        
+        # Tạo game với bot (bot nằm trong danh sách người chơi)
+        await game_cog.sessions.create(
             channel_id=interaction.channel_id,
             guild_id=interaction.guild_id,
             language=lang,
             first_word=first_word,
-            first_player_id=interaction.user.id,
-            is_bot_challenge=True
+            players=[interaction.user.id, self.bot.user.id],
+            is_bot_challenge=True,
+            bot_difficulty=level
         )
         
-        # Thêm bot vào danh sách người chơi
-        await self.db.add_player_to_game(interaction.channel_id, self.bot.user.id)
-        
         # Gửi thông báo bắt đầu
-        challenge_embed = embeds.create_bot_challenge_embed(difficulty)
+        challenge_embed = embeds.create_bot_challenge_embed(level)
         start_embed = embeds.create_game_start_embed(lang, first_word, interaction.user.mention)
         
         await interaction.response.send_message(embeds=[challenge_embed, start_embed])
         
-        # Lấy game cog để bắt đầu timeout
-        game_cog = self.bot.get_cog('GameCog')
-        if game_cog:
-            await game_cog.start_turn_timeout(interaction.channel_id, interaction.user.id)
+        # Bắt đầu timeout
+        await game_cog.start_turn_timeout(interaction.channel_id, interaction.user.id)
     
     @app_commands.command(name="add-coiz", description="➕ Thêm coiz cho người chơi (Owner only)")
     @app_commands.describe(
@@ -81,6 +81,9 @@ class BauCuaView(discord.ui.View):
         self.locked_balance = {} # {user_id: locked_amount}
         self.message = None
         self.stop_event = asyncio.Event()
+        self.phase = "betting"  # betting -> spinning (đã trừ tiền cược) 
+        self.charged = {} # {user_id: amount} đã trừ nhưng chưa trả thưởng (hoàn lại nếu bot tắt giữa chừng)
+        self.frozen = False # Đã snapshot lúc tắt bot: không cộng/trừ tiền thêm
         
         # Define sides with names and emojis
         self.sides = [
@@ -207,9 +210,12 @@ class BauCuaView(discord.ui.View):
             print(f"Error updating embed: {e}")
 
 class BauCuaCog(commands.Cog):
+    GAME_TYPE = 'baucua'
+
     def __init__(self, bot: commands.Bot, db):
         self.bot = bot
         self.db = db
+        self.rounds = {} # channel_id -> BauCuaView của ván đang diễn ra
         self.sides_map = {
             "Nai": emojis.SIDE_1,
             "Bầu": emojis.SIDE_2,
@@ -221,19 +227,57 @@ class BauCuaCog(commands.Cog):
         self.sides_list = list(self.sides_map.keys())
         self.emoji_list = [emojis.SIDE_1, emojis.SIDE_2, emojis.SIDE_3, emojis.SIDE_4, emojis.SIDE_5, emojis.SIDE_6]
 
+    def snapshot_games(self):
+        """Các ván đang dở lúc tắt bot (bot.snapshot_games), từ đây ván không cộng/trừ tiền nữa"""
+        snapshots = {}
+        for channel_id, view in self.rounds.items():
+            view.frozen = True
+            snapshots[channel_id] = {
+                "phase": view.phase,
+                "guild_id": view.message.guild.id if view.message and view.message.guild else 0,
+                "bets": {str(uid): bets for uid, bets in view.bets.items()},
+                "charged": {str(uid): amount for uid, amount in view.charged.items()}
+            }
+        return snapshots
+
+    async def restore_games(self, snapshots):
+        """Ván bị gián đoạn không quay tiếp được: hoàn tiền cược đã trừ và báo cho kênh"""
+        for snapshot in snapshots:
+            data = snapshot["data"]
+            refunds = []
+            for uid, amount in data["charged"].items():
+                await self.db.add_points(int(uid), data["guild_id"], amount)
+                refunds.append(f"<@{uid}>: +{amount:,.2f} {emojis.ANIMATED_EMOJI_COIZ}")
+
+            if refunds:
+                msg = "♻️ Bot vừa khởi động lại giữa ván Bầu Cua, đã hoàn tiền cược:\n" + "\n".join(refunds)
+            elif data["bets"]:
+                msg = "♻️ Ván Bầu Cua bị hủy do bot khởi động lại. Tiền cược chưa bị trừ!"
+            else:
+                continue
+            try:
+                await self.bot.get_partial_messageable(snapshot["channel_id"]).send(msg)
+            except discord.HTTPException:
+                pass
+        return len(snapshots)
+
+    def schedule_refresh(self, view: BauCuaView):
+        """Hẹn lần cập nhật tiếp theo trên timer wheel (1.0s)"""
+        self.bot.timers.schedule((view.message.channel.id, 'baucua_refresh'), 1.0, self.animate_waiting, view)
+
     async def animate_waiting(self, view: BauCuaView):
         """Keeps the embed updated while waiting"""
-        while not view.stop_event.is_set():
-            if view.message:
-                try:
-                    # Only update betting info, no animation needed
-                    await view.update_embed()
+        if view.stop_event.is_set():
+            return
+        try:
+            # Only update betting info, no animation needed
+            await view.update_embed()
 
-                except Exception as e:
-                    print(f"Update error: {e}")
-            
-            # Wait 1.0s to refresh betting info
-            await asyncio.sleep(1.0)
+        except Exception as e:
+            print(f"Update error: {e}")
+        
+        if not view.stop_event.is_set():
+            self.schedule_refresh(view)
 
     async def start_game(self, interaction: discord.Interaction):
         host_id = interaction.user.id
@@ -306,27 +350,30 @@ class BauCuaCog(commands.Cog):
         
         await interaction.response.send_message(embed=embed, view=view)
         view.message = await interaction.original_response()
+        self.rounds[interaction.channel_id] = view
         
-        # Start animation task
-        anim_task = asyncio.create_task(self.animate_waiting(view))
+        # Cập nhật danh sách cược mỗi giây
+        self.schedule_refresh(view)
         
         # Wait for timeout or manual stop
         await view.wait()
         
         # Ensure animation stops
         view.stop_event.set()
+        self.bot.timers.cancel((view.message.channel.id, 'baucua_refresh'))
         await asyncio.sleep(0.5) # Allow task to finish logic
-        anim_task.cancel()
 
         # Deduct Money First (Validation Phase)
         # We need to check if they STILL have money (since we didn't lock it in DB)
         # If they don't, we invalidate the bet.
         
         valid_bets = {} # {uid: {side: valid_amount}}
+        view.phase = "spinning"
         
         current_balances = {} # cache to avoid spamming DB
         
         for uid, user_bets in view.bets.items():
+            if view.frozen: return
             total_bet_req = sum(user_bets.values())
             
             # Get fresh balance
@@ -340,6 +387,7 @@ class BauCuaCog(commands.Cog):
                 valid_bets[uid] = user_bets
                 # Deduct now
                 await self.db.add_points(uid, interaction.guild_id, -total_bet_req)
+                view.charged[uid] = total_bet_req
                 current_balances[uid] -= total_bet_req
             else:
                 # Not enough funds anymore!
@@ -397,6 +445,7 @@ class BauCuaCog(commands.Cog):
         summary_lines = []
         
         for user_id, user_bets in valid_bets.items():
+            if view.frozen: return
             total_bet = sum(user_bets.values())
             total_payout = 0
             win_details = []
@@ -416,6 +465,7 @@ class BauCuaCog(commands.Cog):
             # Update DB if payout > 0
             if total_payout > 0:
                 await self.db.add_points(user_id, interaction.guild_id, total_payout)
+            view.charged.pop(user_id, None)
 
             net_outcome = total_payout - total_bet
             user_mention = f"<@{user_id}>"
@@ -449,6 +499,7 @@ class BauCuaCog(commands.Cog):
         else:
             end_embed.add_field(name="😅 Kết Quả", value="Không có người chơi nào đặt cược!", inline=False)
             
+        self.rounds.pop(interaction.channel_id, None)
         await view.message.edit(embed=end_embed)
 
     async def stop_game(self, interaction: discord.Interaction):
@@ -7,209 +7,14 @@ import json
 from typing import Optional, Dict
 import config
 from utils import emojis
+from utils.fishing_session import FishingSession
+from database.versioning import ConcurrentUpdateError
+from utils.fishing_data import (
+    RARITIES, BIOMES, RODS, ROD_LIST, BADGES, DRAGON_BALLS, BAITS, TREASURES, CHARMS, RARITY_VI
+)
+from utils import catch_tables
 
 
-# --- CONSTANTS & CONFIGURATION ---
-
-RARITIES = {
-    "Common":    {"color": 0x95A5A6, "chance": 80, "mul": 1.0, "emoji": "⚪"},
-    "Uncommon":  {"color": 0x2ECC71, "chance": 30, "mul": 2.5, "emoji": "🟢"},
-    "Rare":      {"color": 0x3498DB, "chance": 10, "mul": 5.0, "emoji": "🔵"},
-    "Epic":      {"color": 0x9B59B6, "chance": 5,  "mul": 15.0, "emoji": "🟣"},
-    "Legendary": {"color": 0xF1C40F, "chance": 1, "mul": 50.0, "emoji": "🟡"},
-    "Mythical":  {"color": 0xE74C3C, "chance": 0.01, "mul": 500.0, "emoji": "🔴"}
-}
-
-BIOMES = {
-    "River": {
-        "name": "Dòng Sông",
-        "desc": "Nơi bắt đầu của mọi cần thủ.",
-        "req_level": 1,
-        "req_money": 0,
-        "emoji": emojis.BIOME_RIVER,
-        "fish": [
-            {"name": "Cá Chép", "base_value": 10, "min_size": 10, "max_size": 30, "emoji": emojis.FISH_RAW, "spawn_rate": 35},
-            {"name": "Cá Diếp", "base_value": 20, "min_size": 5, "max_size": 20, "emoji": emojis.FISH_GOLDFISH, "spawn_rate": 30},
-            {"name": "Cá Hồi", "base_value": 30, "min_size": 30, "max_size": 60, "emoji": emojis.FISH_SALMON, "spawn_rate": 20},
-            {"name": "Cá Tuyết", "base_value": 40, "min_size": 40, "max_size": 80, "emoji": emojis.FISH_COD, "spawn_rate": 10},
-            {"name": "Cua", "base_value": 30, "min_size": 5, "max_size": 30, "emoji": emojis.FISH_CRAB, "spawn_rate": 15},
-            {"name": "Tôm", "base_value": 30, "min_size": 5, "max_size": 30, "emoji": emojis.FISH_SHRIMP, "spawn_rate": 15},
-            {"name": "Cá Koi", "base_value": 10000000, "min_size": 30, "max_size": 100, "emoji": emojis.KING_RIVER1, "spawn_rate": 0.02},
-            {"name": "Cá Vàng", "base_value": 2500000, "min_size": 5, "max_size": 30, "emoji": emojis.KING_RIVER2, "spawn_rate": 0.2},
-            {"name": "Mega Gyarados", "base_value": 50000000, "min_size": 300, "max_size": 1000, "emoji": emojis.KING_RIVER3, "spawn_rate": 0.01},
-            {"name": "Cá Mặt Trăng", "base_value": 100000, "min_size": 20, "max_size": 60, "emoji": emojis.KING_RIVER4, "spawn_rate": 0.05},
-            {"name": "Cá Xương", "base_value": 500000, "min_size": 5, "max_size": 30, "emoji": emojis.KING_RIVER5, "spawn_rate": 0.2},
-        ]
-    },
-    "Ocean": {
-        "name": "Đại Dương",
-        "desc": "Biển cả mênh mông với những loài cá lớn.",
-        "req_level": 5,
-        "req_money": 50000,
-        "emoji": emojis.BIOME_OCEAN,
-        "fish": [
-            {"name": "Cá Nhiệt Đới", "base_value": 50, "min_size": 10, "max_size": 30, "emoji": emojis.FISH_TROPICAL, "spawn_rate": 35},
-            {"name": "Cá Ngừ", "base_value": 100, "min_size": 50, "max_size": 150, "emoji": emojis.FISH_TUNA, "spawn_rate": 25},
-            {"name": "Cá Mập", "base_value": 300, "min_size": 200, "max_size": 500, "emoji": emojis.FISH_SHARK, "spawn_rate": 5},
-            {"name": "Cá Heo", "base_value": 500, "min_size": 150, "max_size": 300, "emoji": emojis.FISH_DOLPHIN, "spawn_rate": 10},
-            {"name": "Rùa Biển", "base_value": 200, "min_size": 50, "max_size": 100, "emoji": emojis.FISH_TURTLE, "spawn_rate": 15},
-            {"name": "Mực Ống", "base_value": 80, "min_size": 20, "max_size": 60, "emoji": emojis.FISH_SQUID, "spawn_rate": 10},
-            {"name": "Baby Dory", "base_value": 500000, "min_size": 5, "max_size": 30, "emoji": emojis.KING_OCEAN1, "spawn_rate": 0.05},
-            {"name": "Love Shark", "base_value": 25000000, "min_size": 200, "max_size": 800, "emoji": emojis.KING_OCEAN2, "spawn_rate": 0.02},
-            {"name": "Ngọc Trai", "base_value": 10000000, "min_size": 10, "max_size": 50, "emoji": emojis.KING_OCEAN3, "spawn_rate": 0.05},
-            {"name": "Jellyfish", "base_value": 100000, "min_size": 50, "max_size": 100, "emoji": emojis.KING_OCEAN4, "spawn_rate": 0.05},
-            {"name": "Aquaman", "base_value": 50000000, "min_size": 150, "max_size": 200, "emoji": emojis.KING_OCEAN5, "spawn_rate": 0.01},
-        ]
-    },
-    "Sky": {
-        "name": "Vùng Trời",
-        "desc": "Câu cá trên những đám mây.",
-        "req_level": 10,
-        "req_money": 100000,
-        "emoji": emojis.BIOME_SKY,
-        "fish": [
-            {"name": "Cá Cầu Vồng", "base_value": 800, "min_size": 30, "max_size": 100, "emoji": emojis.FISH_RAINBOW, "spawn_rate": 50},
-            {"name": "Cá Azure", "base_value": 1000, "min_size": 40, "max_size": 120, "emoji": emojis.FISH_AZURE, "spawn_rate": 35},
-            {"name": "Cá Kim Cương", "base_value": 2000, "min_size": 20, "max_size": 50, "emoji": emojis.FISH_DIAMOND, "spawn_rate": 15},
-            {"name": "Tiêm Kích F16", "base_value": 20000000, "min_size": 1000, "max_size": 2000, "emoji": emojis.KING_SKY1, "spawn_rate": 0.01},
-            {"name": "Phoenix", "base_value": 50000000, "min_size": 300, "max_size": 1000, "emoji": emojis.KING_SKY2, "spawn_rate": 0.005},
-            {"name": "Neon Dragon", "base_value": 100000000, "min_size": 500, "max_size": 2000, "emoji": emojis.KING_SKY3, "spawn_rate": 0.005},
-            {"name": "Mây", "base_value": 10000000, "min_size": 100, "max_size": 500, "emoji": emojis.KING_SKY4, "spawn_rate": 0.5},
-            {"name": "Cầu Vồng", "base_value": 10000000, "min_size": 100, "max_size": 500, "emoji": emojis.KING_SKY5, "spawn_rate": 0.5},
-        ]
-    },
-    "Volcano": {
-        "name": "Núi Lửa",
-        "desc": "Nóng bỏng tay, cá nướng tại chỗ.",
-        "req_level": 20,
-        "req_money": 500000,
-        "emoji": emojis.BIOME_VOLCANIC,
-        "fish": [
-            {"name": "Cá Nóng", "base_value": 1500, "min_size": 30, "max_size": 80, "emoji": emojis.FISH_HOTCOD, "spawn_rate": 50},
-            {"name": "Cá Dung Nham", "base_value": 3000, "min_size": 50, "max_size": 150, "emoji": emojis.FISH_LAVAFISH, "spawn_rate": 35},
-            {"name": "Cá Nóc Lửa", "base_value": 4000, "min_size": 40, "max_size": 90, "emoji": emojis.FISH_FIREPUFFER, "spawn_rate": 15},
-            {"name": "Altalavadrone", "base_value": 3000000, "min_size": 100, "max_size": 300, "emoji": emojis.KING_VOLCANIC1, "spawn_rate": 0.5},
-            {"name": "Fireheart", "base_value": 5000000, "min_size": 50, "max_size": 150, "emoji": emojis.KING_VOLCANIC2, "spawn_rate": 0.4},
-            {"name": "Netherstar", "base_value": 80000000, "min_size": 20, "max_size": 50, "emoji": emojis.KING_VOLCANIC3, "spawn_rate": 0.005},
-            {"name": "Netherite", "base_value": 50000000, "min_size": 30, "max_size": 80, "emoji": emojis.KING_VOLCANIC4, "spawn_rate": 0.05},
-            {"name": "Lavamerka", "base_value": 1000000, "min_size": 150, "max_size": 300, "emoji": emojis.KING_VOLCANIC5, "spawn_rate": 0.5},
-        ]
-    },
-    "Space": {
-        "name": "Vũ Trụ",
-        "desc": "Không trọng lực, cá siêu hiếm.",
-        "req_level": 40,
-        "req_money": 10000000,
-        "emoji": emojis.BIOME_SPACE,
-        "fish": [
-            {"name": "Cá Vũ Trụ", "base_value": 8000, "min_size": 100, "max_size": 300, "emoji": emojis.FISH_SPACE, "spawn_rate": 50},
-            {"name": "Cua Không Gian", "base_value": 10000, "min_size": 50, "max_size": 120, "emoji": emojis.FISH_SPACE_CRAB, "spawn_rate": 35},
-            {"name": "Cá Lục Bảo", "base_value": 15000, "min_size": 80, "max_size": 200, "emoji": emojis.FISH_EMERALD, "spawn_rate": 15},
-            {"name": "Meteor", "base_value": 100000000, "min_size": 5000, "max_size": 50000, "emoji": emojis.KING_SPACE1, "spawn_rate": 0.02},
-            {"name": "Milky Way", "base_value": 500000000, "min_size": 100000, "max_size": 500000, "emoji": emojis.KING_SPACE2, "spawn_rate": 0.001},
-            {"name": "Lọ Điều Ước", "base_value": 50000000, "min_size": 10, "max_size": 40, "emoji": emojis.KING_SPACE3, "spawn_rate": 0.5},
-            {"name": "Astronaut", "base_value": 80000000, "min_size": 150, "max_size": 250, "emoji": emojis.KING_SPACE4, "spawn_rate": 0.5},
-        ]
-    },
-    "Alien": {
-        "name": "Hành Tinh Lạ",
-        "desc": "Những sinh vật bí ẩn từ thế giới khác.",
-        "req_level": 60,
-        "req_money": 50000000,
-        "emoji": emojis.BIOME_ALIEN,
-        "fish": [
-            {"name": "Cá Ngoài Hành Tinh", "base_value": 25000, "min_size": 100, "max_size": 400, "emoji": emojis.FISH_ALIEN, "spawn_rate": 30},
-            {"name": "Vệ Binh Biển", "base_value": 40000, "min_size": 200, "max_size": 600, "emoji": emojis.FISH_GUARDIAN, "spawn_rate": 25},
-            {"name": "Axolotl Thần", "base_value": 50000, "min_size": 50, "max_size": 150, "emoji": emojis.FISH_AXOLOTL, "spawn_rate": 20},
-            {"name": "Mực Lục Bảo", "base_value": 60000, "min_size": 300, "max_size": 800, "emoji": emojis.FISH_EMERALD_SQUID, "spawn_rate": 15},
-            {"name": "Cá Ngựa Vằn", "base_value": 80000, "min_size": 100, "max_size": 200, "emoji": emojis.FISH_ZEBRA, "spawn_rate": 10},
-            {"name": "Alien Werk", "base_value": 200000000, "min_size": 100, "max_size": 300, "emoji": emojis.KING_ALIEN1, "spawn_rate": 0.05},
-            {"name": "Goku Ultra", "base_value": 1000000000, "min_size": 150, "max_size": 200, "emoji": emojis.KING_ALIEN2, "spawn_rate": 0.0001},
-            {"name": "Pink Among Us", "base_value": 10000000, "min_size": 50, "max_size": 150, "emoji": emojis.KING_ALIEN3, "spawn_rate": 0.1},
-            {"name": "Blueish UFO", "base_value": 150000000, "min_size": 500, "max_size": 2000, "emoji": emojis.KING_ALIEN4, "spawn_rate": 0.1},
-        ]
-    }
-}
-
-RODS = {
-    "Plastic Rod":    {"name": "Cần Nhựa",       "price": 0,          "power": 0,    "luck": 0,   "emoji": emojis.ROD_PLASTIC, "durability": None},
-    "Steel Rod":      {"name": "Cần Thép",       "price": 10000,       "power": 10,   "luck": 5,   "emoji": emojis.ROD_STEEL, "durability": 50},
-    "Alloy Rod":      {"name": "Cần Hợp Kim",    "price": 20000,      "power": 18,   "luck": 10,  "emoji": emojis.ROD_ALLOY, "durability": 80},
-    "Fiberglass Rod": {"name": "Cần Sợi Thủy Tinh", "price": 40000,   "power": 22,   "luck": 12,  "emoji": emojis.ROD_FIBERGLASS, "durability": 100},
-    "Golden Rod":     {"name": "Cần Vàng",       "price": 80000,      "power": 30,   "luck": 20,  "emoji": emojis.ROD_GOLDEN, "durability": 150},
-    "Floating Rod":   {"name": "Cần Nổi",        "price": 100000,      "power": 40,   "luck": 25,  "emoji": emojis.ROD_FLOATING, "durability": 180},
-    "Heavy Rod":      {"name": "Cần Hạng Nặng",  "price": 130000,      "power": 55,   "luck": 15,  "emoji": emojis.ROD_HEAVY, "durability": 200},
-    "Heavier Rod":    {"name": "Cần Siêu Nặng",  "price": 150000,      "power": 70,   "luck": 20,  "emoji": emojis.ROD_HEAVIER, "durability": 220},
-    "Lava Rod":       {"name": "Cần Dung Nham",  "price": 180000,     "power": 85,   "luck": 30,  "emoji": emojis.ROD_LAVA, "durability": 250},
-    "Magma Rod":      {"name": "Cần Magma",      "price": 200000,     "power": 100,  "luck": 35,  "emoji": emojis.ROD_MAGMA, "durability": 300},
-    "Oceanium Rod":   {"name": "Cần Đại Dương",  "price": 250000,     "power": 120,  "luck": 50,  "emoji": emojis.ROD_OCEANIUM, "durability": 400},
-    "Sky Rod":        {"name": "Cần Bầu Trời",   "price": 500000,     "power": 150,  "luck": 60,  "emoji": emojis.ROD_SKY, "durability": 500},
-    "Meteor Rod":     {"name": "Cần Thiên Thạch","price": 800000,     "power": 180,  "luck": 70,  "emoji": emojis.ROD_METEOR, "durability": 600},
-    "Space Rod":      {"name": "Cần Vũ Trụ",     "price": 1000000,    "power": 300,  "luck": 250, "emoji": emojis.ROD_SPACE, "durability": 800},
-    "Superium Rod":   {"name": "Cần Siêu Cấp",   "price": 2000000,    "power": 500,  "luck": 500, "emoji": emojis.ROD_SUPERIUM, "durability": 1000},
-    "Diamond Rod":    {"name": "Cần Kim Cương",  "price": 3000000,    "power": 4500,  "luck": 1000, "emoji": emojis.ROD_DIAMOND, "durability": 1200},
-    "Alien Rod":      {"name": "Cần Alien",      "price": 5000000,   "power": 6000,  "luck": 2500, "emoji": emojis.ROD_ALIEN, "durability": 1500},
-    "Saltspreader":   {"name": "Cần Rắc Muối",   "price": 75000000,   "power": 7500,  "luck": 3000, "emoji": emojis.ROD_SALTSPREADER, "durability": 2000},
-    "Infinity Rod":   {"name": "Cần Vô Cực",     "price": 100000000,   "power": 10000, "luck": 5000, "emoji": emojis.ROD_INFINITY, "durability": 5000},
-    "Donator Rod":    {"name": "Cần Nhà Tài Trợ","price": 0,          "power": 50, "luck": 20, "emoji": emojis.ROD_DONATOR, "description": "Cần câu dành riêng cho Nhà Tài Trợ (Không thể mua)", "durability": None},
-}
-# Map old keys to new if necessary, but here we assume clean slate or migration
-ROD_LIST = list(RODS.keys())
-
-BADGES = {
-    "Bronze":    {"name": "Huy hiệu Đồng", "desc": "Câu được tổng cộng 100 con cá", "emoji": emojis.BADGE_BRONZE, "req_type": "total_fish", "req_val": 100},
-    "Silver":    {"name": "Huy hiệu Bạc",  "desc": "Câu được tổng cộng 500 con cá", "emoji": emojis.BADGE_SILVER, "req_type": "total_fish", "req_val": 500},
-    "Gold":      {"name": "Huy hiệu Vàng", "desc": "Câu được tổng cộng 1000 con cá", "emoji": emojis.BADGE_GOLD, "req_type": "total_fish", "req_val": 1000},
-    "Platinum":  {"name": "Huy hiệu Bạch Kim", "desc": "Câu được tổng cộng 5000 con cá", "emoji": emojis.BADGE_PLATINUM, "req_type": "total_fish", "req_val": 5000},
-    "Amethyst":  {"name": "Huy hiệu Thạch Anh", "desc": "Kiếm được 1 triệu Coiz từ câu cá", "emoji": emojis.BADGE_AMETHYST, "req_type": "total_earn", "req_val": 1000000},
-    "Emerald":   {"name": "Huy hiệu Lục Bảo", "desc": "Kiếm được 10 triệu Coiz từ câu cá", "emoji": emojis.BADGE_EMERALD, "req_type": "total_earn", "req_val": 10000000},
-    "Ruby":      {"name": "Huy hiệu Hồng Ngọc", "desc": "Kiếm được 100 triệu Coiz từ câu cá", "emoji": emojis.BADGE_RUBY, "req_type": "total_earn", "req_val": 100000000},
-    "Sapphire":  {"name": "Huy hiệu Sapphire", "desc": "Sở hữu 10 loại Cần câu khác nhau", "emoji": emojis.BADGE_SAPPHIRE, "req_type": "rod_count", "req_val": 10},
-    "50Shades":  {"name": "50 Sắc Thái", "desc": "Sở hữu 20 loại Cần câu khác nhau", "emoji": emojis.BADGE_50_SHADES, "req_type": "rod_count", "req_val": 20},
-    "Admin":     {"name": "Admin", "desc": "Dành cho Admin", "emoji": emojis.BADGE_ADMIN, "req_type": "admin", "req_val": 0},
-    "Supporter": {"name": "Người Ủng Hộ", "desc": "Dành cho Donator", "emoji": emojis.BADGE_SUPPORTER, "req_type": "manual", "req_val": 0},
-    "DragonHunter": {"name": "Thợ Săn Rồng", "desc": "Sưu tập đủ 7 Viên Ngọc Rồng", "emoji": emojis.DRAGONBALL_FULL, "req_type": "dragon_balls", "req_val": 7},
-    "KingFisher": {"name": "Vua Câu Cá", "desc": "Câu được tất cả các loài Boss", "emoji": emojis.KING_ALIEN2, "req_type": "king_fish_all", "req_val": 0},
-}
-
-DRAGON_BALLS = {
-    1: {"name": "1 Sao", "emoji": emojis.DRAGONBALL_1},
-    2: {"name": "2 Sao", "emoji": emojis.DRAGONBALL_2},
-    3: {"name": "3 Sao", "emoji": emojis.DRAGONBALL_3},
-    4: {"name": "4 Sao", "emoji": emojis.DRAGONBALL_4},
-    5: {"name": "5 Sao", "emoji": emojis.DRAGONBALL_5},
-    6: {"name": "6 Sao", "emoji": emojis.DRAGONBALL_6},
-    7: {"name": "7 Sao", "emoji": emojis.DRAGONBALL_7},
-}
-
-BAITS = {
-    "Worms":           {"name": "Mồi Giun",    "price": 0,     "power": 0,  "luck": 0,  "desc": "Mồi câu cơ bản (Miễn phí).", "emoji": emojis.BAIT_WORM},
-    "Cricket":         {"name": "Dế Mèn",      "price": 200,    "power": 5,  "luck": 2,  "desc": "Thu hút cá nhỏ.", "emoji": emojis.BAIT_CRICKET},
-    "Leeches":         {"name": "Đỉa",         "price": 500,    "power": 8,  "luck": 4,  "desc": "Bám dính tốt.", "emoji": emojis.BAIT_LEECH},
-    "Minnows":         {"name": "Cá Con",      "price": 1500,   "power": 12, "luck": 8,  "desc": "Dụ cá săn mồi.", "emoji": emojis.BAIT_MINNOW},
-    "Support Bait":    {"name": "Mồi Hỗ Trợ",  "price": 15000,  "power": 30, "luck": 25, "desc": "Tăng khả năng câu.", "emoji": emojis.BAIT_SUPPORT},
-    "Magic Bait":      {"name": "Mồi Ma Thuật","price": 50000,  "power": 50, "luck": 40, "desc": "Có ma thuật huyền bí.", "emoji": emojis.BAIT_MAGIC},
-    "Wise Bait":       {"name": "Mồi Thông Thái","price": 100000,"power": 80, "luck": 60, "desc": "Dụ cá hiếm cực tốt.", "emoji": emojis.BAIT_WISE},
-    "Magnet":          {"name": "Nam Châm",    "price": 200000, "power": 30, "luck": 20, "desc": "Hút 2-4 con cá một lúc!", "emoji": emojis.BAIT_MAGNET, "is_special": True},
-}
-
-TREASURES = [
-    {"name": "Rương Gỗ",        "value": 2000,   "emoji": emojis.CHEST_UNCOMMON},
-    {"name": "Rương Sắt",       "value": 5000,   "emoji": emojis.CHEST_RARE},
-    {"name": "Rương Vàng",      "value": 20000,  "emoji": emojis.CHEST_EPIC},
-    {"name": "Rương Kim Cương", "value": 100000, "emoji": emojis.CHEST_LEGENDARY},
-    {"name": "Rương Kho Báu",   "value": 500000, "emoji": emojis.CHEST_SUPER},
-    {"name": "Cổ Vật",          "value": 1000000,"emoji": emojis.CHEST_ARTIFACT},
-]
-
-CHARMS = {
-    "Lucky Charm": {"name": "Bùa May Mắn", "price": 50000, "power": 0, "luck": 50, "duration_min": 1, "duration_max": 60, "emoji": emojis.CHARM_GREEN},
-    "Power Charm": {"name": "Bùa Sức Mạnh", "price": 50000, "power": 50, "luck": 0, "duration_min": 1, "duration_max": 60, "emoji": emojis.CHARM_RED},
-    "Golden Charm": {"name": "Bùa Vàng", "price": 50000, "power": 50, "luck": 50, "duration_min": 1, "duration_max": 60, "emoji": emojis.CHARM_YELLOW},
-    "XP Charm": {"name": "Bùa Kinh Nghiệm I", "price": 100000, "power": 0, "luck": 0, "xp_mul": 1.5, "duration_min": 1, "duration_max": 60, "emoji": "📗"},
-    "Super XP Charm": {"name": "Bùa Kinh Nghiệm II", "price": 200000, "power": 0, "luck": 0, "xp_mul": 2.0, "duration_min": 1, "duration_max": 60, "emoji": "📘"},
-}
-
 class ChangeBaitView(discord.ui.View):
     def __init__(self, cog, user_id, baits_inv, parent_view):
         super().__init__(timeout=60)
@@ -266,7 +71,7 @@ class ChangeBaitView(discord.ui.View):
         stats = data.get("stats", {})
         stats["current_bait"] = key
         stats["magnet_sub_bait"] = sub_bait
-        await self.cog.db.update_fishing_data(self.user_id, stats=stats)
+        await self.cog.db.update_fishing_data(self.user_id, stats=stats, base=data)
         
         msg = f"✅ Đã trang bị mồi **{BAITS.get(key,{}).get('name', key)}**!"
         if sub_bait:
@@ -307,7 +112,9 @@ class ChangeRodView(discord.ui.View):
             self.add_item(btn)
 
     async def equip_rod(self, interaction: discord.Interaction, key, name):
-        await self.cog.db.update_fishing_data(self.user_id, rod_type=key)
+        session = await FishingSession.load(self.cog.db, self.user_id)
+        session.rod_type = key
+        await session.commit()
         await interaction.response.send_message(f"✅ Đã trang bị **{name}**!", ephemeral=True)
 
 class ShopSelectView(discord.ui.View):
@@ -368,7 +175,7 @@ class ConfirmUnlockView(discord.ui.View):
         
         # Move to new biome
         stats["current_biome"] = self.biome_key
-        await self.cog.db.update_fishing_data(self.user_id, stats=stats)
+        await self.cog.db.update_fishing_data(self.user_id, stats=stats, base=data)
 
         b_info = BIOMES[self.biome_key]
         await interaction.response.edit_message(content=f"🎉 Đã mở khóa và chuyển đến **{b_info['emoji']} {b_info['name']}**!", view=None, embed=None)
@@ -445,8 +252,11 @@ class BiomeSelectView(discord.ui.View):
 
     async def move_callback(self, interaction: discord.Interaction):
          if interaction.user.id != self.user_id: return
+         # Đọc lại record, chỉ đổi biome (không ghi đè XP / mồi bằng self.stats cũ của view)
+         session = await FishingSession.load(self.cog.db, self.user_id)
+         session.stats["current_biome"] = self.selected_biome
+         await session.commit()
          self.stats["current_biome"] = self.selected_biome
-         await self.cog.db.update_fishing_data(self.user_id, stats=self.stats)
          await interaction.response.edit_message(content=f"✅ Đã chuyển đến **{BIOMES[self.selected_biome]['name']}**!", view=None, embed=None)
 
     async def unlock_callback(self, interaction: discord.Interaction):
@@ -455,7 +265,9 @@ class BiomeSelectView(discord.ui.View):
          b_data = BIOMES[b_key]
          cost = b_data.get("req_money", 0)
          req_level = b_data.get("req_level", 1)
-         user_level = self.stats.get("level", 1)
+         session = await FishingSession.load(self.cog.db, self.user_id)
+         stats = session.stats
+         user_level = stats.get("level", 1)
          
          if user_level < req_level:
               await interaction.response.send_message(f"❌ Bạn cấp thấp! Cần Level {req_level}.", ephemeral=True)
@@ -466,11 +278,15 @@ class BiomeSelectView(discord.ui.View):
               await interaction.response.send_message(f"❌ Bạn không đủ tiền! Cần {cost:,} Coiz.", ephemeral=True)
               return
               
+         unlocked = stats.setdefault("unlocked_biomes", ["River"])
+         if b_key not in unlocked:
+             unlocked.append(b_key)
+         stats["current_biome"] = b_key
+         # Ghi xong mới trừ tiền (xung đột thì không mất tiền oan)
+         await session.commit()
          await self.cog.db.add_points(self.user_id, interaction.guild_id, -cost)
-         self.unlocked.append(b_key)
-         self.stats["unlocked_biomes"] = self.unlocked
-         self.stats["current_biome"] = b_key
-         await self.cog.db.update_fishing_data(self.user_id, stats=self.stats)
+         self.stats = stats
+         self.unlocked = unlocked
          
          await interaction.response.edit_message(content=f"🎉 Đã mở khóa và chuyển đến **{b_data['name']}**!", view=None, embed=None)
 
@@ -503,8 +319,8 @@ class FishingView(discord.ui.View):
         total_val = 0
         names_sold = []
         
-        data = await self.cog.db.get_fishing_data(self.user_id)
-        inv = data.get("inventory", {})
+        session = await FishingSession.load(self.cog.db, self.user_id)
+        inv = session.inventory
         fish_inv = inv.get("fish", {})
 
         for fish in catches:
@@ -518,12 +334,17 @@ class FishingView(discord.ui.View):
                 names_sold.append(f_name)
 
         if total_val > 0:
-            stats = data.get("stats", {})
+            stats = session.stats
             stats["lifetime_money"] = stats.get("lifetime_money", 0) + total_val
             
-            await self.cog.db.update_fishing_data(self.user_id, inventory=inv, stats=stats)
+            # Bỏ cá khỏi túi trước, ghi được rồi mới trả Coiz
+            # (lệnh bán khác đã lấy mất cá -> ConcurrentUpdateError, không trả tiền)
+            try:
+                await session.commit()
+            except ConcurrentUpdateError:
+                await interaction.response.send_message("❌ Túi đồ vừa thay đổi, hãy thử bán lại!", ephemeral=True)
+                return
             await self.cog.db.add_points(self.user_id, interaction.guild_id, total_val)
-            
             await self.cog.check_badges(self.user_id, interaction.channel)
             
             button.disabled = True
@@ -571,7 +392,7 @@ class FishingView(discord.ui.View):
         if current_rod not in owned:
             owned.append(current_rod)
             inv["rods"] = owned
-            await self.cog.db.update_fishing_data(self.user_id, inventory=inv)
+            await self.cog.db.update_fishing_data(self.user_id, inventory=inv, base=data)
 
         view = ChangeRodView(self.cog, self.user_id, owned, current_rod, self, durability_map)
         await interaction.response.send_message(f"👇 **Chọn cần câu ({len(owned)} sở hữu):**", view=view, ephemeral=True)
@@ -621,7 +442,7 @@ class UseCharmSelect(discord.ui.Select):
         ac[used_charm['key']] = current_end + used_charm['duration']
         st["active_charms"] = ac
         
-        await self.cog.db.update_fishing_data(self.user_id, inventory=i_v, stats=st)
+        await self.cog.db.update_fishing_data(self.user_id, inventory=i_v, stats=st, base=d)
         await interaction.response.send_message(f"✨ Đã kích hoạt **{used_charm['name']}**! Hiệu lực thêm {used_charm['duration']//60} phút.", ephemeral=True)
 
 class InventoryView(discord.ui.View):
@@ -706,13 +527,8 @@ class InventorySelect(discord.ui.Select):
                 caught_bosses = 0
                 
                 # Prepare a lookup for spawn rates to identify bosses
-                fish_meta = {}
-                boss_names = set()
-                for b_val in BIOMES.values():
-                    for f in b_val["fish"]:
-                        fish_meta[f["name"]] = f
-                        if f.get("spawn_rate", 10) < 1.0:
-                            boss_names.add(f["name"])
+                fish_meta = catch_tables.FISH_META
+                boss_names = catch_tables.BOSS_FISH
 
                 total_bosses = len(boss_names)
 
@@ -817,9 +633,10 @@ class CauCaCog(commands.Cog):
 
     # ... (Command implementations inside class)
 
-    async def get_stats_multiplier(self, user_id):
+    async def get_stats_multiplier(self, user_id, data=None):
         """Calculate total Power and Luck from Rod + Bait + Active Charms"""
-        data = await self.db.get_fishing_data(user_id)
+        if data is None:
+            data = await self.db.get_fishing_data(user_id)
         stats = data.get("stats", {})
         
         # Rod Stats
@@ -905,7 +722,7 @@ class CauCaCog(commands.Cog):
                 new_charm = {"key": k, "duration": duration_sec, "name": i["name"]}
                 inv["charms"].append(new_charm)
                 
-                await self.db.update_fishing_data(inter.user.id, inventory=inv)
+                await self.db.update_fishing_data(inter.user.id, inventory=inv, base=data)
                 
                 minutes = duration_sec // 60
                 seconds = duration_sec % 60
@@ -924,8 +741,12 @@ class CauCaCog(commands.Cog):
         view.add_item(back_btn)
             
         await interaction.response.send_message(embed=embed, view=view)
-    async def check_badges(self, user_id, channel):
-        data = await self.db.get_fishing_data(user_id)
+    async def check_badges(self, user_id, channel, session: FishingSession = None):
+        """Trao huy hiệu mới. Có session thì chỉ sửa trên RAM, người gọi tự commit"""
+        own_session = session is None
+        if own_session:
+            session = await FishingSession.load(self.db, user_id)
+        data = session.data
         stats = data.get("stats", {})
         owned_badges = stats.get("badges", [])
         
@@ -968,11 +789,7 @@ class CauCaCog(commands.Cog):
                  # Let's count distinct kings caught.
                  
                  # Get all King names
-                 all_kings = []
-                 for _, b_data in BIOMES.items():
-                     for f in b_data["fish"]:
-                         if f.get("spawn_rate", 100) <= 0.02:
-                             all_kings.append(f["name"])
+                 all_kings = catch_tables.KING_FISH
                  
                  caught_kings = 0
                  for k_name in all_kings:
@@ -986,7 +803,8 @@ class CauCaCog(commands.Cog):
         
         if new_badges:
             stats["badges"] = owned_badges
-            await self.db.update_fishing_data(user_id, stats=stats)
+            if own_session:
+                await session.commit()
             if channel:
                 desc = "\n".join([f"{b['emoji']} **{b['name']}**\n*{b['desc']}*" for b in new_badges])
                 em = discord.Embed(title="🏅 HUY HIỆU MỚI!", description=f"Chúc mừng bạn đã đạt được:\n{desc}", color=discord.Color.orange())
@@ -994,27 +812,37 @@ class CauCaCog(commands.Cog):
                     await channel.send(f"<@{user_id}>", embed=em)
                 except: pass
 
-    async def process_fishing(self, interaction: discord.Interaction, biome_name, view=None):
-        user_id = interaction.user.id
-        channel_id = interaction.channel_id
-        
-        # Check channel config
-        config_channel = await self.db.get_channel_config(channel_id)
+    async def _check_fishing_channel(self, interaction: discord.Interaction) -> bool:
+        """Lệnh câu cá chỉ chạy trong kênh đã cài đặt /kenh-cau-ca"""
+        config_channel = await self.db.get_channel_config(interaction.channel_id)
         if config_channel != "cauca":
             msg = "❌ Lệnh `/fish` chỉ hoạt động trong kênh Câu Cá chuyên biệt! Admin hãy dùng `/kenh-cau-ca` để cài đặt."
             try: await interaction.response.send_message(msg, ephemeral=True)
             except: await interaction.followup.send(msg, ephemeral=True)
+            return False
+        return True
+
+    async def process_fishing(self, interaction: discord.Interaction, biome_name, view=None,
+                              session: FishingSession = None, casts: int = 1):
+        """Câu cá (1 hoặc nhiều lần): đọc dữ liệu câu cá một lần, sửa trên RAM và ghi một lần ở cuối"""
+        if not await self._check_fishing_channel(interaction):
             return
 
-        data = await self.db.get_fishing_data(user_id)
-        inventory = data.get("inventory", {})
-        stats = data.get("stats", {})
+        if session is None:
+            session = await FishingSession.load(self.db, interaction.user.id)
+        try:
+            if casts > 1:
+                await self._bulk_cast(interaction, session, biome_name, casts)
+            else:
+                await self._cast(interaction, session, biome_name, view)
+        finally:
+            await session.commit()
 
-        # === REQUIREMENTS CHECK ===
-        user_balance = await self.db.get_player_points(user_id, interaction.guild_id)
+    async def _grant_starter_rod(self, interaction: discord.Interaction, session: FishingSession):
+        """New User: tặng Cần Nhựa miễn phí"""
+        inventory = session.inventory
         owned_rods = inventory.get("rods", [])
         
-        # 1. New User: First Rod (Plastic Rod - Free)
         if not owned_rods:
             # Grant free Plastic Rod
             if "rods" not in inventory: inventory["rods"] = []
@@ -1026,26 +854,17 @@ class CauCaCog(commands.Cog):
             # RODS["Plastic Rod"]["durability"] is likely None, which means infinite
             
             # Ensure Plastic Rod is active
-            await self.db.update_fishing_data(user_id, rod_type="Plastic Rod", inventory=inventory)
+            session.rod_type = "Plastic Rod"
             
             try: await interaction.channel.send(f"🎉 **Chào mừng Newbie!** Hệ thống đã tặng bạn **Cần Nhựa** (Miễn phí) để bắt đầu câu cá!")
             except: pass
-            
-            # Refresh data
-            data = await self.db.get_fishing_data(user_id)
-            stats = data.get("stats", {})
-            inventory = data.get("inventory", {})
 
-        # 2. Fishing Cost (10 Coiz)
-        if user_balance < 10:
-             msg = f"❌ Bạn cần **10 Coiz** {emojis.ANIMATED_EMOJI_COIZ} chi phí cho mỗi lần câu!"
-             try: await interaction.response.send_message(msg, ephemeral=True)
-             except: await interaction.followup.send(msg, ephemeral=True)
-             return
-             
-        await self.db.add_points(user_id, interaction.guild_id, -10)
-        
-        # 3. Bait Check
+    async def _ensure_bait(self, interaction: discord.Interaction, session: FishingSession, view=None) -> bool:
+        """Bait Check: chưa trang bị mồi thì mời chọn mồi (False) hoặc tự tặng Mồi Giun"""
+        user_id = session.user_id
+        inventory = session.inventory
+        stats = session.stats
+
         if not stats.get("current_bait"):
              # Check if user has any bait in inventory
              baits_inv = inventory.get("baits", {})
@@ -1056,24 +875,24 @@ class CauCaCog(commands.Cog):
                  view_bait = ChangeBaitView(self, user_id, baits_inv, view)
                  try: await interaction.response.send_message(msg, view=view_bait, ephemeral=True)
                  except: await interaction.followup.send(msg, view=view_bait, ephemeral=True)
-                 return
+                 return False
              else:
                  # Auto-equip free Worms
                  if "baits" not in inventory: inventory["baits"] = {}
                  inventory["baits"]["Worms"] = 50
                  stats["current_bait"] = "Worms"
-                 await self.db.update_fishing_data(user_id, inventory=inventory, stats=stats)
                  
                  msg_auto = f"🪱 **Hết mồi?** Bot đã tự động trang bị **50x Mồi Giun** (Miễn phí) cho <@{user_id}>!"
                  try: await interaction.channel.send(msg_auto)
                  except: pass
+        return True
+
+    async def _check_durability(self, interaction: discord.Interaction, session: FishingSession) -> bool:
+        """Durability Check: cần đã hết độ bền thì bỏ cần, về Cần Nhựa và báo (False)"""
+        inventory = session.inventory
+        rod_key = session.rod_type
         
-        # Get Stats (Power/Luck)
-        power, luck, data, current_bait_key, xp_mul = await self.get_stats_multiplier(user_id)
-        rod_key = data.get("rod_type", "Plastic Rod")
-        
-        # === DURABILITY CHECK ===
-        durability_map = inventory.get("rod_durability", {})
+        durability_map = inventory.setdefault("rod_durability", {})
         if rod_key not in durability_map:
              # Auto-fix missing durability
              max_d = RODS.get(rod_key, {}).get("durability")
@@ -1092,11 +911,21 @@ class CauCaCog(commands.Cog):
                  inventory["rods"].remove(rod_key)
                  if rod_key in durability_map: del durability_map[rod_key]
              
-             await self.db.update_fishing_data(user_id, inventory=inventory, rod_type="Plastic Rod")
+             session.rod_type = "Plastic Rod"
              msg = f"💥 **CẦN CÂU CỦA BẠN ĐÃ BỊ GÃY!**\nCần **{RODS[rod_key]['name']}** đã hỏng hoàn toàn. Hãy mua cần mới!"
              try: await interaction.response.send_message(msg, ephemeral=True)
              except: await interaction.followup.send(msg, ephemeral=True)
-             return
+             return False
+        return True
+
+    def _roll_cast(self, session: FishingSession, biome_name, power, luck, xp_mul, current_bait_key) -> Dict:
+        """Tung một lần câu trên dữ liệu trong RAM (độ bền, mồi, kho báu, cá). Không I/O"""
+        inventory = session.inventory
+        stats = session.stats
+        rod_key = session.rod_type
+        durability_map = inventory.setdefault("rod_durability", {})
+        current_durability = durability_map.get(rod_key)
+        coiz = 0
 
         # Bait Consumption Logic
         baits_inv = inventory.get("baits", {})
@@ -1129,14 +958,14 @@ class CauCaCog(commands.Cog):
                      stats["current_bait"] = None
                  
                  if is_magnet:
-                     loops = random.randint(2, 5) # Magnet: 2-5 fish
+                     loops = random.randint(catch_tables.MAGNET_MIN_FISH, catch_tables.MAGNET_MAX_FISH) # Magnet: 2-5 fish
              else:
                  stats["current_bait"] = None
                  is_magnet = False
 
         # Treasure Chance (Capped at 15% max, reduced scaling 0.002)
         # Fixes the issue where high Luck means 100% Treasure rate.
-        treasure_chance = min(15, 2 + (luck * 0.002))
+        treasure_chance = catch_tables.treasure_chance(luck)
         treasure_found = False
         
         result_list = []
@@ -1147,20 +976,16 @@ class CauCaCog(commands.Cog):
         current_biome_data = BIOMES.get(biome_name, BIOMES["River"])
         fish_pool = current_biome_data["fish"]
         
-        embed_color = discord.Color.blue()
-        
         # Initialize variables for scope safety
         new_rod_type = None
         rod_broken_msg = ""
         
         # TREASURE CHECK
-        treasure_chance = min(15, 2 + (luck * 0.002))
-        treasure_found = False
         treasure_embed_desc = ""
         
         if random.uniform(0, 100) < treasure_chance:
             treasure_found = True
-            chest_idx = min(len(TREASURES)-1, int(random.triangular(0, len(TREASURES)-1, 0 + luck/50)))
+            chest_idx = catch_tables.roll_chest_index(luck)
             chest = TREASURES[chest_idx]
             
             # Loot Logic
@@ -1168,15 +993,14 @@ class CauCaCog(commands.Cog):
             
             # 1. Coinz (Always)
             amount = int(chest["value"] * random.uniform(2.0, 5.0))
-            await self.db.add_points(user_id, interaction.guild_id, amount)
+            coiz += amount
             current_lt = stats.get("lifetime_money", 0)
             stats["lifetime_money"] = current_lt + amount
             rewards_list.append(f"• **{amount:,}** Coiz {emojis.ANIMATED_EMOJI_COIZ}")
             
             # 2. Fish (50% Chance)
-            if random.random() < 0.5:
-                weights = [f.get("spawn_rate", 10) for f in fish_pool]
-                selected_fish = random.choices(fish_pool, weights=weights, k=1)[0]
+            if random.random() < catch_tables.TREASURE_FISH_CHANCE:
+                selected_fish = catch_tables.roll_treasure_fish(biome_name)
                 min_qty = 3 + (chest_idx * 2)
                 max_qty = 10 + (chest_idx * 5)
                 quantity = random.randint(min_qty, max_qty)
@@ -1193,7 +1017,7 @@ class CauCaCog(commands.Cog):
                 rewards_list.append(f"• **{quantity}x {selected_fish['emoji']} {selected_fish['name']}**")
 
             # 3. Bait (35% Chance)
-            if random.random() < 0.35:
+            if random.random() < catch_tables.TREASURE_BAIT_CHANCE:
                  bait_keys = list(BAITS.keys())
                  selected_bait_key = random.choice(bait_keys)
                  selected_bait = BAITS[selected_bait_key]
@@ -1205,7 +1029,7 @@ class CauCaCog(commands.Cog):
                  rewards_list.append(f"• **{quantity}x {selected_bait['emoji']} {selected_bait['name']}**")
 
             # 4. Charm (15% Chance)
-            if random.random() < 0.15:
+            if random.random() < catch_tables.TREASURE_CHARM_CHANCE:
                 charm_keys = list(CHARMS.keys())
                 c_key = random.choice(charm_keys)
                 c_info = CHARMS[c_key]
@@ -1219,7 +1043,7 @@ class CauCaCog(commands.Cog):
             treasure_embed_desc = f"**{chest['emoji']} {chest['name']}**\n" + "\n".join(rewards_list)
 
             # DRAGON BALL DROP CHANCE (0.5%)
-            if random.random() < 0.005: 
+            if random.random() < catch_tables.DRAGON_BALL_CHANCE: 
                 user_balls = inventory.get("dragon_balls", [])
                 missing_balls = [i for i in range(1, 8) if i not in user_balls]
                 
@@ -1242,16 +1066,10 @@ class CauCaCog(commands.Cog):
                 else:
                      # Duplicate Reward
                      treasure_embed_desc += f"\n\n🔸 Bạn tìm thấy **Ngọc Rồng {ball_num} Sao** {ball_emoji}, nhưng đã sở hữu rồi. (Nhận 100M Coiz an ủi)"
-                     await self.db.add_points(user_id, interaction.guild_id, 100000000)
+                     coiz += 100000000
 
         # FISHING LOOP (ALWAYS RUNS)
         desc_lines = []
-        if treasure_found:
-             desc_lines.append(f"🌟 **---------------- KHO BÁU XUẤT HIỆN ----------------** 🌟")
-             desc_lines.append(f"{treasure_embed_desc}")
-             desc_lines.append(f"🌟 **-------------------------------------------------------** 🌟\n")
-             desc_lines.append(f"🎣 **KẾT QUẢ CÂU:**")
-
         for _ in range(loops):
             # Calculate current catch stats (handles Magnet Sub-Bait)
             eff_luck = luck
@@ -1279,8 +1097,7 @@ class CauCaCog(commands.Cog):
             # MISS CHANCE (Tỉ lệ xảy cá)
             # Base success: 70%. Luck improves it.
             # Formula: 70 + (Luck * 0.2)
-            success_chance = 70 + (eff_luck * 0.2)
-            if success_chance > 100: success_chance = 100
+            success_chance = catch_tables.success_chance(eff_luck)
             
             if random.uniform(0, 100) > success_chance:
                 desc_lines.append("💨 **Hụt!** Cá đã trốn thoát...")
@@ -1289,16 +1106,8 @@ class CauCaCog(commands.Cog):
             # Rarity selection
             # Luck/Power affects weights? 
             
-            luck_bonus = eff_luck * 0.15
-            roll = random.uniform(0, 100) + luck_bonus
-            
-            rarity = "Common"
-            if roll > 120: rarity = "Exotic" # Alien/Secret?
-            elif roll > 110: rarity = "Mythical"
-            elif roll > 95: rarity = "Legendary"
-            elif roll > 80: rarity = "Epic"
-            elif roll > 60: rarity = "Rare"
-            elif roll > 40: rarity = "Uncommon"
+            # roll = uniform(0, 100) + Luck * 0.15 -> Uncommon > 40 ... Exotic > 120
+            rarity = catch_tables.roll_rarity(eff_luck)
             
             # Pick fish
             # Note: Currently fish_pool is list of dicts. We don't have explicit rarity in fish dicts in BIOMES constant yet?
@@ -1308,62 +1117,22 @@ class CauCaCog(commands.Cog):
             
             if not fish_pool: break
             
-            # Apply weight selection based on 'spawn_rate' modified by Luck
-            weights = []
-            for f in fish_pool:
-                 base_rate = f.get("spawn_rate", 10)
-                 
-                 if base_rate < 1.0:
-                      # BOSS FISH: FIXED RATE (No Luck Influence)
-                      # Used to be boosted by luck, now requested to be fixed.
-                      # We still need a slight multiplier from base because base_rate (e.g. 0.01) is purely theoretical relative to 100.
-                      # If Common is 35, and Boss is 0.01, Boss is 3500x rarer.
-                      # Let's keep a small static multiplier to make it distinct but rare.
-                      w = base_rate * 5 # Static boost, no luck scaling.
-                 elif base_rate <= 20: 
-                      # Boost rare fish: +0.2% weight per 1 Luck
-                      w = base_rate * (1 + (eff_luck * 0.002))
-                 else:
-                      # Common fish
-                      w = base_rate
-                 weights.append(w)
-                 
-            selected_fish = random.choices(fish_pool, weights=weights, k=1)[0]
+            # Weighted pick by 'spawn_rate' modified by Luck (precomputed tables, see utils/catch_tables.py)
+            # Boss fish: fixed rate x5 | spawn_rate <= 20: +0.2% weight per 1 Luck | Common: base rate
+            selected_fish = catch_tables.roll_fish(biome_name, eff_luck)
             
             # Size calculation
             # Power affects size directly and skews distribution towards Max Size
-            min_s = selected_fish['min_size']
-            max_s = selected_fish['max_size']
-            
-            # Calculate "Peak" of the size distribution based on Power
-            # Max power for scaling ~ 500 (can go higher but diminishes)
-            power_factor = min(1.0, eff_power / 500) 
-            
-            # If power is high, the "peak" probability moves towards max_s
-            # random.triangular(low, high, mode)
-            mode_s = min_s + (max_s - min_s) * (0.2 + 0.8 * power_factor) # At 0 power, peak is at 20%. At max, peak is at 100%.
-            
-            raw_size = random.triangular(min_s, max_s, mode_s)
-            
-            # "Limit Break": Power allows exceeding max size slightly
-            # 0.02% per Power point
-            final_size_mul = 1.0 + (eff_power * 0.0002)
-            size = round(raw_size * final_size_mul, 2)
-            
-            min_s = selected_fish['min_size']
-
+            # ("Limit Break": Power allows exceeding max size slightly)
+            size = catch_tables.roll_size(selected_fish, eff_power)
             
             # Value calculation
-            # Value = Base * (Size / AvgSize) * RarityMul?
-            # Simplify: Value = Base + (Size * 2)
-            base_v = selected_fish['base_value']
-            rarity_mul = RARITIES.get(rarity, {}).get("mul", 1.0)
-            val = int((base_v + (size * 5)) * rarity_mul)
+            # Value = (Base + Size * 5) * RarityMul
+            val = catch_tables.fish_value(selected_fish, size, rarity)
             
             # Crit?
-            if random.random() < 0.05:
-                val *= 2
-                size_bonus = "(CRIT!)"
+            if random.random() < catch_tables.CRIT_CHANCE:
+                val *= catch_tables.CRIT_MUL
             
             # Add to result
             result_list.append({
@@ -1387,22 +1156,8 @@ class CauCaCog(commands.Cog):
             total_val += val
                 
             # XP Calculation: Scales with Value (Size & Rarity included)
-            xp_rarity_mul = {
-                "Common": 1.0, 
-                "Uncommon": 1.2, 
-                "Rare": 1.5,
-                "Epic": 2.5, 
-                "Legendary": 10.0, 
-                "Mythical": 50.0,
-                "Exotic": 100.0
-            }.get(rarity, 1.0)
-            
-            # Formula: Base XP (Value/50) * RarityXP
-            xp_gain = int((val / 50) * xp_rarity_mul) 
-            if xp_gain < 10: xp_gain = 10
-            
-            # Apply XP Charm Multiplier
-            xp_gain = int(xp_gain * xp_mul)
+            # Formula: Base XP (Value/50) * RarityXP (min 10), then XP Charm Multiplier
+            xp_gain = catch_tables.xp_for_catch(val, rarity, xp_mul)
             
             total_xp += xp_gain
             
@@ -1411,13 +1166,9 @@ class CauCaCog(commands.Cog):
             r_emoji = r_info.get("emoji", "✨")
             
             # Translate rarity
-            rarity_vi = {
-                "Common": "Thường", "Uncommon": "Khá", "Rare": "Hiếm", 
-                "Epic": "Sử Thi", "Huyền Thoại": "Huyền Thoại", 
-                "Mythical": "Thần Thoại", "Exotic": "Cực Phẩm"
-            }.get(rarity, rarity)
+            rarity_vi = RARITY_VI.get(rarity, rarity)
             
-            is_boss = selected_fish.get("spawn_rate", 10) < 1.0
+            is_boss = catch_tables.is_boss(selected_fish['name'])
             
             if is_boss:
                  desc_lines.append(f"\n🌟 **---------------- VUA CÁ XUẤT HIỆN ----------------** 🌟")
@@ -1442,6 +1193,76 @@ class CauCaCog(commands.Cog):
              new_rod_type = "Plastic Rod"
              rod_broken_msg = f"\n\n💥 **CẦN CÂU ĐÃ GÃY!**\nCần **{RODS[rod_key]['name']}** của bạn đã hỏng hoàn toàn do hết độ bền. Hãy mua cần mới!"
 
+        return {
+            "desc_lines": desc_lines,
+            "result_list": result_list,
+            "total_xp": total_xp,
+            "total_val": total_val,
+            "coiz": coiz,
+            "treasure_found": treasure_found,
+            "treasure_desc": treasure_embed_desc,
+            "is_magnet": is_magnet,
+            "rod_key": rod_key,
+            "user_dura": user_dura,
+            "new_rod_type": new_rod_type,
+            "rod_broken_msg": rod_broken_msg
+        }
+
+    async def _cast(self, interaction: discord.Interaction, session: FishingSession, biome_name, view=None):
+        user_id = interaction.user.id
+        data = session.data
+        inventory = data.get("inventory", {})
+        stats = data.get("stats", {})
+
+        # === REQUIREMENTS CHECK ===
+        user_balance = await self.db.get_player_points(user_id, interaction.guild_id)
+        
+        # 1. New User: First Rod (Plastic Rod - Free)
+        await self._grant_starter_rod(interaction, session)
+
+        # 2. Fishing Cost (10 Coiz)
+        if user_balance < catch_tables.FISHING_COST:
+             msg = f"❌ Bạn cần **10 Coiz** {emojis.ANIMATED_EMOJI_COIZ} chi phí cho mỗi lần câu!"
+             try: await interaction.response.send_message(msg, ephemeral=True)
+             except: await interaction.followup.send(msg, ephemeral=True)
+             return
+             
+        await self.db.add_points(user_id, interaction.guild_id, -catch_tables.FISHING_COST)
+        
+        # 3. Bait Check
+        if not await self._ensure_bait(interaction, session, view):
+            return
+        
+        # Get Stats (Power/Luck)
+        power, luck, _, current_bait_key, xp_mul = await self.get_stats_multiplier(user_id, data)
+        
+        # === DURABILITY CHECK ===
+        if not await self._check_durability(interaction, session):
+            return
+
+        cast = self._roll_cast(session, biome_name, power, luck, xp_mul, current_bait_key)
+        if cast["coiz"]:
+            await self.db.add_points(user_id, interaction.guild_id, cast["coiz"])
+
+        desc_lines = []
+        if cast["treasure_found"]:
+             desc_lines.append(f"🌟 **---------------- KHO BÁU XUẤT HIỆN ----------------** 🌟")
+             desc_lines.append(f"{cast['treasure_desc']}")
+             desc_lines.append(f"🌟 **-------------------------------------------------------** 🌟\n")
+             desc_lines.append(f"🎣 **KẾT QUẢ CÂU:**")
+        desc_lines += cast["desc_lines"]
+
+        result_list = cast["result_list"]
+        total_xp = cast["total_xp"]
+        total_val = cast["total_val"]
+        treasure_found = cast["treasure_found"]
+        is_magnet = cast["is_magnet"]
+        rod_key = cast["rod_key"]
+        user_dura = cast["user_dura"]
+        new_rod_type = cast["new_rod_type"]
+        rod_broken_msg = cast["rod_broken_msg"]
+        embed_color = discord.Color.blue()
+
         title = "🎣 CÂU ĐƯỢC CÁ!"
         if is_magnet: title = f"🧲 NAM CHÂM HÚT ĐƯỢC {len(result_list)} CÁ!"
         if treasure_found: title += " & KHO BÁU!"
@@ -1460,17 +1281,9 @@ class CauCaCog(commands.Cog):
         current_xp = stats.get("xp", 0) + total_xp
         
         # Recalculate level
-        # Formula: Next Level XP = 1000 * (1.5 ^ (level - 1))
+        # Formula: Next Level XP = 1000 * (1.35 ^ (level - 1))
         # Loop incase of multi-level up
-        leveled_up = False
-        while True:
-            req_xp = int(1000 * (1.35 ** (current_level - 1)))
-            if current_xp >= req_xp:
-                current_xp -= req_xp
-                current_level += 1
-                leveled_up = True
-            else:
-                break
+        current_level, current_xp, leveled_up = catch_tables.apply_xp(current_level, current_xp)
         
         stats["xp"] = current_xp
         stats["level"] = current_level
@@ -1485,19 +1298,15 @@ class CauCaCog(commands.Cog):
             max_dura = RODS[rod_key]['durability']
             dura_info = f" | Độ bền: {max(0, user_dura)}/{max_dura}"
             
-        req_xp_next = int(1000 * (1.35 ** (current_level - 1)))
+        req_xp_next = catch_tables.xp_required(current_level)
         embed.set_footer(text=f"Level: {current_level} | XP: {current_xp}/{req_xp_next}{dura_info}")
 
-        # Save Data
-        save_kwargs = {"inventory": inventory, "stats": stats}
+        # Save Data (commit một lần ở process_fishing)
         if new_rod_type:
-            save_kwargs["rod_type"] = new_rod_type
-            
-        await self.db.update_fishing_data(user_id, **save_kwargs)
-
+            session.rod_type = new_rod_type
         
         # Check Badges
-        await self.check_badges(user_id, interaction.channel)
+        await self.check_badges(user_id, interaction.channel, session=session)
         
         # UI
         last_catch_data = result_list if result_list else None
@@ -1515,20 +1324,133 @@ class CauCaCog(commands.Cog):
              msg = await interaction.followup.send(embed=embed, view=new_view)
              new_view.message = msg
 
+    async def _bulk_cast(self, interaction: discord.Interaction, session: FishingSession, biome_name, casts: int):
+        """Câu nhiều lần trong một lệnh: kiểm tra ngân sách (Coiz/mồi/độ bền) trước,
+        tung tất cả trên RAM, trừ phí + cộng thưởng bằng một lần add_points và trả về một embed tổng kết"""
+        user_id = interaction.user.id
+        inventory = session.inventory
+        stats = session.stats
+
+        user_balance = await self.db.get_player_points(user_id, interaction.guild_id)
+        await self._grant_starter_rod(interaction, session)
+
+        if user_balance < catch_tables.FISHING_COST:
+             msg = f"❌ Bạn cần **10 Coiz** {emojis.ANIMATED_EMOJI_COIZ} chi phí cho mỗi lần câu!"
+             try: await interaction.response.send_message(msg, ephemeral=True)
+             except: await interaction.followup.send(msg, ephemeral=True)
+             return
+
+        if not await self._ensure_bait(interaction, session):
+            return
+
+        power, luck, _, current_bait_key, xp_mul = await self.get_stats_multiplier(user_id, session.data)
+
+        if not await self._check_durability(interaction, session):
+            return
+
+        # Ngân sách: không câu quá số Coiz, số mồi đang dùng và độ bền còn lại
+        budget = min(casts, int(user_balance // catch_tables.FISHING_COST))
+        bait_left = inventory.get("baits", {}).get(current_bait_key, 0) if current_bait_key else 0
+        if bait_left > 0:
+            budget = min(budget, bait_left)
+        dura_left = inventory.get("rod_durability", {}).get(session.rod_type)
+        if dura_left is not None:
+            budget = min(budget, dura_left)
+
+        results = [
+            self._roll_cast(session, biome_name, power, luck, xp_mul, current_bait_key)
+            for _ in range(budget)
+        ]
+
+        total_xp = sum(r["total_xp"] for r in results)
+        total_val = sum(r["total_val"] for r in results)
+        coiz = sum(r["coiz"] for r in results)
+        result_list = [fish for r in results for fish in r["result_list"]]
+        treasures = [r["treasure_desc"] for r in results if r["treasure_found"]]
+        last = results[-1]
+
+        # Một lần ghi Coiz: phí câu + thưởng kho báu
+        await self.db.add_points(user_id, interaction.guild_id, coiz - catch_tables.FISHING_COST * budget)
+
+        if last["new_rod_type"]:
+            session.rod_type = last["new_rod_type"]
+
+        # Gom cá theo loài
+        caught = {}
+        for fish in result_list:
+            entry = caught.setdefault(fish["name"], {"emoji": fish["emoji"], "count": 0, "value": 0})
+            entry["count"] += 1
+            entry["value"] += fish["value"]
+        misses = sum(1 for r in results for line in r["desc_lines"] if line.startswith("💨"))
+
+        desc_lines = []
+        if budget < casts:
+            desc_lines.append(f"⚠️ Chỉ câu được **{budget}/{casts}** lần (giới hạn bởi Coiz, mồi hoặc độ bền cần).\n")
+        for name, entry in sorted(caught.items(), key=lambda item: item[1]["value"], reverse=True):
+            prefix = "👑 " if catch_tables.is_boss(name) else ""
+            desc_lines.append(f"{prefix}{entry['emoji']} **{name}** x{entry['count']} ({entry['value']:,})")
+        if misses:
+            desc_lines.append(f"💨 Hụt: {misses} lần")
+        if treasures:
+            desc_lines.append(f"\n🌟 **KHO BÁU ({len(treasures)})** 🌟")
+            desc_lines.extend(treasures)
+
+        description = "\n".join(desc_lines)
+        if len(description) > 4000:
+            description = description[:4000] + "\n..."
+
+        title = f"🎣 CÂU {budget} LẦN - ĐƯỢC {len(result_list)} CÁ!"
+        if treasures: title += " & KHO BÁU!"
+
+        embed = discord.Embed(title=title, description=description, color=discord.Color.blue())
+        embed.add_field(
+            name="Tổng kết",
+            value=(
+                f"Exp: +{total_xp:,} | Giá trị: {total_val:,} Coiz {emojis.ANIMATED_EMOJI_COIZ}\n"
+                f"Phí câu: -{catch_tables.FISHING_COST * budget:,} | Kho báu: +{coiz:,}{last['rod_broken_msg']}"
+            )
+        )
+
+        # Level Up Logic
+        current_level, current_xp, leveled_up = catch_tables.apply_xp(
+            stats.get("level", 1), stats.get("xp", 0) + total_xp
+        )
+        stats["xp"] = current_xp
+        stats["level"] = current_level
+
+        if leveled_up:
+            try:
+                await interaction.channel.send(f"🎉 **LEVEL UP!** Chúc mừng <@{user_id}> đã đạt **Level {current_level}**! Mở khóa các khu vực mới!")
+            except: pass
+
+        dura_info = ""
+        user_dura = last["user_dura"]
+        if user_dura is not None:
+            dura_info = f" | Độ bền: {max(0, user_dura)}/{RODS[last['rod_key']]['durability']}"
+        embed.set_footer(text=f"Level: {current_level} | XP: {current_xp}/{catch_tables.xp_required(current_level)}{dura_info}")
+
+        await self.check_badges(user_id, interaction.channel, session=session)
+
+        new_view = FishingView(self, user_id, biome_name, last_catch=result_list or None)
+        new_view.message = await interaction.followup.send(embed=embed, view=new_view)
+
 
 
 
 
 
     @app_commands.command(name="fish", description="Bắt đầu câu cá!")
-    async def fish(self, interaction: discord.Interaction):
+    @app_commands.rename(so_lan="so-lan")
+    @app_commands.describe(so_lan=f"Số lần câu liên tục (tối đa {config.FISHING_MAX_CASTS})")
+    async def fish(self, interaction: discord.Interaction,
+                   so_lan: app_commands.Range[int, 1, config.FISHING_MAX_CASTS] = 1):
         await interaction.response.defer()
         
-        data = await self.db.get_fishing_data(interaction.user.id)
-        current_biome = data.get("stats", {}).get("current_biome", "River") # Default to River now
+        session = await FishingSession.load(self.db, interaction.user.id)
+        current_biome = session.stats.get("current_biome", "River") # Default to River now
         
         # Trigger fishing
-        await self.process_fishing(interaction, current_biome)
+        await self.process_fishing(interaction, current_biome, session=session, casts=so_lan)
 
     @app_commands.command(name="khu-vuc", description="Xem và di chuyển đến các khu vực câu cá")
     async def biomes_cmd(self, interaction: discord.Interaction):
@@ -1543,7 +1465,7 @@ class CauCaCog(commands.Cog):
         if "River" not in unlocked: 
             unlocked.append("River")
             stats["unlocked_biomes"] = unlocked
-            await self.db.update_fishing_data(interaction.user.id, stats=stats) # Sync fix if needed
+            await self.db.update_fishing_data(interaction.user.id, stats=stats, base=data) # Sync fix if needed
             
         xp = stats.get("xp", 0)
         level = stats.get("level", 1)
@@ -1563,7 +1485,7 @@ class CauCaCog(commands.Cog):
             
             if biome_key in u:
                 s["current_biome"] = biome_key
-                await self.db.update_fishing_data(interaction.user.id, stats=s)
+                await self.db.update_fishing_data(interaction.user.id, stats=s, base=d)
                 b_info = BIOMES[biome_key]
                 msg = f"✈️ Đã chuyển đến **{b_info['emoji']} {b_info['name']}**!"
                 if interaction.response.is_done():
@@ -1688,7 +1610,7 @@ class CauCaCog(commands.Cog):
                 if not stats.get("current_bait"):
                     stats["current_bait"] = self.bait_key
                 
-                await self.db.update_fishing_data(interaction.user.id, inventory=inv, stats=stats)
+                await self.db.update_fishing_data(interaction.user.id, inventory=inv, stats=stats, base=data)
                 
                 await interaction.response.send_message(f"✅ Đã mua thành công **{qty}x {self.bait_info['emoji']} {self.bait_info['name']}** với giá **{cost:,}** Coiz {emojis.ANIMATED_EMOJI_COIZ}!", ephemeral=True)
 
@@ -1796,7 +1718,7 @@ class CauCaCog(commands.Cog):
                 if "rod_durability" not in inv: inv["rod_durability"] = {}
                 inv["rod_durability"][self.rod_key] = RODS[self.rod_key]["durability"]
                 
-                await self.db.update_fishing_data(interaction.user.id, rod_type=self.rod_key, inventory=inv)
+                await self.db.update_fishing_data(interaction.user.id, rod_type=self.rod_key, inventory=inv, base=data)
                 
                 await interaction.response.edit_message(content=f"🎉 Chúc mừng! Bạn đã sở hữu **{self.rod_info['emoji']} {self.rod_info['name']}**!", view=None)
                 self.value = True
@@ -1870,7 +1792,7 @@ class CauCaCog(commands.Cog):
         
         level = stats.get("level", 1)
         xp = stats.get("xp", 0)
-        req_xp = int(1000 * (1.35 ** (level - 1)))
+        req_xp = catch_tables.xp_required(level)
         
         # Calculate Rank
         rank = await self.db.get_fishing_rank(user_id)
@@ -1945,7 +1867,7 @@ class CauCaCog(commands.Cog):
                     d = await self.db.get_fishing_data(inter.user.id)
                     inventory = d.get("inventory", {})
                     inventory["dragon_balls"] = [] # Clear balls
-                    await self.db.update_fishing_data(inter.user.id, inventory=inventory)
+                    await self.db.update_fishing_data(inter.user.id, inventory=inventory, base=d)
                     
                     # Announcement Embed
                     embed = discord.Embed(title="🐲 RỒNG THẦN ĐÃ XUẤT HIỆN!", description=f"**{inter.user.name}** đã tập hợp đủ 7 viên ngọc rồng và triệu hồi Rồng Thần!\n\n🌌 **ĐIỀU ƯỚC ĐÃ ĐƯỢC THỰC HIỆN:**\nNgười chơi nhận được **{amount_req:,}** Coiz {emojis.ANIMATED_EMOJI_COIZ}!", color=discord.Color.dark_green())
@@ -1978,10 +1900,7 @@ class CauCaCog(commands.Cog):
         boss_fish_hold = []
         
         # Helper to identify boss
-        fish_meta = {}
-        for b_val in BIOMES.values():
-            for f in b_val["fish"]:
-                fish_meta[f["name"]] = f
+        fish_meta = catch_tables.FISH_META
 
         for name, info in fish_inv.items():
             count = info.get("count", 0)
@@ -2014,7 +1933,11 @@ class CauCaCog(commands.Cog):
             
         if total_sold_val > 0:
             stats["lifetime_money"] = stats.get("lifetime_money", 0) + total_sold_val
-            await self.db.update_fishing_data(interaction.user.id, inventory=inv, stats=stats)
+            try:
+                await self.db.update_fishing_data(interaction.user.id, inventory=inv, stats=stats, base=data)
+            except ConcurrentUpdateError:
+                await interaction.followup.send("❌ Túi đồ vừa thay đổi, hãy thử bán lại!", ephemeral=True)
+                return
             await self.db.add_points(interaction.user.id, interaction.guild_id, total_sold_val)
             await self.check_badges(interaction.user.id, interaction.channel)
 
@@ -2064,10 +1987,7 @@ class CauCaCog(commands.Cog):
                 self.parent_inv = parent_inv
                 
                 # Create button for each boss
-                fish_meta = {}
-                for b_val in BIOMES.values():
-                    for f in b_val["fish"]:
-                        fish_meta[f["name"]] = f
+                fish_meta = catch_tables.FISH_META
 
                 for b_name in boss_list:
                     # Get current count
@@ -2140,7 +2060,11 @@ class CauCaCog(commands.Cog):
                 s = d.get("stats", {})
                 s["lifetime_money"] = s.get("lifetime_money", 0) + sell_val
                 
-                await self.db.update_fishing_data(inter.user.id, inventory=inv, stats=s)
+                try:
+                    await self.db.update_fishing_data(inter.user.id, inventory=inv, stats=s, base=d)
+                except ConcurrentUpdateError:
+                    await inter.response.send_message("❌ Túi đồ vừa thay đổi, hãy thử bán lại!", ephemeral=True)
+                    return
                 await self.db.add_points(inter.user.id, inter.guild_id, sell_val)
                 
                 await inter.response.send_message(f"✅ Đã bán **{qty}x {self.boss_name}** với giá **{sell_val:,}** Coiz!", ephemeral=True)
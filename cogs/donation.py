@@ -4,42 +4,46 @@ from discord import app_commands
 import config
 from utils.views import DonationView
 from utils import emojis
-try:
-    from supabase import create_client, Client
-except ImportError as e:
-    print(f"CRITICAL ERROR: Could not import supabase in donation.py: {e}")
-    create_client = None
+from utils.http_client import get_http_session
+from database.postgrest_client import PostgrestClient
 
 class Donation(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.supabase = None
+        self.rest = None
         
-        if config.SUPABASE_URL and config.SUPABASE_KEY and create_client:
+        if config.SUPABASE_URL and config.SUPABASE_KEY:
             try:
-                self.supabase = create_client(config.SUPABASE_URL, config.SUPABASE_KEY)
+                # REST async trên session HTTP dùng chung (không chặn event loop như supabase-py)
+                self.rest = PostgrestClient(
+                    config.SUPABASE_URL, config.SUPABASE_KEY,
+                    timeout=config.SUPABASE_TIMEOUT,
+                    retries=config.SUPABASE_RETRIES,
+                    session_factory=get_http_session
+                )
                 self.check_donations.start()
                 print("  ✅ Donation service connected to Supabase")
             except Exception as e:
                 print(f"  ⚠️ Failed to connect to Supabase: {e}")
         else:
-            print("  ℹ️ Supabase not configured or library missing. Auto-donation check disabled.")
+            print("  ℹ️ Supabase not configured. Auto-donation check disabled.")
 
-    def cog_unload(self):
-        if self.supabase:
+    async def cog_unload(self):
+        if self.rest:
             self.check_donations.cancel()
+            await self.rest.close()
 
     @tasks.loop(minutes=1)
     async def check_donations(self):
-        if not self.supabase:
+        if not self.rest:
             return
             
         try:
             # Query transactions that are 'success' but not 'rewarded'
-            response = self.supabase.table('transactions').select("*").eq('status', 'success').eq('rewarded', False).execute()
+            rows = await self.rest.select('transactions', filters={'status': 'success', 'rewarded': False})
             
-            if response.data:
-                for txn in response.data:
+            if rows:
+                for txn in rows:
                     txn_id = txn.get('id')
                     user_id = int(txn.get('user_id', 0))
                     amount = float(txn.get('amount', 0))
@@ -67,7 +71,10 @@ class Donation(commands.Cog):
                     
                     # Add points using shared database
                     if hasattr(self.bot, 'db'):
-                        await self.bot.db.add_points(user_id, 0, total_coiz)
+                        # Ghi thẳng xuống DB trước khi đánh dấu rewarded (không để trong wallet RAM, tắt bot là mất)
+                        # batch_id theo giao dịch: lỗi giữa chừng thì vòng sau ghi lại không bị cộng hai lần
+                        await self.bot.db.apply_point_deltas({user_id: total_coiz}, f"donation:{txn_id}")
+                        self.bot.db.wallet.observe(user_id, total_coiz)
                         
                         # Check for Donator Rod reward (>= 10k VND)
                         if amount >= 10000:
@@ -83,7 +90,7 @@ class Donation(commands.Cog):
                                     
                                 if rod_key not in inv["rods"]:
                                     inv["rods"].append(rod_key)
-                                    await self.bot.db.update_fishing_data(user_id, inventory=inv)
+                                    await self.bot.db.update_fishing_data(user_id, inventory=inv, base=data)
                                     
                                     # Notify
                                     try:
@@ -118,13 +125,13 @@ class Donation(commands.Cog):
                         pass 
                     
                     # Mark as rewarded
-                    self.supabase.table('transactions').update({'rewarded': True, 'rewarded_at': 'now()'}).eq('id', txn_id).execute()
+                    await self.rest.update('transactions', {'rewarded': True, 'rewarded_at': 'now()'}, {'id': txn_id})
 
             # Query 'late_payment' transactions
-            response_late = self.supabase.table('transactions').select("*").eq('status', 'late_payment').eq('rewarded', False).execute()
+            late_rows = await self.rest.select('transactions', filters={'status': 'late_payment', 'rewarded': False})
             
-            if response_late.data:
-                for txn in response_late.data:
+            if late_rows:
+                for txn in late_rows:
                     txn_id = txn.get('id')
                     user_id = int(txn.get('user_id', 0))
                     amount = float(txn.get('amount', 0))
@@ -148,7 +155,7 @@ class Donation(commands.Cog):
                         pass
                     
                     # Mark as rewarded/handled
-                    self.supabase.table('transactions').update({'rewarded': True, 'rewarded_at': 'now()'}).eq('id', txn_id).execute()
+                    await self.rest.update('transactions', {'rewarded': True, 'rewarded_at': 'now()'}, {'id': txn_id})
 
         except Exception as e:
             print(f"Error in donation loop: {e}")
@@ -164,10 +171,10 @@ class Donation(commands.Cog):
             # Delete pending transactions older than 15 minutes
             # We delete them to keep the DB clean. 
             # If a late payment comes in, the Webhook handles it by creating a new success record.
-            self.supabase.table('transactions').delete().eq('status', 'pending').lt('created_at', threshold).execute()
+            await self.rest.delete('transactions', {'status': 'pending', 'created_at': ('lt', threshold)})
             
             # Also cleanup any 'expired' status rows if they exist
-            self.supabase.table('transactions').delete().eq('status', 'expired').execute()
+            await self.rest.delete('transactions', {'status': 'expired'})
             
         except Exception as e:
             print(f"Error cleaning up expired transactions: {e}")
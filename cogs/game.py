@@ -5,7 +5,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import asyncio
-from typing import Optional
+from typing import Dict, List, Optional
 import random
 import time
 import json
@@ -13,44 +13,73 @@ import json
 import config
 from utils import embeds, emojis
 from utils.validator import WordValidator
+from utils.lexicon import get_lexicon
+from utils.game_session import GameSessionManager
 
 
 class GameCog(commands.Cog):
+    GAME_TYPE = 'wordchain'
+    
     def __init__(self, bot: commands.Bot, db):
         self.bot = bot
         self.db = db
         self.validators = {}  # Cache validators cho mỗi ngôn ngữ
-        self.active_timeouts = {}  # Track timeout tasks
+        self.max_message_length = config.MAX_WORD_LENGTH  # Tin nhắn dài hơn thì router bỏ qua
+        # Trạng thái game trong RAM (write-behind), game bắt đầu/kết thúc thì cập nhật router
+        self.sessions = GameSessionManager(db, on_open=self.route_channel, on_close=self.unroute_channel)
         
     async def cog_load(self):
         """Load word lists khi cog được load"""
         await self.load_word_lists()
+        # Game còn dở từ lần chạy trước
+        for channel_id in list(self.db.active_game_channels):
+            self.route_channel(channel_id)
+        self.sessions.start()
+    
+    async def cog_unload(self):
+        """Flush các game đang chơi xuống database trước khi unload"""
+        for channel_id in list(self.sessions.sessions):
+            self.cancel_turn_timeout(channel_id)
+        for channel_id in list(self.bot.router.routes):
+            self.unroute_channel(channel_id)
+        await self.sessions.stop()
+    
+    async def restore_games(self, snapshots: List[Dict]) -> int:
+        """Khôi phục sau restart: nạp các game nối từ từ game_states và hẹn lại deadline lượt đang dở"""
+        states = await self.db.get_all_game_states()
+        now = time.time()
+        for session in self.sessions.restore(states):
+            if session.is_bot_challenge and session.current_player_id == self.bot.user.id:
+                # Bot đang nghĩ dở thì đánh tiếp
+                channel = self.bot.get_partial_messageable(session.channel_id, guild_id=session.guild_id)
+                self.bot.timers.schedule((session.channel_id, 'turn'), config.RECOVERY_GRACE, self.bot.actors.submit,
+                                         session.channel_id, self.bot_play_turn, channel, session, session.current_word)
+                continue
+            remaining = config.TURN_TIMEOUT - (now - session.turn_start_time)
+            await self.start_turn_timeout(session.channel_id, session.current_player_id,
+                                          max(config.RECOVERY_GRACE, remaining))
+        return len(states)
+    
+    def route_channel(self, channel_id: int):
+        self.bot.router.register(channel_id, 'wordchain', self.handle_message, self.max_message_length)
+    
+    def unroute_channel(self, channel_id: int):
+        self.bot.router.unregister(channel_id, 'wordchain')
     
     async def load_word_lists(self):
-        """Load danh sách từ cho các ngôn ngữ"""
-        # Tiếng Việt
-        try:
-            with open(config.WORDS_VI_PATH, 'r', encoding='utf-8') as f:
-                words_vi = [line.strip() for line in f if line.strip()]
-            self.validators['vi'] = WordValidator('vi', words_vi)
-            print(f"✅ Loaded {len(words_vi)} Vietnamese words")
-        except Exception as e:
-            print(f"❌ Error loading Vietnamese words: {e}")
-        
-        # Tiếng Anh
-        try:
-            with open(config.WORDS_EN_PATH, 'r', encoding='utf-8') as f:
-                words_en = [line.strip() for line in f if line.strip()]
-            self.validators['en'] = WordValidator('en', words_en)
-            print(f"✅ Loaded {len(words_en)} English words")
-        except Exception as e:
-            print(f"❌ Error loading English words: {e}")
+        """Tạo validator cho các ngôn ngữ trên lexicon dùng chung (đã nạp trong setup_hook)"""
+        for lang in config.SUPPORTED_LANGUAGES:
+            lexicon = get_lexicon(lang)
+            self.validators[lang] = WordValidator(lang, lexicon)
+            # Dựng index chữ cái đầu + đồ thị nối từ cho bot ngoài event loop
+            await asyncio.to_thread(self.validators[lang].bot_engine.warm)
+            self.max_message_length = max(self.max_message_length, lexicon.max_length)
     
     def get_random_word(self, language: str) -> str:
         """Lấy từ ngẫu nhiên để bắt đầu game"""
         validator = self.validators.get(language)
-        if validator:
-            return random.choice(list(validator.word_list))
+        if validator and len(validator.lexicon):
+            return validator.lexicon.random_word()
         return "start" if language == "en" else "bat dau"
     
     async def start_wordchain(
@@ -136,18 +165,15 @@ class GameCog(commands.Cog):
         
         first_word = self.get_random_word(lang)
         
-        await self.db.create_game(
+        await self.sessions.create(
             channel_id=channel.id,
             guild_id=interaction.guild_id,
             language=lang,
             first_word=first_word,
-            first_player_id=first_player_id,
+            players=players_list,
             is_bot_challenge=is_bot_challenge
         )
         
-        # Use Suapbase method instead of raw sqlite
-        await self.db.update_game_players(channel.id, players_list, time.time())
-        
         start_embed = discord.Embed(
             title=f"{emojis.START} Game Bắt Đầu! {emojis.CELEBRATION}",
             description=f"**Ngôn ngữ:** {lang_flag} {lang_name}",
@@ -198,8 +224,8 @@ class GameCog(commands.Cog):
     async def stop_wordchain(self, interaction: discord.Interaction):
         """Kết thúc game"""
         # Kiểm tra có game không
-        game_state = await self.db.get_game_state(interaction.channel_id)
-        if not game_state:
+        session = await self.sessions.get(interaction.channel_id)
+        if not session:
             await interaction.response.send_message(
                 f"{emojis.ANIMATED_EMOJI_WRONG} Không có game nào đang chơi!",
                 ephemeral=True
@@ -207,12 +233,10 @@ class GameCog(commands.Cog):
             return
         
         # Cancel timeout nếu có
-        if interaction.channel_id in self.active_timeouts:
-            self.active_timeouts[interaction.channel_id].cancel()
-            del self.active_timeouts[interaction.channel_id]
+        self.cancel_turn_timeout(interaction.channel_id)
         
         # Tìm người thắng (người có nhiều điểm nhất trong phiên)
-        scores = game_state.get('scores', {})
+        scores = session.scores
         winner_id = None
         session_points = 0
         total_points = 0
@@ -229,15 +253,15 @@ class GameCog(commands.Cog):
         await self.db.save_game_history(
             channel_id=interaction.channel_id,
             guild_id=interaction.guild_id,
-            language=game_state['language'],
+            language=session.language,
             winner_id=winner_id,
-            total_turns=game_state['turn_count'],
-            total_words=len(game_state['used_words']),
-            started_at=game_state['started_at']
+            total_turns=session.turn_count,
+            total_words=len(session.used_words),
+            started_at=session.started_at
         )
         
         # Xóa game
-        await self.db.delete_game(interaction.channel_id)
+        await self.sessions.end(interaction.channel_id)
         
         # Thông báo kết thúc
         winner_data = {
@@ -248,8 +272,8 @@ class GameCog(commands.Cog):
         
         embed = embeds.create_game_end_embed(
             winner_data=winner_data,
-            total_turns=game_state['turn_count'],
-            used_words_count=len(game_state['used_words'])
+            total_turns=session.turn_count,
+            used_words_count=len(session.used_words)
         )
         
         await interaction.response.send_message(embed=embed)
@@ -257,9 +281,9 @@ class GameCog(commands.Cog):
     @app_commands.command(name="status", description="📊 Xem trạng thái game hiện tại")
     async def status(self, interaction: discord.Interaction):
         """Hiển thị trạng thái game"""
-        game_state = await self.db.get_game_state(interaction.channel_id)
+        session = await self.sessions.get(interaction.channel_id)
         
-        if not game_state:
+        if not session:
             await interaction.response.send_message(
                 f"{emojis.ANIMATED_EMOJI_WRONG} Không có game nào đang chơi!",
                 ephemeral=True
@@ -268,10 +292,10 @@ class GameCog(commands.Cog):
         
         # Tạo embed status
         status_data = {
-            'current_word': game_state['current_word'],
-            'current_player': game_state['current_player_id'],
-            'words_used': len(game_state['used_words']),
-            'turn_count': game_state['turn_count']
+            'current_word': session.current_word,
+            'current_player': session.current_player_id,
+            'words_used': len(session.used_words),
+            'turn_count': session.turn_count
         }
         
         embed = embeds.create_status_embed(status_data)
@@ -280,9 +304,9 @@ class GameCog(commands.Cog):
     @app_commands.command(name="hint", description="💡 Nhận gợi ý (tốn 100 coiz)")
     async def hint(self, interaction: discord.Interaction):
         """Gợi ý chữ cái tiếp theo"""
-        game_state = await self.db.get_game_state(interaction.channel_id)
+        session = await self.sessions.get(interaction.channel_id)
         
-        if not game_state:
+        if not session:
             await interaction.response.send_message(
                 f"{emojis.ANIMATED_EMOJI_WRONG} Không có game nào đang chơi!",
                 ephemeral=True
@@ -300,22 +324,23 @@ class GameCog(commands.Cog):
         
         # Trừ điểm
         await self.db.add_points(interaction.user.id, interaction.guild_id, -config.HINT_COST)
-        await self.db.update_game_score(interaction.channel_id, interaction.user.id, -config.HINT_COST)
+        session.add_score(interaction.user.id, -config.HINT_COST)
         
         # Lấy gợi ý
-        validator = self.validators[game_state['language']]
-        hint_char = validator.suggest_next_char(game_state['current_word'])
+        validator = self.validators[session.language]
+        hint_char = validator.suggest_next_char(session.current_word)
+        examples = validator.find_possible_words(hint_char.lower(), session.used_set, limit=config.HINT_EXAMPLES)
         
         # Gửi gợi ý
-        embed = embeds.create_hint_embed(hint_char, config.HINT_COST)
+        embed = embeds.create_hint_embed(hint_char, config.HINT_COST, examples)
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
     @app_commands.command(name="pass", description="⏭️ Bỏ lượt (tốn 20 Coiz)")
     async def pass_turn(self, interaction: discord.Interaction):
         """Bỏ lượt không bị trừ coiz timeout"""
-        game_state = await self.db.get_game_state(interaction.channel_id)
+        session = await self.sessions.get(interaction.channel_id)
         
-        if not game_state:
+        if not session:
             await interaction.response.send_message(
                 f"{emojis.ANIMATED_EMOJI_WRONG} Không có game nào đang chơi!",
                 ephemeral=True
@@ -323,7 +348,7 @@ class GameCog(commands.Cog):
             return
         
         # Kiểm tra có phải lượt của người này không
-        if game_state['current_player_id'] != interaction.user.id:
+        if session.current_player_id != interaction.user.id:
             await interaction.response.send_message(
                 f"{emojis.ANIMATED_EMOJI_WRONG} Không phải lượt của bạn!",
                 ephemeral=True
@@ -341,22 +366,17 @@ class GameCog(commands.Cog):
         
         # Trừ điểm
         await self.db.add_points(interaction.user.id, interaction.guild_id, -config.PASS_COST)
-        await self.db.update_game_score(interaction.channel_id, interaction.user.id, -config.PASS_COST)
+        session.add_score(interaction.user.id, -config.PASS_COST)
         
         # Chuyển lượt (giữ nguyên từ hiện tại)
         # Tìm người chơi tiếp theo (không phải bot challenge)
-        next_player = self.get_next_player(game_state, interaction.user.id)
+        next_player = self.get_next_player(session, interaction.user.id)
         
         # Cancel timeout cũ
-        if interaction.channel_id in self.active_timeouts:
-            self.active_timeouts[interaction.channel_id].cancel()
+        self.cancel_turn_timeout(interaction.channel_id)
         
-        # Cập nhật database
-        await self.db.update_game_turn(
-            channel_id=interaction.channel_id,
-            new_word=game_state['current_word'],  # Giữ nguyên từ
-            next_player_id=next_player.id
-        )
+        # Cập nhật session (checkpoint xuống DB chạy nền)
+        session.advance(session.current_word, next_player.id)  # Giữ nguyên từ
         
         # Thông báo
         await interaction.response.send_message(
@@ -367,49 +387,52 @@ class GameCog(commands.Cog):
         # Bắt đầu timeout mới
         await self.start_turn_timeout(interaction.channel_id, next_player.id)
     
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        """Lắng nghe tin nhắn để check từ nối"""
-        # Bỏ qua tin nhắn của bot
-        if message.author.bot:
-            return
-        
-        # Kiểm tra có game không
-        game_state = await self.db.get_game_state(message.channel.id)
-        if not game_state:
+    async def handle_message(self, message: discord.Message):
+        """Message router chỉ gọi khi kênh có game nối từ, tin nhắn đã qua bộ lọc rẻ"""
+        # Tin nhắn, timeout, lượt bot của cùng kênh xử lý lần lượt
+        await self.bot.actors.run(message.channel.id, self.process_message, message)
+    
+    async def process_message(self, message: discord.Message):
+        """Check từ nối (chạy trong hàng đợi của kênh)"""
+        # Kiểm tra có game không (session trong RAM)
+        session = await self.sessions.get(message.channel.id)
+        if not session:
             return
         
         # Kiểm tra có phải lượt của người này không
-        if game_state['current_player_id'] != message.author.id:
+        if session.current_player_id != message.author.id:
             return
         
         # Lấy từ người dùng gửi
         word = message.content.strip().lower()
         
         # Validate từ
-        validator = self.validators[game_state['language']]
+        validator = self.validators[session.language]
         
         # [V2] Min length validation (English)
-        if game_state['language'] == 'en' and len(word) < config.MIN_WORD_LENGTH_EN:
-            await self.handle_wrong_answer(message, game_state, word, f"Từ tiếng Anh phải có ít nhất **{config.MIN_WORD_LENGTH_EN} chữ cái**!")
+        if session.language == 'en' and len(word) < config.MIN_WORD_LENGTH_EN:
+            await self.handle_wrong_answer(message, session, word, f"Từ tiếng Anh phải có ít nhất **{config.MIN_WORD_LENGTH_EN} chữ cái**!")
             return
 
         # Kiểm tra từ đã dùng chưa
-        if word in game_state['used_words']:
-            await self.handle_wrong_answer(message, game_state, word, "Từ này đã được sử dụng rồi!")
+        if session.is_used(word):
+            await self.handle_wrong_answer(message, session, word, "Từ này đã được sử dụng rồi!")
             return
         
         # Kiểm tra nối từ đúng không
-        can_chain, reason = await validator.can_chain(game_state['current_word'], word)
+        can_chain, reason = await validator.can_chain(session.current_word, word)
         
         if not can_chain:
-            await self.handle_wrong_answer(message, game_state, word, reason)
+            await self.handle_wrong_answer(message, session, word, reason)
+            return
+        
+        # Người chơi có thể đã bị timeout / game đã kết thúc trong lúc chờ validate
+        if self.sessions.sessions.get(message.channel.id) is not session or session.current_player_id != message.author.id:
             return
         
         # ĐÚNG!
         # Cancel timeout
-        if message.channel.id in self.active_timeouts:
-            self.active_timeouts[message.channel.id].cancel()
+        self.cancel_turn_timeout(message.channel.id)
         
         # [V2] Calculate points with Time Bonus
         import time
@@ -417,7 +440,7 @@ class GameCog(commands.Cog):
         bonus_list = []
         
         # Time Bonus
-        turn_start = game_state.get('turn_start_time', 0)
+        turn_start = session.turn_start_time
         if turn_start > 0:
             elapsed = time.time() - turn_start
             if elapsed < 5:
@@ -438,15 +461,11 @@ class GameCog(commands.Cog):
         meaning_vi = None
         is_advanced = False
         
-        if game_state['language'] == 'en':
-            # Get Vietnamese meaning for ALL English words
-            if validator.cambridge_api:
-                meaning_vi = await validator.cambridge_api.get_vietnamese_meaning(word)
-
-            # Check length bonus
-            # Check dictionary for advanced status or long status
-            # Check dictionary for level or long status
-            word_info = await validator.cambridge_api.get_word_info(word, 'en')
+        if session.language == 'en':
+            # WordInfo (level, IPA, nghĩa tiếng Việt) đã được tải song song và cache ở bước can_chain
+            word_info = await validator.get_word_info(word)
+            if word_info:
+                meaning_vi = word_info.get('meaning_vi')
             
             level_points = 0
             if word_info and word_info.get('level'):
@@ -468,20 +487,16 @@ class GameCog(commands.Cog):
             
         bonus_reason = "\n".join(bonus_list)
         
-        # Cập nhật điểm và stats
-        await self.db.add_points(message.author.id, message.guild.id, points)
-        await self.db.update_game_score(message.channel.id, message.author.id, points)
-        await self.db.update_player_stats(message.author.id, message.guild.id, word, True)
-        
-        # Tìm người chơi tiếp theo
-        next_player = self.get_next_player(game_state, message.author.id)
+        # Chuyển lượt
+        if session.is_bot_challenge:
+            # Bot đang nghĩ: khóa lượt để người chơi không nối tiếp từ của chính mình
+            next_player_id = self.bot.user.id
+        else:
+            next_player = self.get_next_player(session, message.author.id)
+            next_player_id = next_player.id
         
-        # Cập nhật game state (Reset wrong attempts here is handled by update_game_turn setting it to 0)
-        await self.db.update_game_turn(
-            channel_id=message.channel.id,
-            new_word=word,
-            next_player_id=next_player.id
-        )
+        # Cập nhật session + ghi cả lượt (từ, điểm, stats) trong một lệnh atomic
+        await self.sessions.commit_turn(session, message.author.id, word, points, True, next_player_id)
         
         # Gửi thông báo (Gộp Chính xác + Nghĩa)
         embeds_list = embeds.create_rich_correct_answer_embed(
@@ -496,14 +511,13 @@ class GameCog(commands.Cog):
         await message.channel.send(embeds=embeds_list)
         
         # Check if bot challenge (solo mode)
-        if game_state['is_bot_challenge']:
+        if session.is_bot_challenge:
             # Bot mode: Bot đưa từ mới ngay lập tức
             await asyncio.sleep(1.5)  # Small delay for realism
             
             # Bot picks next word
-            validator = self.validators[game_state['language']]
             next_char = validator.get_last_char(word)
-            bot_word = validator.get_bot_word(next_char, set(game_state['used_words']))
+            bot_word = validator.get_bot_word(next_char, session.used_set, session.bot_difficulty)
             
             if not bot_word:
                 # Bot cannot find word - Player wins!
@@ -513,15 +527,11 @@ class GameCog(commands.Cog):
                     color=config.COLOR_GOLD
                 )
                 await message.channel.send(embed=win_embed)
-                await self.db.delete_game(message.channel.id)
+                await self.sessions.end(message.channel.id)
                 return
             
             # Update game với từ mới của bot
-            await self.db.update_game_turn(
-                channel_id=message.channel.id,
-                new_word=bot_word,
-                next_player_id=message.author.id  # Back to player
-            )
+            session.advance(bot_word, message.author.id)  # Back to player
             
             # Bot announces new word
             turn_end = int(time.time() + config.TURN_TIMEOUT)
@@ -540,38 +550,26 @@ class GameCog(commands.Cog):
             # Start timeout for player's next turn
             await self.start_turn_timeout(message.channel.id, message.author.id)
         else:
-            # Multi-player mode: Normal turn rotation
-            next_player = self.get_next_player(game_state, message.author.id)
-            
-            # Update game state
-            await self.db.update_game_turn(
-                channel_id=message.channel.id,
-                new_word=word,
-                next_player_id=next_player.id
-            )
-            
+            # Multi-player mode: lượt đã được chuyển ở trên
             # Start timeout cho người chơi tiếp
             await self.start_turn_timeout(message.channel.id, next_player.id)
     
-    def get_next_player(self, game_state: dict, current_user_id: int) -> discord.User:
+    def get_next_player(self, session, current_user_id: int) -> discord.User:
         """Lấy người chơi tiếp theo"""
-        players = game_state['players']
-        current_index = players.index(current_user_id)
-        next_index = (current_index + 1) % len(players)
-        next_player_id = players[next_index]
+        next_player_id = session.next_player_id(current_user_id)
         
         # Nếu chỉ có 1 người chơi, trả về chính họ
         return self.bot.get_user(next_player_id) or self.bot.get_user(current_user_id)
     
-    async def bot_play_turn(self, channel: discord.TextChannel, game_state: dict, previous_word: str):
+    async def bot_play_turn(self, channel: discord.TextChannel, session, previous_word: str):
         """Bot tự động chơi (cho bot challenge)"""
         await asyncio.sleep(2)  # Delay để realistic
         
-        validator = self.validators[game_state['language']]
+        validator = self.validators[session.language]
         next_char = validator.get_last_char(previous_word)
         
-        # Bot chọn từ khó
-        bot_word = validator.get_bot_word(next_char, set(game_state['used_words']))
+        # Bot chọn từ theo độ khó của ván
+        bot_word = validator.get_bot_word(next_char, session.used_set, session.bot_difficulty)
         
         if not bot_word:
             # Bot không tìm được từ -> người chơi thắng
@@ -579,53 +577,57 @@ class GameCog(commands.Cog):
                 f"{emojis.ROBOT} Bot không tìm được từ nào! {emojis.CELEBRATION} Bạn thắng!"
             )
             # Kết thúc game
-            await self.db.delete_game(channel.id)
+            await self.sessions.end(channel.id)
             return
         
         # Bot gửi từ
         await channel.send(f"{emojis.ROBOT} Bot: **{bot_word.upper()}**")
         
         # Cập nhật game
-        human_player = game_state['players'][0]  # Người chơi là người đầu tiên
-        await self.db.update_game_turn(
-            channel_id=channel.id,
-            new_word=bot_word,
-            next_player_id=human_player
-        )
+        human_player = session.players[0]  # Người chơi là người đầu tiên
+        session.advance(bot_word, human_player)
         
         # Bắt đầu timeout cho người chơi
         await self.start_turn_timeout(channel.id, human_player)
     
-    async def start_turn_timeout(self, channel_id: int, player_id: int):
-        """Bắt đầu đếm ngược timeout"""
-        # Cancel timeout cũ nếu có
-        if channel_id in self.active_timeouts:
-            self.active_timeouts[channel_id].cancel()
-        
-        # Tạo task mới
-        task = asyncio.create_task(self.timeout_handler(channel_id, player_id))
-        self.active_timeouts[channel_id] = task
+    async def start_turn_timeout(self, channel_id: int, player_id: int, delay: float = None):
+        """Bắt đầu đếm ngược timeout (timer wheel dùng chung, đặt lại thì thay timer cũ)"""
+        delay = config.TURN_TIMEOUT if delay is None else delay
+        session = self.sessions.sessions.get(channel_id)
+        turn = session.turn_count if session else None
+        # Hết hạn thì timeout đi vào hàng đợi của kênh như một sự kiện bình thường
+        self.bot.timers.schedule((channel_id, 'turn'), delay, self.bot.actors.submit,
+                                 channel_id, self.timeout_handler, channel_id, player_id, turn)
+    
+    def cancel_turn_timeout(self, channel_id: int):
+        self.bot.timers.cancel((channel_id, 'turn'))
     
-    async def timeout_handler(self, channel_id: int, player_id: int):
-        """Xử lý khi hết thời gian"""
+    async def timeout_handler(self, channel_id: int, player_id: int, turn: Optional[int] = None):
+        """Xử lý khi hết thời gian (timer wheel đẩy vào hàng đợi của kênh lúc hết hạn)"""
         try:
-            await asyncio.sleep(config.TURN_TIMEOUT)
+            # Deadline khôi phục sau restart có thể tới trước khi cache channel/user sẵn sàng
+            await self.bot.wait_until_ready()
             
-            # Lấy game state
-            game_state = await self.db.get_game_state(channel_id)
-            if not game_state:
+            # Lấy game session
+            session = await self.sessions.get(channel_id)
+            if not session:
                 return
             
             # Kiểm tra xem người chơi có đúng là người timeout không
-            if game_state['current_player_id'] != player_id:
+            # (so cả số lượt: đấu bot thì lượt mới vẫn là cùng người chơi)
+            if session.current_player_id != player_id or (turn is not None and session.turn_count != turn):
                 return  # Đã chuyển lượt rồi
             
             # Trừ coiz timeout (-10)
             channel = self.bot.get_channel(channel_id)
             player = self.bot.get_user(player_id)
             
-            await self.db.add_points(player_id, game_state['guild_id'], config.POINTS_TIMEOUT)
-            await self.db.update_game_score(channel_id, player_id, config.POINTS_TIMEOUT)
+            session.add_score(player_id, config.POINTS_TIMEOUT)
+            # Chuyển lượt ngay trong RAM để tin nhắn đến muộn không còn hợp lệ
+            next_player = self.get_next_player(session, player_id)
+            session.advance(session.current_word, next_player.id)  # Giữ nguyên từ
+            
+            await self.db.add_points(player_id, session.guild_id, config.POINTS_TIMEOUT)
             
             # Gửi thông báo timeout
             embed = embeds.create_timeout_embed(player.mention)
@@ -633,43 +635,38 @@ class GameCog(commands.Cog):
             embed.description = f"{player.mention} {emojis.SNAIL} đã không trả lời kịp thời! (-{abs(config.POINTS_TIMEOUT)} Coiz {emojis.ANIMATED_EMOJI_COIZ})"
             await channel.send(embed=embed)
             
-            # Chuyển lượt
-            next_player = self.get_next_player(game_state, player_id)
-            await self.db.update_game_turn(
-                channel_id=channel_id,
-                new_word=game_state['current_word'],  # Giữ nguyên từ
-                next_player_id=next_player.id
-            )
-            
             await channel.send(f"Lượt tiếp theo: {next_player.mention}")
             
             # Bắt đầu timeout mới
             await self.start_turn_timeout(channel_id, next_player.id)
             
         except asyncio.CancelledError:
-            # Task bị cancel (người chơi đã trả lời kịp)
+            # Bot đang tắt (timer wheel hủy các callback đang chạy)
             pass
 
 
 
-    async def handle_wrong_answer(self, message, game_state, word, reason):
+    async def handle_wrong_answer(self, message, session, word, reason):
         """Xử lý trả lời sai"""
-        current_wrong = game_state.get('wrong_attempts', 0) + 1
+        current_wrong = session.wrong_attempts + 1
         
         # Tính coiz trừ tích lũy: 2, 4, 6... (Mỗi lần sai -2)
         # Hoặc đơn giản là mỗi lần sai trừ 2 coiz, user yêu cầu "trừ tối đa 10 coiz" cho 5 lần
         # -> Nghĩa là lần 1 trừ 2, lần 2 trừ 2... tổng 5 lần là 10.
         penalty = config.POINTS_WRONG # -2
         
-        await self.db.add_points(message.author.id, message.guild.id, penalty)
-        await self.db.update_game_score(message.channel.id, message.author.id, penalty)
-        await self.db.update_player_stats(message.author.id, message.guild.id, word, False)
+        # Quá số lần sai -> chuyển lượt luôn trong cùng lệnh commit_turn
+        next_player = None
+        if current_wrong >= config.MAX_WRONG_ATTEMPTS:
+            next_player = self.get_next_player(session, message.author.id)
         
-        # Update wrong attempts count
-        await self.db.update_wrong_attempts(message.channel.id, current_wrong)
+        await self.sessions.commit_turn(
+            session, message.author.id, word, penalty, False,
+            next_player.id if next_player else None
+        )
         
         # Check limit
-        if current_wrong >= config.MAX_WRONG_ATTEMPTS:
+        if next_player:
             embed = discord.Embed(
                 title=f"{emojis.SKULL} Mất Lượt!",
                 description=f"{message.author.mention} đã trả lời sai quá {config.MAX_WRONG_ATTEMPTS} lần!\nTự động chuyển lượt.",
@@ -677,18 +674,8 @@ class GameCog(commands.Cog):
             )
             await message.channel.send(embed=embed)
             
-            # Chuyển lượt
-            next_player = self.get_next_player(game_state, message.author.id)
-            
             # Cancel timeout cũ
-            if message.channel.id in self.active_timeouts:
-                self.active_timeouts[message.channel.id].cancel()
-                
-            await self.db.update_game_turn(
-                channel_id=message.channel.id,
-                new_word=game_state['current_word'],
-                next_player_id=next_player.id
-            )
+            self.cancel_turn_timeout(message.channel.id)
             
             await message.channel.send(f"Lượt tiếp theo: {next_player.mention}")
             await self.start_turn_timeout(message.channel.id, next_player.id)
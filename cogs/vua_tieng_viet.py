@@ -7,23 +7,64 @@ import asyncio
 import config
 from utils import emojis
 
+HINT_INTERVAL = 45  # Giây giữa hai lần bot mở một ô chữ
 
 class VuaTiengVietCog(commands.Cog):
+    GAME_TYPE = 'vuatiengviet'
+
     def __init__(self, bot: commands.Bot, db):
         self.bot = bot
         self.db = db
-        self.active_games = {} # channel_id -> {"answer": str, "scrambled": str, "state": str, "total_chars": int, "revealed_indices": set, "timer_task": Task}
+        self.active_games = {} # channel_id -> {"answer": str, "scrambled": str, "state": str, "total_chars": int, "revealed_indices": set} (hẹn giờ gợi ý nằm trên bot.timers)
         self.questions = []
+        self.max_answer_length = None  # Tin nhắn dài hơn đáp án dài nhất thì router bỏ qua
         self.load_questions()
 
     async def cog_load(self):
         self.load_questions()
 
+    def snapshot_games(self):
+        """Trạng thái các game đang chơi để ghi lúc tắt bot (bot.snapshot_games)"""
+        return {
+            channel_id: {
+                "answer": game["answer"],
+                "scrambled": game["scrambled"],
+                "state": game["state"],
+                "total_chars": game["total_chars"],
+                "revealed_indices": sorted(game["revealed_indices"]),
+                "hint_in": self.bot.timers.remaining((channel_id, 'hint'))
+            }
+            for channel_id, game in self.active_games.items()
+        }
+
+    async def restore_games(self, snapshots):
+        """Dựng lại game từ snapshot: câu đang dở thì chơi tiếp, đang chờ thì sang câu mới"""
+        for snapshot in snapshots:
+            data = snapshot["data"]
+            channel = self.bot.get_partial_messageable(snapshot["channel_id"])
+            if data["state"] != "playing":
+                self.bot.timers.schedule((channel.id, 'round'), config.RECOVERY_GRACE, self.bot.actors.submit,
+                                         channel.id, self.start_new_round, channel)
+                continue
+
+            self.active_games[channel.id] = {
+                "answer": data["answer"],
+                "scrambled": data["scrambled"],
+                "state": "playing",
+                "total_chars": data["total_chars"],
+                "revealed_indices": set(data["revealed_indices"])
+            }
+            self.bot.router.register(channel.id, 'vuatiengviet', self.handle_message, self.max_answer_length)
+            self.bot.timers.schedule((channel.id, 'hint'), data.get("hint_in") or HINT_INTERVAL, self.bot.actors.submit,
+                                     channel.id, self.reveal_hint, channel, data["answer"])
+        return len(snapshots)
+
     def load_questions(self):
         try:
             with open(config.DATA_VUA_TIENG_VIET_PATH, 'r', encoding='utf-8') as f:
                 self.questions = json.load(f)
             print(f"✅ Loaded {len(self.questions)} Vua Tieng Viet questions")
+            self.max_answer_length = max((len(" ".join(q.split())) for q in self.questions), default=0)
         except Exception as e:
             print(f"❌ Error loading Vua Tieng Viet questions: {e}")
             self.questions = ["Lỗi tải câu hỏi"]
@@ -53,44 +94,46 @@ class VuaTiengVietCog(commands.Cog):
         return " - ".join(hint_parts)
 
     def cancel_timer(self, channel_id):
-        if channel_id in self.active_games:
-            task = self.active_games[channel_id].get("timer_task")
-            if task and not task.done():
-                task.cancel()
+        self.bot.timers.cancel((channel_id, 'hint'))
+
+    def schedule_hint(self, channel, correct_answer):
+        self.bot.timers.schedule((channel.id, 'hint'), HINT_INTERVAL, self.bot.actors.submit,
+                                 channel.id, self.reveal_hint, channel, correct_answer)
 
-    async def hint_timer(self, channel, correct_answer):
+    async def reveal_hint(self, channel, correct_answer):
+        """Timer wheel gọi mỗi HINT_INTERVAL giây: mở thêm một ô chữ rồi hẹn lần tiếp theo"""
         try:
-            while True:
-                await asyncio.sleep(45)
-                if channel.id not in self.active_games: return
-                
-                game_data = self.active_games[channel.id]
-                if game_data["answer"] != correct_answer or game_data["state"] != "playing": return
-                
-                revealed = game_data["revealed_indices"]
-                total_chars = game_data["total_chars"]
-                
-                available = [i for i in range(total_chars) if i not in revealed]
-                if available:
-                    pick = random.choice(available)
-                    revealed.add(pick)
-                    
-                    new_hint = self.generate_hint_text(correct_answer, revealed)
-                    scrambled = game_data["scrambled"]
-                    
-                    embed = discord.Embed(
-                        title="👑 Vua Tiếng Việt - Gợi Ý", 
-                        description="⏳ Đã qua 45s! Bot mở giúp bạn 1 ô chữ:", 
-                        color=0xFFA500
-                    )
-                    embed.add_field(name="Câu hỏi", value=f"**```\n{scrambled.upper()}\n```**", inline=False)
-                    embed.add_field(name="Gợi ý đang mở", value=f"**{new_hint}**", inline=False)
-                    embed.set_footer(text="⚠️ Điểm thưởng sẽ bị trừ tương ứng với số ô được mở sẵn.")
-                    
-                    await channel.send(embed=embed)
-                else:
-                    # No more chars to reveal
-                    break
+            if channel.id not in self.active_games: return
+            
+            game_data = self.active_games[channel.id]
+            if game_data["answer"] != correct_answer or game_data["state"] != "playing": return
+            
+            revealed = game_data["revealed_indices"]
+            total_chars = game_data["total_chars"]
+            
+            available = [i for i in range(total_chars) if i not in revealed]
+            if not available:
+                # No more chars to reveal
+                return
+            
+            pick = random.choice(available)
+            revealed.add(pick)
+            
+            new_hint = self.generate_hint_text(correct_answer, revealed)
+            scrambled = game_data["scrambled"]
+            
+            embed = discord.Embed(
+                title="👑 Vua Tiếng Việt - Gợi Ý", 
+                description=f"⏳ Đã qua {HINT_INTERVAL}s! Bot mở giúp bạn 1 ô chữ:", 
+                color=0xFFA500
+            )
+            embed.add_field(name="Câu hỏi", value=f"**```\n{scrambled.upper()}\n```**", inline=False)
+            embed.add_field(name="Gợi ý đang mở", value=f"**{new_hint}**", inline=False)
+            embed.set_footer(text="⚠️ Điểm thưởng sẽ bị trừ tương ứng với số ô được mở sẵn.")
+            
+            # Hẹn lần mở tiếp theo trước khi gửi (gửi chậm không làm lệch nhịp gợi ý)
+            self.schedule_hint(channel, correct_answer)
+            await channel.send(embed=embed)
         except asyncio.CancelledError:
             pass
 
@@ -140,17 +183,17 @@ class VuaTiengVietCog(commands.Cog):
 
         await channel.send(embed=embed)
         
-        # Create timer task
-        task = self.bot.loop.create_task(self.hint_timer(channel, question))
+        # Hẹn giờ mở gợi ý
+        self.schedule_hint(channel, question)
 
         self.active_games[channel.id] = {
             "answer": question,
             "scrambled": scrambled,
             "state": "playing",
             "total_chars": total_chars,
-            "revealed_indices": revealed_indices,
-            "timer_task": task
+            "revealed_indices": revealed_indices
         }
+        self.bot.router.register(channel.id, 'vuatiengviet', self.handle_message, self.max_answer_length)
 
     async def start_game(self, interaction: discord.Interaction):
         """Bắt đầu game Vua Tiếng Việt"""
@@ -168,6 +211,7 @@ class VuaTiengVietCog(commands.Cog):
         if interaction.channel_id in self.active_games:
             self.cancel_timer(interaction.channel_id)
             game_data = self.active_games.pop(interaction.channel_id)
+            self.bot.router.unregister(interaction.channel_id, 'vuatiengviet')
             # If state was waiting, there is no current answer to show, or we can just say stopped.
             msg = "🛑 Game đã kết thúc!"
             if game_data.get("state") == "playing":
@@ -177,9 +221,12 @@ class VuaTiengVietCog(commands.Cog):
         else:
             await interaction.response.send_message("❌ Không có game Vua Tiếng Việt nào đang diễn ra ở đây.", ephemeral=True)
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if message.author.bot: return
+    async def handle_message(self, message: discord.Message):
+        """Message router chỉ gọi khi kênh có game Vua Tiếng Việt"""
+        # Tin nhắn và gợi ý của cùng kênh xử lý lần lượt (hai người trả lời cùng lúc chỉ một người thắng)
+        await self.bot.actors.run(message.channel.id, self.process_message, message)
+
+    async def process_message(self, message: discord.Message):
         if message.channel.id not in self.active_games: return
 
         game_data = self.active_games[message.channel.id]
@@ -230,12 +277,14 @@ class VuaTiengVietCog(commands.Cog):
             
             await message.channel.send(embed=embed)
             
-            # Wait a bit before next round
-            await asyncio.sleep(5)
-            
-            # Check if game was stopped during sleep
-            if message.channel.id in self.active_games:
-                await self.start_new_round(message.channel)
+            # Wait a bit before next round (hẹn trên timer wheel, không giữ hàng đợi của kênh)
+            self.bot.timers.schedule((message.channel.id, 'round'), 5, self.bot.actors.submit,
+                                     message.channel.id, self.next_round, message.channel)
+
+    async def next_round(self, channel):
+        # Check if game was stopped during the wait
+        if channel.id in self.active_games:
+            await self.start_new_round(channel)
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(VuaTiengVietCog(bot, bot.db))
@@ -101,11 +101,71 @@ class XepHinhView(discord.ui.View):
         await self.cog.stop_game(interaction)
 
 class XepHinhCog(commands.Cog):
+    GAME_TYPE = 'xephinh'
+
     def __init__(self, bot: commands.Bot, db):
         self.bot = bot
         self.db = db
         self.active_games = {} 
 
+    def snapshot_games(self):
+        """Bàn cờ các game đang chơi để ghi lúc tắt bot (bot.snapshot_games)"""
+        return {
+            channel_id: {
+                'player_id': gd['player_id'],
+                'guild_id': gd['guild_id'],
+                'message_id': gd['message'].id,
+                'board': gd['board'],
+                'score': gd['score'],
+                'lines': gd['lines'],
+                'cur_shape': gd['cur_shape'],
+                'rotation_pos': gd['rotation_pos'],
+                'start_higher': gd['start_higher']
+            }
+            for channel_id, gd in self.active_games.items()
+            if not gd['game_over'] and gd.get('message')
+        }
+
+    async def cog_unload(self):
+        """Dừng loop mà không chốt điểm: game đã nằm trong snapshot, khởi động lại sẽ chơi tiếp"""
+        for gd in self.active_games.values():
+            gd['suspended'] = True
+            task = gd.get('game_task')
+            if task and not task.done():
+                task.cancel()
+
+    async def restore_games(self, snapshots):
+        """Dựng lại game từ snapshot, gắn bộ nút mới vào tin nhắn cũ rồi chạy tiếp loop"""
+        restored = 0
+        for snapshot in snapshots:
+            data = snapshot['data']
+            channel_id = snapshot['channel_id']
+            channel = self.bot.get_partial_messageable(channel_id, guild_id=data['guild_id'])
+            message = channel.get_partial_message(data['message_id'])
+            try:
+                await message.edit(view=XepHinhView(self, channel_id, data['player_id']))
+            except discord.HTTPException:
+                continue  # Tin nhắn đã bị xóa
+
+            self.active_games[channel_id] = {
+                'player_id': data['player_id'],
+                'guild_id': data['guild_id'],
+                'board': data['board'],
+                'score': data['score'],
+                'lines': data['lines'],
+                'cur_shape': data['cur_shape'],
+                'rotation_pos': data['rotation_pos'],
+                'input_queue': [],
+                'start_higher': data['start_higher'],
+                'game_over': False,
+                'input_event': asyncio.Event(),
+                'last_render': None,
+                'message': message
+            }
+            self.active_games[channel_id]['game_task'] = asyncio.create_task(self.game_loop(channel_id))
+            restored += 1
+        return restored
+
     def make_empty_board(self):
         return [[EMPTY_SQUARE for _ in range(NUM_COLS)] for _ in range(NUM_ROWS)]
 
@@ -136,6 +196,7 @@ class XepHinhCog(commands.Cog):
         # Initialize game state
         game_data = {
             'player_id': interaction.user.id,
+            'guild_id': interaction.guild_id,
             'board': self.make_empty_board(),
             'score': 0,
             'lines': 0,
@@ -275,12 +336,10 @@ class XepHinhCog(commands.Cog):
                 now = asyncio.get_running_loop().time()
                 timeout = max(0.05, GRAVITY_DELAY - (now - last_gravity_time))
                 
-                # Wait for input OR gravity timeout
-                try:
-                    await asyncio.wait_for(gd['input_event'].wait(), timeout=timeout)
-                    gd['input_event'].clear()
-                except asyncio.TimeoutError:
-                    pass # Gravity tick
+                # Wait for input OR gravity tick (timer wheel đánh thức loop khi tới lượt rơi)
+                self.bot.timers.schedule((channel_id, 'gravity'), timeout, gd['input_event'].set)
+                await gd['input_event'].wait()
+                gd['input_event'].clear()
 
                 # Check game over again after wait
                 if gd['game_over']: break
@@ -381,7 +440,11 @@ class XepHinhCog(commands.Cog):
         except Exception as e:
             print(f"Error in Tetris loop: {e}")
         finally:
-            if channel_id in self.active_games:
+            self.bot.timers.cancel((channel_id, 'gravity'))
+            if channel_id in self.active_games and self.active_games[channel_id].get('suspended'):
+                # Bot đang tắt: game đã được snapshot, không chốt điểm
+                del self.active_games[channel_id]
+            elif channel_id in self.active_games:
                 gd = self.active_games[channel_id]
                 final_score = gd['score']
                 player_id = gd['player_id']
@@ -390,7 +453,7 @@ class XepHinhCog(commands.Cog):
                 final_coiz = final_score * 100
                 
                 if final_coiz > 0:
-                    await self.db.add_points(player_id, gd['message'].guild.id, final_coiz)
+                    await self.db.add_points(player_id, gd['guild_id'], final_coiz)
                 
                 embed = discord.Embed(
                     title="GAME OVER",
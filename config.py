@@ -15,6 +15,8 @@ COMMAND_PREFIX = os.getenv('COMMAND_PREFIX', '/')
 DEFAULT_LANGUAGE = os.getenv('DEFAULT_LANGUAGE', 'vi')
 REGISTRATION_TIMEOUT = int(os.getenv('REGISTRATION_TIMEOUT', 60))  # Thời gian đăng ký (giây)
 TURN_TIMEOUT = int(os.getenv('TURN_TIMEOUT', 45))  # Thời gian mỗi lượt (giây)
+GAME_CHECKPOINT_INTERVAL = int(os.getenv('GAME_CHECKPOINT_INTERVAL', 10))  # Chu kỳ ghi game state xuống DB (giây)
+RECOVERY_GRACE = int(os.getenv('RECOVERY_GRACE', 10))  # Sau khi restart, lượt chơi còn ít nhất ngần này giây (giây)
 
 # Points System
 POINTS_CORRECT = int(os.getenv('POINTS_CORRECT', 100))
@@ -32,6 +34,7 @@ POINTS_SLOW_REPLY = int(os.getenv('POINTS_SLOW_REPLY', 20))
 # Advanced Word Scoring
 MIN_WORD_LENGTH_EN = int(os.getenv('MIN_WORD_LENGTH_EN', 3))
 LONG_WORD_THRESHOLD = int(os.getenv('LONG_WORD_THRESHOLD', 10))
+MAX_WORD_LENGTH = int(os.getenv('MAX_WORD_LENGTH', 45))  # Tin nhắn dài hơn mức này (và dài hơn mọi từ trong lexicon) không được chấm
 
 # English Level Scoring
 # Max bonus: 1000 (Academic/C2), Min: 0 (A1)
@@ -53,6 +56,7 @@ LEVEL_BONUS = {
 
 # Powerups
 HINT_COST = int(os.getenv('HINT_COST', 100))
+HINT_EXAMPLES = int(os.getenv('HINT_EXAMPLES', 3))  # Số từ ví dụ kèm gợi ý (lấy từ lexicon, chưa dùng trong game)
 PASS_COST = int(os.getenv('PASS_COST', 50))
 
 # Database
@@ -74,7 +78,19 @@ COLOR_NEUTRAL = 0x95A5A6  # Grey
 USE_DICTIONARY_API = os.getenv('USE_DICTIONARY_API', 'true').lower() == 'true'
 API_TIMEOUT = int(os.getenv('API_TIMEOUT', 5))  # seconds
 ENABLE_WORD_CACHE = os.getenv('ENABLE_WORD_CACHE', 'true').lower() == 'true'
-CACHE_SIZE = int(os.getenv('CACHE_SIZE', 1000))
+CACHE_SIZE = int(os.getenv('CACHE_SIZE', 1000))  # Số từ giữ trên RAM (phần còn lại nằm trên đĩa)
+WORD_CACHE_PATH = os.getenv('WORD_CACHE_PATH', 'data/word_cache.db')
+WORD_CACHE_POSITIVE_TTL = int(os.getenv('WORD_CACHE_POSITIVE_TTL', 30 * 86400))  # Hạn cache từ hợp lệ (giây)
+WORD_CACHE_NEGATIVE_TTL = int(os.getenv('WORD_CACHE_NEGATIVE_TTL', 86400))  # Hạn cache từ không hợp lệ (giây)
+
+# HTTP (session dùng chung cho dictionary API + donation monitor)
+HTTP_POOL_LIMIT = int(os.getenv('HTTP_POOL_LIMIT', 50))  # Tổng số connection tối đa
+HTTP_LIMIT_PER_HOST = int(os.getenv('HTTP_LIMIT_PER_HOST', 10))  # Connection tối đa mỗi host
+HTTP_DNS_TTL = int(os.getenv('HTTP_DNS_TTL', 300))  # Cache DNS (giây)
+HTTP_KEEPALIVE = float(os.getenv('HTTP_KEEPALIVE', 60))  # Giữ connection rảnh để dùng lại (giây)
+
+# Timer wheel (timeout lượt chơi, gợi ý, trọng lực xếp hình...)
+TIMER_TICK = float(os.getenv('TIMER_TICK', 0.1))  # Độ phân giải của bộ hẹn giờ (giây)
 
 # Languages
 SUPPORTED_LANGUAGES = ['vi', 'en']
@@ -100,3 +116,14 @@ MOMO_PHONE = os.getenv('MOMO_PHONE', '0000000000')
 # Supabase
 SUPABASE_URL = os.getenv('SUPABASE_URL', '')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY', '')
+SUPABASE_MAX_CONNECTIONS = int(os.getenv('SUPABASE_MAX_CONNECTIONS', 20))  # Số request REST đồng thời tối đa
+SUPABASE_TIMEOUT = float(os.getenv('SUPABASE_TIMEOUT', 10))  # Timeout mỗi request (giây)
+SUPABASE_RETRIES = int(os.getenv('SUPABASE_RETRIES', 2))  # Số lần retry khi lỗi mạng / 5xx
+
+# Wallet (gom add_points và ghi theo lô)
+WALLET_FLUSH_INTERVAL = float(os.getenv('WALLET_FLUSH_INTERVAL', 2))  # Chu kỳ flush delta Coiz (giây)
+WALLET_CACHE_TTL = float(os.getenv('WALLET_CACHE_TTL', 60))  # Thời gian tin cache số dư (giây)
+WALLET_CACHE_SIZE = int(os.getenv('WALLET_CACHE_SIZE', 10000))
+
+# Câu cá
+FISHING_MAX_CASTS = int(os.getenv('FISHING_MAX_CASTS', 50))  # Số lần câu tối đa trong một lệnh /fish so-lan
@@ -3,17 +3,43 @@ Database Manager - Quản lý SQLite database cho game
 Lưu trữ: game states, player stats, leaderboard
 """
 import aiosqlite
+import asyncio
 import json
+import os
+import time
+import urllib.parse
+from contextlib import asynccontextmanager
 from typing import Dict, List, Optional
 from datetime import datetime
 
+from database.versioning import VersionedRecord, versioned_update
+from database.wallet import WalletService
+
+POINT_BATCH_TTL = 86400  # Giữ batch_id đã ghi 1 ngày (đủ cho mọi lần gửi lại)
+
 class DatabaseManager:
     def __init__(self, db_path: str):
         self.db_path = db_path
+        self.conn: Optional[aiosqlite.Connection] = None  # Connection ghi dùng chung (mở trong initialize)
+        self.reader: Optional[aiosqlite.Connection] = None  # Connection chỉ đọc: WAL snapshot, không thấy transaction ghi dở
+        self._write_lock = asyncio.Lock()
+        self.wallet = WalletService(self)  # Gom add_points, flush theo lô
+        # Registry các kênh đang có game nối từ (authoritative, giữ trong RAM)
+        self.active_game_channels: set = set()
+        # Bản sao bảng channel_configs (channel_id -> game_type), ghi write-through
+        self.channel_configs: Dict[int, str] = {}
     
     async def initialize(self):
-        """Tạo các bảng cần thiết"""
-        async with aiosqlite.connect(self.db_path) as db:
+        """Mở connection dùng chung và tạo các bảng cần thiết"""
+        # isolation_level=None: tự quản lý transaction bằng BEGIN/COMMIT trong transaction()
+        self.conn = await aiosqlite.connect(self.db_path, isolation_level=None, cached_statements=256)
+        await self.conn.execute("PRAGMA journal_mode=WAL")
+        await self.conn.execute("PRAGMA synchronous=NORMAL")
+        await self.conn.execute("PRAGMA busy_timeout=5000")
+        await self.conn.execute("PRAGMA temp_store=MEMORY")
+        
+        async with self._write_lock:
+            db = self.conn
             # Bảng game states (trạng thái game đang chơi)
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS game_states (
@@ -90,6 +116,25 @@ class DatabaseManager:
                 )
             """)
 
+            # Snapshot các game chỉ sống trong RAM (ghi lúc tắt bot, đọc một lần lúc khởi động)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS game_snapshots (
+                    channel_id INTEGER NOT NULL,
+                    game_type TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    saved_at REAL NOT NULL,
+                    PRIMARY KEY (channel_id, game_type)
+                )
+            """)
+
+            # Các lô delta Coiz đã ghi (WalletService gửi lại lô lỗi không bị cộng hai lần)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS point_batches (
+                    batch_id TEXT PRIMARY KEY,
+                    applied_at REAL NOT NULL
+                )
+            """)
+
             # Bảng fishing inventory
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS fishing_inventory (
@@ -99,10 +144,16 @@ class DatabaseManager:
                     inventory TEXT DEFAULT '{}',
                     upgrades TEXT DEFAULT '{}',
                     stats TEXT DEFAULT '{}',
-                    last_fished TIMESTAMP
+                    last_fished TIMESTAMP,
+                    version INTEGER NOT NULL DEFAULT 0
                 )
             """)
             
+            try:
+                await db.execute("ALTER TABLE fishing_inventory ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            except Exception:
+                pass
+            
             await db.commit()
             
             # Migrate points to global (guild_id = 0)
@@ -111,6 +162,55 @@ class DatabaseManager:
             # Migrate daily columns
             await self.migrate_daily_columns(db)
 
+        # Mở sau khi đã tạo bảng / bật WAL (mode=ro không tự tạo file)
+        uri = f"file:{urllib.parse.quote(os.path.abspath(self.db_path))}?mode=ro"
+        self.reader = await aiosqlite.connect(uri, uri=True, isolation_level=None, cached_statements=256)
+        await self.reader.execute("PRAGMA busy_timeout=5000")
+        await self.reader.execute("PRAGMA temp_store=MEMORY")
+
+        await self.load_active_games()
+        await self.load_channel_configs()
+        self.wallet.start()
+
+    async def load_active_games(self):
+        """Nạp registry kênh đang có game từ bảng game_states (chạy lúc khởi động)"""
+        async with self.read() as db:
+            async with db.execute("SELECT channel_id FROM game_states") as cursor:
+                rows = await cursor.fetchall()
+        self.active_game_channels = {row[0] for row in rows}
+
+    def has_active_game(self, channel_id: int) -> bool:
+        """Kiểm tra nhanh trong RAM, không gọi database"""
+        return channel_id in self.active_game_channels
+
+    async def close(self):
+        """Flush wallet rồi đóng connection dùng chung"""
+        await self.wallet.close()
+        if self.reader:
+            await self.reader.close()
+            self.reader = None
+        if self.conn:
+            await self.conn.close()
+            self.conn = None
+
+    @asynccontextmanager
+    async def read(self):
+        """Connection cho truy vấn đọc (không khóa, chỉ thấy dữ liệu đã commit)"""
+        yield self.reader
+
+    @asynccontextmanager
+    async def transaction(self):
+        """Transaction ghi: BEGIN IMMEDIATE ... COMMIT, rollback nếu lỗi"""
+        async with self._write_lock:
+            await self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                await self.conn.execute("ROLLBACK")
+                raise
+            else:
+                await self.conn.execute("COMMIT")
+
     async def migrate_global_points(self, db):
         """Chuyển đổi điểm sang hệ thống global (guild_id=0)"""
         # Check specific user to see if migration needed or just run it idempotently?
@@ -151,7 +251,7 @@ class DatabaseManager:
 
     async def get_daily_info(self, user_id: int):
         """Lấy thông tin daily của user (Global info stored at guild_id=0)"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.read() as db:
             async with db.execute("""
                 SELECT last_daily_claim, daily_streak, last_daily_reward
                 FROM player_stats
@@ -162,19 +262,19 @@ class DatabaseManager:
 
     async def update_daily(self, user_id: int, reward: int, streak: int):
         """Cập nhật daily và cộng tiền"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.transaction() as db:
             # 1. Update daily specific stats
             await db.execute("""
-                INSERT INTO player_stats (user_id, guild_id, last_daily_claim, daily_streak, last_daily_reward, total_points)
-                VALUES (?, 0, CURRENT_TIMESTAMP, ?, ?, ?)
+                INSERT INTO player_stats (user_id, guild_id, last_daily_claim, daily_streak, last_daily_reward)
+                VALUES (?, 0, CURRENT_TIMESTAMP, ?, ?)
                 ON CONFLICT(user_id, guild_id) DO UPDATE SET
                     last_daily_claim = CURRENT_TIMESTAMP,
                     daily_streak = ?,
-                    last_daily_reward = ?,
-                    total_points = total_points + ?
-            """, (user_id, streak, reward, reward, streak, reward, reward))
-            
-            await db.commit()
+                    last_daily_reward = ?
+            """, (user_id, streak, reward, streak, reward))
+        
+        # 2. Tiền thưởng đi qua wallet
+        self.wallet.add(user_id, reward)
     
     # ===== GAME STATE METHODS =====
     
@@ -182,7 +282,7 @@ class DatabaseManager:
                          first_word: str, first_player_id: int, is_bot_challenge: bool = False):
         """Tạo game mới"""
         import time
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.transaction() as db:
             await db.execute("""
                 INSERT OR REPLACE INTO game_states 
                 (channel_id, guild_id, language, current_word, current_player_id, 
@@ -191,11 +291,11 @@ class DatabaseManager:
             """, (channel_id, guild_id, language, first_word, first_player_id,
                   json.dumps([first_word.lower()]), json.dumps([first_player_id]), 
                   0, 1 if is_bot_challenge else 0, time.time(), 0, '{}'))
-            await db.commit()
+        self.active_game_channels.add(channel_id)
     
     async def get_game_state(self, channel_id: int) -> Optional[Dict]:
         """Lấy trạng thái game hiện tại"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.read() as db:
             async with db.execute(
                 "SELECT * FROM game_states WHERE channel_id = ?", 
                 (channel_id,)
@@ -205,32 +305,43 @@ class DatabaseManager:
                 if not row:
                     return None
                 
-                # Check row length to handle schema changes gracefully if select * is used
-                # Current schema has 13 columns
-                turn_start_time = row[10] if len(row) > 10 else 0
-                wrong_attempts = row[11] if len(row) > 11 else 0
-                scores_json = row[12] if len(row) > 12 else '{}'
-                
-                return {
-                    'channel_id': row[0],
-                    'guild_id': row[1],
-                    'language': row[2],
-                    'current_word': row[3],
-                    'current_player_id': row[4],
-                    'used_words': json.loads(row[5]),
-                    'players': json.loads(row[6]),
-                    'turn_count': row[7],
-                    'started_at': row[8],
-                    'is_bot_challenge': bool(row[9]),
-                    'turn_start_time': turn_start_time,
-                    'wrong_attempts': wrong_attempts,
-                    'scores': json.loads(scores_json)
-                }
+                return self._game_state_from_row(row)
+
+    async def get_all_game_states(self) -> List[Dict]:
+        """Tất cả game đang chơi (khôi phục lúc khởi động)"""
+        async with self.read() as db:
+            async with db.execute("SELECT * FROM game_states") as cursor:
+                rows = await cursor.fetchall()
+        return [self._game_state_from_row(row) for row in rows]
+
+    @staticmethod
+    def _game_state_from_row(row) -> Dict:
+        # Check row length to handle schema changes gracefully if select * is used
+        # Current schema has 13 columns
+        turn_start_time = row[10] if len(row) > 10 else 0
+        wrong_attempts = row[11] if len(row) > 11 else 0
+        scores_json = row[12] if len(row) > 12 else '{}'
+        
+        return {
+            'channel_id': row[0],
+            'guild_id': row[1],
+            'language': row[2],
+            'current_word': row[3],
+            'current_player_id': row[4],
+            'used_words': json.loads(row[5]),
+            'players': json.loads(row[6]),
+            'turn_count': row[7],
+            'started_at': row[8],
+            'is_bot_challenge': bool(row[9]),
+            'turn_start_time': turn_start_time,
+            'wrong_attempts': wrong_attempts,
+            'scores': json.loads(scores_json)
+        }
     
     async def update_game_turn(self, channel_id: int, new_word: str, next_player_id: int):
         """Cập nhật lượt chơi"""
         import time
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.transaction() as db:
             # Lấy state hiện tại
             game_state = await self.get_game_state(channel_id)
             if not game_state:
@@ -257,21 +368,38 @@ class DatabaseManager:
                 WHERE channel_id = ?
             """, (new_word, next_player_id, json.dumps(used_words), 
                   json.dumps(players), time.time(), channel_id))
-            await db.commit()
             
+    async def save_game_state(self, state: Dict):
+        """Ghi toàn bộ trạng thái game (checkpoint từ GameSession) trong một lệnh"""
+        async with self.transaction() as db:
+            await db.execute("""
+                UPDATE game_states 
+                SET current_word = ?,
+                current_player_id = ?,
+                used_words = ?,
+                players = ?,
+                turn_count = ?,
+                turn_start_time = ?,
+                wrong_attempts = ?,
+                scores = ?
+                WHERE channel_id = ?
+            """, (state['current_word'], state['current_player_id'],
+                  json.dumps(state['used_words']), json.dumps(state['players']),
+                  state['turn_count'], state['turn_start_time'], state['wrong_attempts'],
+                  json.dumps(state['scores']), state['channel_id']))
+
     async def update_wrong_attempts(self, channel_id: int, attempts: int):
         """Cập nhật số lần trả lời sai"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.transaction() as db:
             await db.execute("""
                 UPDATE game_states 
                 SET wrong_attempts = ?
                 WHERE channel_id = ?
             """, (attempts, channel_id))
-            await db.commit()
 
     async def update_game_score(self, channel_id: int, player_id: int, points_delta: int):
         """Cập nhật điểm trong phiên chơi hiện tại"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.transaction() as db:
             # Lấy state hiện tại
             game_state = await self.get_game_state(channel_id)
             if not game_state:
@@ -288,36 +416,43 @@ class DatabaseManager:
                 SET scores = ?
                 WHERE channel_id = ?
             """, (json.dumps(scores), channel_id))
-            await db.commit()
     
     async def delete_game(self, channel_id: int):
         """Xóa game (kết thúc)"""
-        async with aiosqlite.connect(self.db_path) as db:
+        self.active_game_channels.discard(channel_id)
+        async with self.transaction() as db:
             await db.execute("DELETE FROM game_states WHERE channel_id = ?", (channel_id,))
-            await db.commit()
     
     async def is_game_active(self, channel_id: int) -> bool:
         """Kiểm tra có game đang chơi không"""
-        game_state = await self.get_game_state(channel_id)
-        return game_state is not None
+        return self.has_active_game(channel_id)
     
     # ===== PLAYER STATS METHODS =====
     
     async def add_points(self, user_id: int, guild_id: int, points: int):
-        """Thêm điểm cho người chơi (Global Points - Guild ID 0)"""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
+        """Thêm điểm cho người chơi (Global Points - Guild ID 0), gom trong wallet"""
+        self.wallet.add(user_id, points)
+    
+    async def apply_point_deltas(self, deltas: Dict[int, int], batch_id: str):
+        """Ghi nhiều delta điểm trong một transaction (dùng bởi WalletService, idempotent theo batch_id)"""
+        async with self.transaction() as db:
+            cursor = await db.execute(
+                "INSERT OR IGNORE INTO point_batches (batch_id, applied_at) VALUES (?, ?)", (batch_id, time.time())
+            )
+            if cursor.rowcount == 0:
+                return  # Lô đã được ghi (lần gửi trước lỗi sau khi commit)
+            await db.execute("DELETE FROM point_batches WHERE applied_at < ?", (time.time() - POINT_BATCH_TTL,))
+            await db.executemany("""
                 INSERT INTO player_stats (user_id, guild_id, total_points)
                 VALUES (?, 0, ?)
                 ON CONFLICT(user_id, guild_id) DO UPDATE SET
-                    total_points = total_points + ?
-            """, (user_id, points, points))
-            await db.commit()
+                    total_points = total_points + excluded.total_points
+            """, list(deltas.items()))
     
     async def update_player_stats(self, user_id: int, guild_id: int, 
                                   word: str, is_correct: bool):
         """Cập nhật thống kê người chơi"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.transaction() as db:
             if is_correct:
                 await db.execute("""
                     INSERT INTO player_stats 
@@ -341,12 +476,91 @@ class DatabaseManager:
                         wrong_words = wrong_words + 1,
                         last_played = CURRENT_TIMESTAMP
                 """, (user_id, guild_id))
+    
+    async def commit_turn(self, channel_id: int, guild_id: int, user_id: int, word: str,
+                          points: int, is_correct: bool, next_player_id: Optional[int] = None):
+        """Ghi trọn một lượt (từ, lượt, điểm phiên, điểm global, stats) trong một transaction"""
+        import time
+        word = word.lower()
+        async with self.transaction() as db:
+            # Điểm global
+            await db.execute("""
+                INSERT INTO player_stats (user_id, guild_id, total_points)
+                VALUES (?, 0, ?)
+                ON CONFLICT(user_id, guild_id) DO UPDATE SET
+                    total_points = total_points + excluded.total_points
+            """, (user_id, points))
             
-            await db.commit()
+            # Stats
+            await db.execute("""
+                INSERT INTO player_stats 
+                (user_id, guild_id, words_submitted, correct_words, wrong_words, longest_word, longest_word_length)
+                VALUES (?, ?, 1, ?, ?, ?, ?)
+                ON CONFLICT(user_id, guild_id) DO UPDATE SET
+                    words_submitted = words_submitted + 1,
+                    correct_words = correct_words + excluded.correct_words,
+                    wrong_words = wrong_words + excluded.wrong_words,
+                    longest_word = CASE WHEN excluded.longest_word_length > longest_word_length
+                                        THEN excluded.longest_word ELSE longest_word END,
+                    longest_word_length = MAX(longest_word_length, excluded.longest_word_length),
+                    last_played = CURRENT_TIMESTAMP
+            """, (user_id, guild_id, 1 if is_correct else 0, 0 if is_correct else 1,
+                  word if is_correct else '', len(word) if is_correct else 0))
+            
+            # Game state
+            async with db.execute(
+                "SELECT used_words, players, scores, current_word, is_bot_challenge FROM game_states WHERE channel_id = ?",
+                (channel_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+            
+            if row:
+                used_words = json.loads(row[0])
+                players = json.loads(row[1])
+                scores = json.loads(row[2] or '{}')
+                key = str(user_id)
+                scores[key] = scores.get(key, 0) + points
+                
+                if is_correct or next_player_id is not None:
+                    new_word = row[3]
+                    if is_correct:
+                        new_word = word
+                        if word not in used_words:
+                            used_words.append(word)
+                    # Thách đấu bot: bot không vào danh sách người chơi
+                    if next_player_id is not None and not row[4] and next_player_id not in players:
+                        players.append(next_player_id)
+                    
+                    await db.execute("""
+                        UPDATE game_states 
+                        SET current_word = ?,
+                        current_player_id = COALESCE(?, current_player_id),
+                        used_words = ?,
+                        players = ?,
+                        scores = ?,
+                        turn_count = turn_count + 1,
+                        turn_start_time = ?,
+                        wrong_attempts = 0
+                        WHERE channel_id = ?
+                    """, (new_word, next_player_id, json.dumps(used_words), json.dumps(players),
+                          json.dumps(scores), time.time(), channel_id))
+                else:
+                    await db.execute("""
+                        UPDATE game_states 
+                        SET scores = ?, wrong_attempts = wrong_attempts + 1
+                        WHERE channel_id = ?
+                    """, (json.dumps(scores), channel_id))
+        
+        # Điểm global đã ghi trực tiếp -> cache số dư không còn đúng
+        self.wallet.invalidate(user_id)
     
     async def get_player_points(self, user_id: int, guild_id: int) -> int:
-        """Lấy điểm của người chơi (Global Points - Guild ID 0)"""
-        async with aiosqlite.connect(self.db_path) as db:
+        """Lấy điểm của người chơi (Global Points - Guild ID 0), gồm cả delta chưa flush"""
+        return await self.wallet.get_balance(user_id)
+    
+    async def fetch_points(self, user_id: int) -> int:
+        """Đọc số dư trực tiếp từ database (dùng bởi WalletService)"""
+        async with self.read() as db:
             async with db.execute(
                 "SELECT total_points FROM player_stats WHERE user_id = ? AND guild_id = 0",
                 (user_id,)
@@ -358,8 +572,13 @@ class DatabaseManager:
         """Chuyển điểm giữa 2 người chơi"""
         if amount <= 0:
             return False
+        
+        # Ghi delta đang chờ trước để kiểm tra số dư trên database
+        await self.wallet.flush()
+        self.wallet.invalidate(from_user_id)
+        self.wallet.invalidate(to_user_id)
             
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.transaction() as db:
             # Check balance
             async with db.execute(
                 "SELECT total_points FROM player_stats WHERE user_id = ? AND guild_id = 0",
@@ -385,14 +604,15 @@ class DatabaseManager:
                 ON CONFLICT(user_id, guild_id) DO UPDATE SET
                     total_points = total_points + ?
             """, (to_user_id, amount, amount))
-            
-            await db.commit()
             return True
     
     async def get_leaderboard(self, member_ids: List[int], limit: int = 10) -> List[Dict]:
         """Lấy bảng xếp hạng top tỷ phú trong danh sách user_id được cung cấp (global points)"""
         if not member_ids:
             return []
+        
+        # Ghi các delta đang chờ để bảng xếp hạng đúng
+        await self.wallet.flush()
             
         # Handle large lists by chunks to avoid SQL variable limit if needed, 
         # but for simplicity assuming server size < SQLITE_MAX_VARIABLE_NUMBER (default 999-32k)
@@ -413,7 +633,7 @@ class DatabaseManager:
         # Args: list of ids + limit
         args = list(member_ids) + [limit]
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.read() as db:
             try:
                 async with db.execute(query, args) as cursor:
                     rows = await cursor.fetchall()
@@ -453,49 +673,64 @@ class DatabaseManager:
                                 language: str, winner_id: Optional[int], 
                                 total_turns: int, total_words: int, started_at: str):
         """Lưu lịch sử game"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.transaction() as db:
             await db.execute("""
                 INSERT INTO game_history 
                 (channel_id, guild_id, language, winner_id, total_turns, total_words, started_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
             """, (channel_id, guild_id, language, winner_id, total_turns, total_words, started_at))
-            await db.commit()
 
     # ===== CHANNEL CONFIG METHODS =====
     
+    # ===== GAME SNAPSHOT METHODS =====
+
+    async def save_game_snapshots(self, snapshots: List[Dict]):
+        """Ghi snapshot {channel_id, game_type, data} của các game trong RAM (lúc tắt bot)"""
+        now = time.time()
+        async with self.transaction() as db:
+            await db.executemany("""
+                INSERT OR REPLACE INTO game_snapshots (channel_id, game_type, data, saved_at)
+                VALUES (?, ?, ?, ?)
+            """, [(s['channel_id'], s['game_type'], json.dumps(s['data'], ensure_ascii=False), now)
+                  for s in snapshots])
+
+    async def pop_game_snapshots(self) -> List[Dict]:
+        """Đọc rồi xóa toàn bộ snapshot (mỗi snapshot chỉ được khôi phục một lần)"""
+        async with self.transaction() as db:
+            async with db.execute("SELECT channel_id, game_type, data, saved_at FROM game_snapshots") as cursor:
+                rows = await cursor.fetchall()
+            await db.execute("DELETE FROM game_snapshots")
+        return [
+            {'channel_id': row[0], 'game_type': row[1], 'data': json.loads(row[2]), 'saved_at': row[3]}
+            for row in rows
+        ]
+
+    async def load_channel_configs(self):
+        """Nạp toàn bộ channel_configs lên RAM (bảng nhỏ, chỉ đổi qua lệnh /kenh-*)"""
+        async with self.read() as db:
+            async with db.execute("SELECT channel_id, game_type FROM channel_configs") as cursor:
+                rows = await cursor.fetchall()
+        self.channel_configs = {row[0]: row[1] for row in rows}
+
     async def set_channel_config(self, channel_id: int, guild_id: int, game_type: str):
         """Cài đặt game mặc định cho channel"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.transaction() as db:
             await db.execute("""
                 INSERT OR REPLACE INTO channel_configs (channel_id, guild_id, game_type)
                 VALUES (?, ?, ?)
             """, (channel_id, guild_id, game_type))
-            await db.commit()
+        self.channel_configs[channel_id] = game_type
             
     async def get_channel_config(self, channel_id: int) -> Optional[str]:
-        """Lấy game_type mặc định của channel"""
-        async with aiosqlite.connect(self.db_path) as db:
-             # Ensure table exists first (lazy check)
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS channel_configs (
-                    channel_id INTEGER PRIMARY KEY,
-                    guild_id INTEGER NOT NULL,
-                    game_type TEXT NOT NULL
-                )
-            """)
-            
-            async with db.execute(
-                "SELECT game_type FROM channel_configs WHERE channel_id = ?",
-                (channel_id,)
-            ) as cursor:
-                row = await cursor.fetchone()
-                return row[0] if row else None
+        """Lấy game_type mặc định của channel (tra trong RAM, không gọi database)"""
+        return self.channel_configs.get(channel_id)
 
     # ===== AGGREGATE STATS METHODS =====
 
     async def get_player_stats(self, user_id: int, guild_id: int) -> Optional[Dict]:
         """Lấy thống kê chi tiết của người chơi (kết hợp local stats và global points)"""
-        async with aiosqlite.connect(self.db_path) as db:
+        await self.wallet.flush()
+        async with self.read() as db:
             # 1. Get Global Points and Daily Streak
             async with db.execute(
                 "SELECT total_points, daily_streak FROM player_stats WHERE user_id = ? AND guild_id = 0",
@@ -547,16 +782,16 @@ class DatabaseManager:
 
     async def get_fishing_data(self, user_id: int) -> Dict:
         """Lấy dữ liệu câu cá của user"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.read() as db:
             async with db.execute(
-                "SELECT rod_type, boat_type, inventory, upgrades, stats, last_fished FROM fishing_inventory WHERE user_id = ?",
+                "SELECT rod_type, boat_type, inventory, upgrades, stats, last_fished, version FROM fishing_inventory WHERE user_id = ?",
                 (user_id,)
             ) as cursor:
                 row = await cursor.fetchone()
                 
                 if not row:
                     # Initialize default data
-                    return {
+                    return VersionedRecord({
                         'rod_type': 'Plastic Rod',
                         'boat_type': 'None',
                         'inventory': {'fish': {}, 'baits': {}}, # Structure: fish: {name: {count, total_value}}, baits: {name: count}
@@ -570,7 +805,7 @@ class DatabaseManager:
                             'current_bait': None
                         },
                         'last_fished': None
-                    }
+                    }, version=0)
                 
                 # Parse existing data and merge with defaults to ensure new keys exist
                 inventory = json.loads(row[2])
@@ -585,41 +820,57 @@ class DatabaseManager:
                 if 'unlocked_biomes' not in stats: stats['unlocked_biomes'] = ['Lake']
                 if 'current_bait' not in stats: stats['current_bait'] = None
 
-                return {
+                return VersionedRecord({
                     'rod_type': row[0],
                     'boat_type': row[1],
                     'inventory': inventory,
                     'upgrades': json.loads(row[3]),
                     'stats': stats,
                     'last_fished': row[5]
-                }
+                }, version=row[6] or 0)
 
     async def update_fishing_data(self, user_id: int, rod_type: str = None, boat_type: str = None, 
-                                  inventory: Dict = None, upgrades: Dict = None, stats: Dict = None):
-        """Cập nhật dữ liệu câu cá"""
-        import datetime
-        current_data = await self.get_fishing_data(user_id)
-        
-        # Merge changes
-        new_rod = rod_type if rod_type is not None else current_data['rod_type']
-        new_boat = boat_type if boat_type is not None else current_data['boat_type']
-        new_inventory = inventory if inventory is not None else current_data['inventory']
-        new_upgrades = upgrades if upgrades is not None else current_data['upgrades']
-        new_stats = stats if stats is not None else current_data['stats']
-        
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                INSERT INTO fishing_inventory (user_id, rod_type, boat_type, inventory, upgrades, stats, last_fished)
-                VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(user_id) DO UPDATE SET
-                    rod_type = excluded.rod_type,
-                    boat_type = excluded.boat_type,
-                    inventory = excluded.inventory,
-                    upgrades = excluded.upgrades,
-                    stats = excluded.stats,
-                    last_fished = excluded.last_fished
-            """, (user_id, new_rod, new_boat, json.dumps(new_inventory), json.dumps(new_upgrades), json.dumps(new_stats)))
-            await db.commit()
+                                  inventory: Dict = None, upgrades: Dict = None, stats: Dict = None,
+                                  base: VersionedRecord = None):
+        """Cập nhật dữ liệu câu cá (compare-and-swap theo version, xung đột thì merge rồi thử lại)"""
+        changes = {
+            column: value for column, value in (
+                ('rod_type', rod_type), ('boat_type', boat_type), ('inventory', inventory),
+                ('upgrades', upgrades), ('stats', stats)
+            ) if value is not None
+        }
+        if base is None:
+            base = await self.get_fishing_data(user_id)
+
+        json_columns = ('inventory', 'upgrades', 'stats')
+
+        async def try_write(version: int, values: Dict) -> bool:
+            columns = list(values.keys())
+            params = [json.dumps(values[c]) if c in json_columns else values[c] for c in columns]
+            assignments = "".join(f"{c} = ?, " for c in columns)
+
+            async with self.transaction() as db:
+                cursor = await db.execute(
+                    f"UPDATE fishing_inventory SET {assignments}last_fished = CURRENT_TIMESTAMP, version = ? "
+                    "WHERE user_id = ? AND version = ?",
+                    (*params, version + 1, user_id, version)
+                )
+                if cursor.rowcount:
+                    return True
+                if version != 0:
+                    return False
+
+                # User mới: tạo row, đã có row thì coi như xung đột
+                placeholders = "".join("?, " for _ in columns)
+                cursor = await db.execute(
+                    f"INSERT INTO fishing_inventory (user_id, {', '.join(columns + ['last_fished', 'version'])}) "
+                    f"VALUES (?, {placeholders}CURRENT_TIMESTAMP, 1) ON CONFLICT(user_id) DO NOTHING",
+                    (user_id, *params)
+                )
+                return cursor.rowcount > 0
+
+        return await versioned_update(base, changes, lambda: self.get_fishing_data(user_id), try_write)
+
     async def get_fishing_rank(self, user_id: int) -> int:
         """Lấy thứ hạng câu cá của user dựa trên Level và XP"""
         # Get user stats first
@@ -628,7 +879,7 @@ class DatabaseManager:
         u_lvl = u_stats.get("level", 1)
         u_xp = u_stats.get("xp", 0)
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.read() as db:
             # Check JSON support by trying a dummy query or just catch exception
             try:
                 # Count users with (Level > u_lvl) OR (Level == u_lvl AND XP > u_xp)
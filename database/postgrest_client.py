@@ -0,0 +1,152 @@
+"""
+PostgREST Client - Client async (aiohttp) cho Supabase REST/RPC
+Dùng chung một connection pool keep-alive, giới hạn concurrency, timeout và retry
+"""
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import aiohttp
+
+
+class PostgrestError(Exception):
+    """Lỗi trả về từ PostgREST (HTTP status >= 400)"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"PostgREST {status}: {message}")
+        self.status = status
+        self.message = message
+
+
+# Filter: {column: value} (eq) hoặc {column: (operator, value)} vd ('neq', 0), ('in', [1, 2]), ('lt', '...')
+Filters = Dict[str, Union[Any, Tuple[str, Any]]]
+
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+def _format_value(value) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _build_filters(filters: Optional[Filters]) -> List[Tuple[str, str]]:
+    params = []
+    for column, condition in (filters or {}).items():
+        if isinstance(condition, tuple):
+            op, value = condition
+        else:
+            op, value = ("is", condition) if condition is None else ("eq", condition)
+
+        if op == "in":
+            value = "(" + ",".join(_format_value(v) for v in value) + ")"
+        else:
+            value = _format_value(value)
+        params.append((column, f"{op}.{value}"))
+    return params
+
+
+class PostgrestClient:
+    """Client PostgREST dùng aiohttp thay cho supabase-py (sync) + asyncio.to_thread"""
+
+    def __init__(self, url: str, key: str, max_connections: int = 20, timeout: float = 10,
+                 retries: int = 2, rest_path: str = "/rest/v1", session_factory=None):
+        """session_factory: hàm trả về session dùng chung (vd utils.http_client.get_http_session);
+        None thì client tự tạo connection pool riêng"""
+        self.base_url = url.rstrip('/') + rest_path
+        self.key = key
+        self.max_connections = max_connections
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.retries = retries
+        self.session_factory = session_factory
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._semaphore = asyncio.Semaphore(max_connections)
+        self._headers = {
+            "apikey": self.key,
+            "Authorization": f"Bearer {self.key}",
+            "Content-Type": "application/json"
+        }
+
+    async def start(self):
+        """Tạo session + connection pool (gọi trong event loop)"""
+        if self.session is None or self.session.closed:
+            if self.session_factory:
+                self.session = self.session_factory()
+                return
+            connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=30)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout, headers=self._headers)
+
+    async def close(self):
+        # Session dùng chung do chủ của nó đóng
+        if self.session and not self.session.closed and not self.session_factory:
+            await self.session.close()
+        self.session = None
+
+    async def _request(self, method: str, path: str, params: List[Tuple[str, str]] = None,
+                       payload: Any = None, prefer: str = None, idempotent: bool = True):
+        """Gửi request với giới hạn concurrency và retry (backoff lũy thừa)"""
+        if self.session is None or self.session.closed:
+            await self.start()
+
+        headers = dict(self._headers) if self.session_factory else {}
+        if prefer:
+            headers["Prefer"] = prefer
+        data = json.dumps(payload) if payload is not None else None
+        url = f"{self.base_url}/{path}"
+
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    async with self.session.request(method, url, params=params, data=data, headers=headers or None,
+                                                     timeout=self.timeout) as resp:
+                        body = await resp.text()
+                        if resp.status >= 400:
+                            raise PostgrestError(resp.status, body)
+                        return json.loads(body) if body else None
+            except PostgrestError as e:
+                if not (idempotent and e.status in RETRY_STATUSES and attempt < self.retries):
+                    raise
+            except aiohttp.ClientConnectorError:
+                # Chưa kết nối được -> request chưa tới server, retry an toàn
+                if attempt >= self.retries:
+                    raise
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if not idempotent or attempt >= self.retries:
+                    raise
+
+            attempt += 1
+            await asyncio.sleep(0.2 * (2 ** (attempt - 1)))
+
+    # ===== TABLE METHODS =====
+
+    async def select(self, table: str, columns: str = "*", filters: Filters = None,
+                     order: str = None, desc: bool = False, limit: int = None) -> List[Dict]:
+        params = [("select", columns)] + _build_filters(filters)
+        if order:
+            params.append(("order", f"{order}.{'desc' if desc else 'asc'}"))
+        if limit is not None:
+            params.append(("limit", str(limit)))
+        return await self._request("GET", table, params=params) or []
+
+    async def insert(self, table: str, data: Union[Dict, List[Dict]]):
+        await self._request("POST", table, payload=data, prefer="return=minimal", idempotent=False)
+
+    async def upsert(self, table: str, data: Union[Dict, List[Dict]], on_conflict: str = None):
+        params = [("on_conflict", on_conflict)] if on_conflict else None
+        await self._request("POST", table, params=params, payload=data,
+                            prefer="resolution=merge-duplicates,return=minimal")
+
+    async def update(self, table: str, data: Dict, filters: Filters) -> List[Dict]:
+        """Cập nhật các row khớp filter, trả về các row đã cập nhật"""
+        return await self._request("PATCH", table, params=_build_filters(filters), payload=data,
+                                   prefer="return=representation") or []
+
+    async def delete(self, table: str, filters: Filters):
+        await self._request("DELETE", table, params=_build_filters(filters), prefer="return=minimal")
+
+    async def rpc(self, function: str, params: Dict = None, idempotent: bool = False):
+        """Gọi Postgres function (POST /rpc/<function>)"""
+        return await self._request("POST", f"rpc/{function}", payload=params or {}, idempotent=idempotent)
@@ -4,33 +4,55 @@ import json
 import time
 from typing import Dict, List, Optional
 from datetime import datetime
-from supabase import create_client, Client
+
+import config
+from database.postgrest_client import PostgrestClient, PostgrestError
+from database.versioning import VersionedRecord, versioned_update
+from database.wallet import WalletService
 
 class SupabaseManager:
     def __init__(self, url: str, key: str):
         self.url = url
         self.key = key
-        self.client: Client = None
+        self.rest: Optional[PostgrestClient] = None
+        self.wallet = WalletService(self)  # Gom add_points, flush theo lô
+        # Registry các kênh đang có game nối từ (authoritative, giữ trong RAM)
+        self.active_game_channels: set = set()
+        # Bản sao bảng channel_configs (channel_id -> game_type), ghi write-through
+        self.channel_configs: Dict[int, str] = {}
 
     async def initialize(self):
         """Khởi tạo connection Supabase"""
         if not self.url or not self.key:
             raise ValueError("Supabase URL and Key are required!")
         
-        # Supabase client creation is sync but lightweight (just config)
-        self.client = create_client(self.url, self.key)
-        
-        # Test connection (optional, just to be sure)
-        try:
-             # Just a lightweight check, e.g. checking auth or a table
-             # await self._run_query(lambda: self.client.table('fishing_inventory').select("user_id", count='exact').limit(1).execute())
-             pass
-        except Exception as e:
-            print(f"⚠️ Supabase connection warning: {e}")
-
-    async def _run_query(self, query_func):
-        """Helper to run sync Supabase calls in a thread"""
-        return await asyncio.to_thread(query_func)
+        # Client REST async dùng chung connection pool keep-alive
+        self.rest = PostgrestClient(
+            self.url, self.key,
+            max_connections=config.SUPABASE_MAX_CONNECTIONS,
+            timeout=config.SUPABASE_TIMEOUT,
+            retries=config.SUPABASE_RETRIES
+        )
+        await self.rest.start()
+        self.wallet.start()
+
+        await self.load_active_games()
+        await self.load_channel_configs()
+
+    async def close(self):
+        """Flush wallet rồi đóng connection pool"""
+        await self.wallet.close()
+        if self.rest:
+            await self.rest.close()
+
+    async def load_active_games(self):
+        """Nạp registry kênh đang có game từ bảng game_states (chạy lúc khởi động)"""
+        rows = await self.rest.select('game_states', "channel_id")
+        self.active_game_channels = {row['channel_id'] for row in rows}
+
+    def has_active_game(self, channel_id: int) -> bool:
+        """Kiểm tra nhanh trong RAM, không gọi database"""
+        return channel_id in self.active_game_channels
 
     # ===== GAME STATE METHODS =====
 
@@ -52,19 +74,24 @@ class SupabaseManager:
             "scores": {},
             # started_at defaults to NOW() in DB
         }
-        await self._run_query(lambda: self.client.table('game_states').upsert(data).execute())
+        await self.rest.upsert('game_states', data)
+        self.active_game_channels.add(channel_id)
 
     async def get_game_state(self, channel_id: int) -> Optional[Dict]:
         """Lấy trạng thái game hiện tại"""
-        response = await self._run_query(lambda: self.client.table('game_states').select("*").eq('channel_id', channel_id).execute())
+        rows = await self.rest.select('game_states', filters={'channel_id': channel_id})
         
-        if not response.data:
+        if not rows:
             return None
         
-        row = response.data[0]
+        row = rows[0]
         # Map DB fields back to expected format if needed, but JSON fields come as dicts automatically
         return row
 
+    async def get_all_game_states(self) -> List[Dict]:
+        """Tất cả game đang chơi (khôi phục lúc khởi động)"""
+        return await self.rest.select('game_states')
+
     async def update_game_turn(self, channel_id: int, new_word: str, next_player_id: int):
         """Cập nhật lượt chơi"""
         # Fetch current state to append to lists - simpler in code than complicated SQL/RPC for appending
@@ -90,10 +117,24 @@ class SupabaseManager:
             "wrong_attempts": 0
         }
         
-        await self._run_query(lambda: self.client.table('game_states').update(update_data).eq('channel_id', channel_id).execute())
+        await self.rest.update('game_states', update_data, {'channel_id': channel_id})
+
+    async def save_game_state(self, state: Dict):
+        """Ghi toàn bộ trạng thái game (checkpoint từ GameSession) trong một request"""
+        update_data = {
+            "current_word": state['current_word'],
+            "current_player_id": state['current_player_id'],
+            "used_words": state['used_words'],
+            "players": state['players'],
+            "turn_count": state['turn_count'],
+            "turn_start_time": state['turn_start_time'],
+            "wrong_attempts": state['wrong_attempts'],
+            "scores": state['scores']
+        }
+        await self.rest.update('game_states', update_data, {'channel_id': state['channel_id']})
 
     async def update_wrong_attempts(self, channel_id: int, attempts: int):
-        await self._run_query(lambda: self.client.table('game_states').update({"wrong_attempts": attempts}).eq('channel_id', channel_id).execute())
+        await self.rest.update('game_states', {"wrong_attempts": attempts}, {'channel_id': channel_id})
 
     async def update_game_score(self, channel_id: int, player_id: int, points_delta: int):
         state = await self.get_game_state(channel_id)
@@ -105,102 +146,78 @@ class SupabaseManager:
         current = scores.get(pid_str, 0)
         scores[pid_str] = current + points_delta
         
-        await self._run_query(lambda: self.client.table('game_states').update({"scores": scores}).eq('channel_id', channel_id).execute())
+        await self.rest.update('game_states', {"scores": scores}, {'channel_id': channel_id})
 
     async def delete_game(self, channel_id: int):
-        await self._run_query(lambda: self.client.table('game_states').delete().eq('channel_id', channel_id).execute())
+        self.active_game_channels.discard(channel_id)
+        await self.rest.delete('game_states', {'channel_id': channel_id})
 
     async def is_game_active(self, channel_id: int) -> bool:
-        response = await self._run_query(lambda: self.client.table('game_states').select("channel_id").eq('channel_id', channel_id).execute())
-        return len(response.data) > 0
+        return self.has_active_game(channel_id)
 
     # ===== PLAYER STATS METHODS =====
 
     async def add_points(self, user_id: int, guild_id: int, points: float):
-        """Thêm điểm (Global - guild_id=0)"""
-        # Using RPC is better for atomic increment, but let's stick to fetch+update or upsert logic
-        # Ideally, we create a stored procedure 'increment_points' in supabase, but user has to run SQL.
-        # So we'll fetch first. (Atomic increment is hard without RPC)
-        
-        # Check current points
-        # For simplicity and robustness, we treat guild_id=0 as global
-        
-        # Try to get existing
-        res = await self._run_query(lambda: self.client.table('player_stats').select("total_points").eq('user_id', user_id).eq('guild_id', 0).execute())
-        
-        current_points = 0
-        if res.data:
-            current_points = res.data[0].get('total_points', 0)
-            
-        new_total = current_points + points
-        
-        data = {
-            "user_id": user_id,
-            "guild_id": 0,
-            "total_points": new_total
-        }
-        # Upsert effectively
-        await self._run_query(lambda: self.client.table('player_stats').upsert(data).execute())
+        """Thêm điểm (Global - guild_id=0), gom trong wallet và ghi theo lô"""
+        self.wallet.add(user_id, points)
+
+    async def fetch_points(self, user_id: int) -> float:
+        """Đọc số dư trực tiếp từ database (dùng bởi WalletService)"""
+        rows = await self.rest.select('player_stats', "total_points", {'user_id': user_id, 'guild_id': 0})
+        if rows:
+            return rows[0].get('total_points', 0)
+        return 0
+
+    async def apply_point_deltas(self, deltas: Dict[int, float], batch_id: str):
+        """Ghi nhiều delta điểm trong một RPC (dùng bởi WalletService, gửi lại cùng batch_id thì không cộng lần hai)"""
+        params = {"p_deltas": {str(uid): d for uid, d in deltas.items()}, "p_batch_id": batch_id}
+        await self.rest.rpc('apply_point_deltas', params)
 
     async def update_player_stats(self, user_id: int, guild_id: int, word: str, is_correct: bool):
-        """Cập nhật thống kê"""
-        # Fetch current
-        res = await self._run_query(lambda: self.client.table('player_stats').select("*").eq('user_id', user_id).eq('guild_id', guild_id).execute())
-        
-        stats = {}
-        if res.data:
-            stats = res.data[0]
-        else:
-            stats = {
-                "user_id": user_id, 
-                "guild_id": guild_id, 
-                "words_submitted": 0, 
-                "correct_words": 0, 
-                "wrong_words": 0,
-                "longest_word": "",
-                "longest_word_length": 0
-            }
-        
-        stats["words_submitted"] = stats.get("words_submitted", 0) + 1
-        stats["last_played"] = datetime.now().isoformat()
-        
-        if is_correct:
-            stats["correct_words"] = stats.get("correct_words", 0) + 1
-            w_len = len(word)
-            if w_len > stats.get("longest_word_length", 0):
-                stats["longest_word"] = word
-                stats["longest_word_length"] = w_len
-        else:
-            stats["wrong_words"] = stats.get("wrong_words", 0) + 1
-            
-        await self._run_query(lambda: self.client.table('player_stats').upsert(stats).execute())
+        """Cập nhật thống kê (atomic qua RPC record_word_stats)"""
+        params = {"p_user_id": user_id, "p_guild_id": guild_id, "p_word": word, "p_is_correct": is_correct}
+        await self.rest.rpc('record_word_stats', params)
+
+    async def commit_turn(self, channel_id: int, guild_id: int, user_id: int, word: str,
+                          points: float, is_correct: bool, next_player_id: Optional[int] = None):
+        """Ghi trọn một lượt (từ, lượt, điểm phiên, điểm global, stats) trong một round trip"""
+        params = {
+            "p_channel_id": channel_id,
+            "p_guild_id": guild_id,
+            "p_user_id": user_id,
+            "p_word": word,
+            "p_points": points,
+            "p_is_correct": is_correct,
+            "p_next_player_id": next_player_id
+        }
+        await self.rest.rpc('commit_turn', params)
+        # RPC đã cộng điểm global trực tiếp -> cache số dư không còn đúng
+        self.wallet.invalidate(user_id)
 
     async def get_player_points(self, user_id: int, guild_id: int) -> float:
-        res = await self._run_query(lambda: self.client.table('player_stats').select("total_points").eq('user_id', user_id).eq('guild_id', 0).execute())
-        if res.data:
-            return res.data[0].get('total_points', 0)
-        return 0
+        return await self.wallet.get_balance(user_id)
 
     async def transfer_points(self, from_user_id: int, to_user_id: int, amount: float) -> bool:
         if amount <= 0: return False
         
-        # Transaction-like sequence (Supabase REST API doesn't support transactions unless via RPC)
+        # Kiểm tra + trừ/cộng liền nhau trong wallet (không có await xen giữa)
         # 1. Check sender balance
         sender_bal = await self.get_player_points(from_user_id, 0)
         if sender_bal < amount:
             return False
             
-        # 2. Subtract from sender
-        await self.add_points(from_user_id, 0, -amount)
-        
-        # 3. Add to receiver
-        await self.add_points(to_user_id, 0, amount)
+        # 2. Subtract from sender / 3. Add to receiver
+        self.wallet.add(from_user_id, -amount)
+        self.wallet.add(to_user_id, amount)
         
         return True
 
     async def get_leaderboard(self, member_ids: List[int], limit: int = 10) -> List[Dict]:
         if not member_ids: return []
         
+        # Ghi các delta đang chờ để bảng xếp hạng đúng
+        await self.wallet.flush()
+        
         # Supabase 'in' filter takes a list
         # We need to filter by user_id in member_ids AND guild_id=0
         
@@ -208,14 +225,12 @@ class SupabaseManager:
         # But usually in a guild context 10-100 top users is fine, fetching all might be needed for large guilds.
         # Fallback: Fetch top globally and filter.
         
-        res = await self._run_query(lambda: self.client.table('player_stats')
-            .select("user_id, total_points, games_played, correct_words, longest_word")
-            .eq('guild_id', 0)
-            .order('total_points', desc=True)
-            .limit(1000) # Get top 1000 globally to increase hit rate
-            .execute())
-            
-        global_top = res.data
+        global_top = await self.rest.select(
+            'player_stats', "user_id,total_points,games_played,correct_words,longest_word",
+            {'guild_id': 0},
+            order='total_points', desc=True,
+            limit=1000  # Get top 1000 globally to increase hit rate
+        )
         
         # Filter intersection with member_ids
         member_set = set(member_ids)
@@ -244,44 +259,61 @@ class SupabaseManager:
             "started_at": started_at,
             "ended_at": datetime.now().isoformat()
         }
-        await self._run_query(lambda: self.client.table('game_history').insert(data).execute())
+        await self.rest.insert('game_history', data)
 
     # ===== CHANNEL CONFIG METHODS =====
     
+    # ===== GAME SNAPSHOT METHODS =====
+
+    async def save_game_snapshots(self, snapshots: List[Dict]):
+        """Ghi snapshot {channel_id, game_type, data} của các game trong RAM (lúc tắt bot)"""
+        now = time.time()
+        rows = [{**s, 'saved_at': now} for s in snapshots]
+        await self.rest.upsert('game_snapshots', rows, on_conflict='channel_id,game_type')
+
+    async def pop_game_snapshots(self) -> List[Dict]:
+        """Đọc rồi xóa các snapshot đã đọc (mỗi snapshot chỉ được khôi phục một lần)"""
+        rows = await self.rest.select('game_snapshots', "channel_id,game_type,data,saved_at")
+        for game_type in {row['game_type'] for row in rows}:
+            channels = [row['channel_id'] for row in rows if row['game_type'] == game_type]
+            await self.rest.delete('game_snapshots', {'game_type': game_type, 'channel_id': ('in', channels)})
+        return rows
+
+    async def load_channel_configs(self):
+        """Nạp toàn bộ channel_configs lên RAM (bảng nhỏ, chỉ đổi qua lệnh /kenh-*)"""
+        rows = await self.rest.select('channel_configs', "channel_id,game_type")
+        self.channel_configs = {row['channel_id']: row['game_type'] for row in rows}
+
     async def set_channel_config(self, channel_id: int, guild_id: int, game_type: str):
         data = {"channel_id": channel_id, "guild_id": guild_id, "game_type": game_type}
-        await self._run_query(lambda: self.client.table('channel_configs').upsert(data).execute())
+        await self.rest.upsert('channel_configs', data)
+        self.channel_configs[channel_id] = game_type
 
     async def get_channel_config(self, channel_id: int) -> Optional[str]:
-        res = await self._run_query(lambda: self.client.table('channel_configs').select("game_type").eq('channel_id', channel_id).execute())
-        if res.data:
-            return res.data[0].get('game_type')
-        return None
+        """Tra trong RAM, không gọi database"""
+        return self.channel_configs.get(channel_id)
 
     # ===== AGGREGATE STATS METHODS =====
 
     async def get_player_stats(self, user_id: int, guild_id: int) -> Optional[Dict]:
-        # 1. Global stats
-        res_global = await self._run_query(lambda: self.client.table('player_stats')
-            .select("total_points, daily_streak")
-            .eq('user_id', user_id)
-            .eq('guild_id', 0)
-            .execute())
+        await self.wallet.flush()
+        # 1. Global stats + 2. Local stats (chạy song song)
+        res_global, res_local = await asyncio.gather(
+            self.rest.select('player_stats', "total_points,daily_streak", {'user_id': user_id, 'guild_id': 0}),
+            self.rest.select(
+                'player_stats',
+                "games_played,words_submitted,correct_words,wrong_words,longest_word,longest_word_length",
+                {'user_id': user_id, 'guild_id': guild_id}
+            )
+        )
             
         total_points = 0
         daily_streak = 0
-        if res_global.data:
-            total_points = res_global.data[0].get('total_points', 0)
-            daily_streak = res_global.data[0].get('daily_streak', 0)
-            
-        # 2. Local stats
-        res_local = await self._run_query(lambda: self.client.table('player_stats')
-            .select("games_played, words_submitted, correct_words, wrong_words, longest_word, longest_word_length")
-            .eq('user_id', user_id)
-            .eq('guild_id', guild_id)
-            .execute())
+        if res_global:
+            total_points = res_global[0].get('total_points', 0)
+            daily_streak = res_global[0].get('daily_streak', 0)
             
-        if not res_local.data and total_points == 0:
+        if not res_local and total_points == 0:
             return None
             
         stats = {
@@ -295,47 +327,43 @@ class SupabaseManager:
             'longest_word_length': 0
         }
         
-        if res_local.data:
-            stats.update(res_local.data[0])
+        if res_local:
+            stats.update(res_local[0])
             
         return stats
 
     # ===== DAILY METHODS =====
     
     async def get_daily_info(self, user_id: int):
-        res = await self._run_query(lambda: self.client.table('player_stats')
-            .select("last_daily_claim, daily_streak, last_daily_reward")
-            .eq('user_id', user_id)
-            .eq('guild_id', 0)
-            .execute())
+        rows = await self.rest.select(
+            'player_stats', "last_daily_claim,daily_streak,last_daily_reward",
+            {'user_id': user_id, 'guild_id': 0}
+        )
             
-        if res.data:
+        if rows:
             # Need to figure out return format matching original DB manager
             # Tuple: (last_daily_claim, daily_streak, last_daily_reward)
             # Timestamps in supabase are ISO strings usually
-            r = res.data[0]
+            r = rows[0]
             return (r.get('last_daily_claim'), r.get('daily_streak', 0), r.get('last_daily_reward', 0))
         return (None, 0, 0)
         
     async def update_daily(self, user_id: int, reward: float, streak: int):
-        # Fetch current points to add
-        current = await self.get_player_points(user_id, 0)
-        new_total = current + reward
-        
         data = {
             "user_id": user_id,
             "guild_id": 0,
             "last_daily_claim": datetime.now().isoformat(),
             "daily_streak": streak,
-            "last_daily_reward": reward,
-            "total_points": new_total
+            "last_daily_reward": reward
         }
-        await self._run_query(lambda: self.client.table('player_stats').upsert(data).execute())
+        await self.rest.upsert('player_stats', data)
+        # Tiền thưởng đi qua wallet
+        self.wallet.add(user_id, reward)
 
     # ===== FISHING GAME METHODS =====
 
     async def get_fishing_data(self, user_id: int) -> Dict:
-        res = await self._run_query(lambda: self.client.table('fishing_inventory').select("*").eq('user_id', user_id).execute())
+        rows = await self.rest.select('fishing_inventory', filters={'user_id': user_id})
         
         default_data = {
             'rod_type': 'Plastic Rod',
@@ -353,10 +381,10 @@ class SupabaseManager:
             'last_fished': None
         }
 
-        if not res.data:
-            return default_data
+        if not rows:
+            return VersionedRecord(default_data, version=0)
 
-        row = res.data[0]
+        row = rows[0]
         # JSON fields are already dicts
         # Ensure keys exist
         inv = row.get('inventory') or {}
@@ -366,40 +394,48 @@ class SupabaseManager:
         if 'current_biome' not in st: st['current_biome'] = 'Lake'
         if 'unlocked_biomes' not in st: st['unlocked_biomes'] = ['Lake']
         
-        return {
+        return VersionedRecord({
             'rod_type': row.get('rod_type', 'Plastic Rod'),
             'boat_type': row.get('boat_type', 'None'),
             'inventory': inv,
             'upgrades': row.get('upgrades') or {},
             'stats': st,
             'last_fished': row.get('last_fished')
-        }
+        }, version=row.get('version') or 0)
 
     async def update_fishing_data(self, user_id: int, rod_type: str = None, boat_type: str = None, 
-                                  inventory: Dict = None, upgrades: Dict = None, stats: Dict = None):
-        
-        # To update partially, we first need to know if the row exists, but upsert handles logic 
-        # IF we provide all fields. Supabase partial update via .update() only works if row exists.
-        # But here we might be creating new user.
-        # So we should probably fetch first (costly) or use upsert with all previous data.
-        
-        # We need to fetch current data to merge anyway! 
-        # The caller (cog) usually fetches, modifies, passes back. 
-        # But wait, the arguments allow None. So we must fetch here if any arg is None.
-        
-        current = await self.get_fishing_data(user_id)
-        
-        data = {
-            "user_id": user_id,
-            "rod_type": rod_type if rod_type is not None else current['rod_type'],
-            "boat_type": boat_type if boat_type is not None else current['boat_type'],
-            "inventory": inventory if inventory is not None else current['inventory'],
-            "upgrades": upgrades if upgrades is not None else current['upgrades'],
-            "stats": stats if stats is not None else current['stats'],
-            "last_fished": datetime.now().isoformat()
+                                  inventory: Dict = None, upgrades: Dict = None, stats: Dict = None,
+                                  base: VersionedRecord = None):
+        """Ghi các cột được truyền vào bằng compare-and-swap trên version
+        
+        base: record lấy từ get_fishing_data (không cần fetch lại). Nếu row đã bị
+        thay đổi từ lúc đọc thì đọc bản mới, merge 3 chiều và thử lại.
+        """
+        changes = {
+            column: value for column, value in (
+                ('rod_type', rod_type), ('boat_type', boat_type), ('inventory', inventory),
+                ('upgrades', upgrades), ('stats', stats)
+            ) if value is not None
         }
-        
-        await self._run_query(lambda: self.client.table('fishing_inventory').upsert(data).execute())
+        if base is None:
+            base = await self.get_fishing_data(user_id)
+
+        async def try_write(version: int, values: Dict) -> bool:
+            row = {**values, "last_fished": datetime.now().isoformat(), "version": version + 1}
+            updated = await self.rest.update('fishing_inventory', row, {'user_id': user_id, 'version': version})
+            if updated:
+                return True
+            if version == 0:
+                # User mới: tạo row, trùng khóa nghĩa là có người vừa tạo -> xung đột
+                try:
+                    await self.rest.insert('fishing_inventory', {"user_id": user_id, **row})
+                    return True
+                except PostgrestError as e:
+                    if e.status != 409:
+                        raise
+            return False
+
+        return await versioned_update(base, changes, lambda: self.get_fishing_data(user_id), try_write)
         
     async def get_fishing_rank(self, user_id: int) -> int:
         # Complex query logic for ranking.
@@ -410,13 +446,13 @@ class SupabaseManager:
         # Efficient approach: Fetch specific columns for all users and sort in python.
         # Not scalable for millions, but fine for thousands.
         
-        res = await self._run_query(lambda: self.client.table('fishing_inventory').select("user_id, stats").execute())
+        rows = await self.rest.select('fishing_inventory', "user_id,stats")
         
-        if not res.data: return 1
+        if not rows: return 1
         
         # Parse and sort
         data = []
-        for r in res.data:
+        for r in rows:
             s = r.get('stats', {})
             data.append((r['user_id'], s.get('level', 1), s.get('xp', 0)))
             
@@ -433,7 +469,7 @@ class SupabaseManager:
             "players": players,
             "turn_start_time": turn_start_time
         }
-        await self._run_query(lambda: self.client.table('game_states').update(data).eq('channel_id', channel_id).execute())
+        await self.rest.update('game_states', data, {'channel_id': channel_id})
 
     async def add_player_to_game(self, channel_id: int, player_id: int):
         """Thêm người chơi vào game (dùng cho Bot Challenge)"""
@@ -443,18 +479,18 @@ class SupabaseManager:
         players = state.get('players', [])
         if player_id not in players:
             players.append(player_id)
-            await self._run_query(lambda: self.client.table('game_states').update({"players": players}).eq('channel_id', channel_id).execute())
+            await self.rest.update('game_states', {"players": players}, {'channel_id': channel_id})
 
     # ===== ADMIN METHODS =====
 
     async def reset_player_stats(self, user_id: int, guild_id: int):
         """Reset stats của một user (giữ lại points)"""
         # 1. Clear fishing inventory
-        await self._run_query(lambda: self.client.table('fishing_inventory').delete().eq('user_id', user_id).execute())
+        await self.rest.delete('fishing_inventory', {'user_id': user_id})
         
         # 2. Reset Local Stats (delete row or zero out)
         # Deleting row is cleaner
-        await self._run_query(lambda: self.client.table('player_stats').delete().eq('user_id', user_id).eq('guild_id', guild_id).execute())
+        await self.rest.delete('player_stats', {'user_id': user_id, 'guild_id': guild_id})
         
         # 3. Reset Global Stats (except points) in user_id, guild_id=0
         data = {
@@ -462,16 +498,16 @@ class SupabaseManager:
             "longest_word": "", "longest_word_length": 0,
             "daily_streak": 0, "last_daily_claim": None, "last_daily_reward": 0
         }
-        await self._run_query(lambda: self.client.table('player_stats').update(data).eq('user_id', user_id).eq('guild_id', 0).execute())
+        await self.rest.update('player_stats', data, {'user_id': user_id, 'guild_id': 0})
 
     async def reset_all_stats(self, guild_id: int):
         """Reset stats toàn server (giữ points)"""
         # 1. Clear all fishing inventories? (Dangerous global action)
         # Code requested: "DELETE FROM fishing_inventory"
-        await self._run_query(lambda: self.client.table('fishing_inventory').delete().neq('user_id', 0).execute()) # Hack to delete all
+        await self.rest.delete('fishing_inventory', {'user_id': ('neq', 0)}) # Hack to delete all
         
         # 2. Delete all local stats for this guild
-        await self._run_query(lambda: self.client.table('player_stats').delete().eq('guild_id', guild_id).execute())
+        await self.rest.delete('player_stats', {'guild_id': guild_id})
         
         # 3. Reset global stats for ALL (except points)
         data = {
@@ -481,12 +517,16 @@ class SupabaseManager:
         }
         # In supabase-py, update typically updates all matching rows. 
         # But we must be careful. neq('user_id', 0) selects all valid users roughly.
-        await self._run_query(lambda: self.client.table('player_stats').update(data).eq('guild_id', 0).execute())
+        await self.rest.update('player_stats', data, {'guild_id': 0})
 
     async def reset_player_coiz(self, user_id: int):
         """Reset coiz về 0"""
-        await self._run_query(lambda: self.client.table('player_stats').update({"total_points": 0}).eq('user_id', user_id).eq('guild_id', 0).execute())
+        await self.wallet.flush()
+        await self.rest.update('player_stats', {"total_points": 0}, {'user_id': user_id, 'guild_id': 0})
+        self.wallet.invalidate(user_id)
 
     async def reset_all_coiz(self):
         """Reset toàn bộ coiz về 0"""
-        await self._run_query(lambda: self.client.table('player_stats').update({"total_points": 0}).eq('guild_id', 0).execute())
+        await self.wallet.flush()
+        await self.rest.update('player_stats', {"total_points": 0}, {'guild_id': 0})
+        self.wallet.invalidate()
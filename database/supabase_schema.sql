@@ -56,6 +56,21 @@ CREATE TABLE IF NOT EXISTS channel_configs (
     game_type TEXT NOT NULL
 );
 
+-- Table: game_snapshots (game chỉ sống trong RAM, ghi lúc tắt bot và khôi phục lúc khởi động)
+CREATE TABLE IF NOT EXISTS game_snapshots (
+    channel_id BIGINT NOT NULL,
+    game_type TEXT NOT NULL,
+    data JSONB NOT NULL,
+    saved_at FLOAT NOT NULL,
+    PRIMARY KEY (channel_id, game_type)
+);
+
+-- Table: point_batches (các lô delta Coiz đã ghi, để gửi lại lô lỗi không bị cộng hai lần)
+CREATE TABLE IF NOT EXISTS point_batches (
+    batch_id TEXT PRIMARY KEY,
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
 -- Table: fishing_inventory
 CREATE TABLE IF NOT EXISTS fishing_inventory (
     user_id BIGINT PRIMARY KEY,
@@ -64,9 +79,13 @@ CREATE TABLE IF NOT EXISTS fishing_inventory (
     inventory JSONB DEFAULT '{}'::jsonb,
     upgrades JSONB DEFAULT '{}'::jsonb,
     stats JSONB DEFAULT '{}'::jsonb,
-    last_fished TIMESTAMPTZ
+    last_fished TIMESTAMPTZ,
+    version INTEGER NOT NULL DEFAULT 0 -- Optimistic concurrency (compare-and-swap)
 );
 
+-- Migration cho bảng đã tồn tại
+ALTER TABLE fishing_inventory ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 0;
+
 -- Table: transactions (For Payment/Donation)
 CREATE TABLE IF NOT EXISTS transactions (
     id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
@@ -78,3 +97,125 @@ CREATE TABLE IF NOT EXISTS transactions (
     created_at TIMESTAMPTZ DEFAULT NOW(),
     rewarded_at TIMESTAMPTZ
 );
+
+-- ===== FUNCTIONS (RPC) =====
+
+-- Cộng/trừ điểm global (guild_id = 0) một cách atomic, trả về số dư mới
+CREATE OR REPLACE FUNCTION increment_points(p_user_id BIGINT, p_delta NUMERIC)
+RETURNS NUMERIC
+LANGUAGE sql
+AS $$
+    INSERT INTO player_stats (user_id, guild_id, total_points)
+    VALUES (p_user_id, 0, p_delta)
+    ON CONFLICT (user_id, guild_id) DO UPDATE SET
+        total_points = player_stats.total_points + EXCLUDED.total_points
+    RETURNING total_points;
+$$;
+
+-- Cập nhật thống kê từ đã gửi (đúng/sai, từ dài nhất)
+CREATE OR REPLACE FUNCTION record_word_stats(p_user_id BIGINT, p_guild_id BIGINT, p_word TEXT, p_is_correct BOOLEAN)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    INSERT INTO player_stats (user_id, guild_id, words_submitted, correct_words, wrong_words,
+                              longest_word, longest_word_length, last_played)
+    VALUES (p_user_id, p_guild_id, 1,
+            CASE WHEN p_is_correct THEN 1 ELSE 0 END,
+            CASE WHEN p_is_correct THEN 0 ELSE 1 END,
+            CASE WHEN p_is_correct THEN p_word ELSE '' END,
+            CASE WHEN p_is_correct THEN char_length(p_word) ELSE 0 END,
+            NOW())
+    ON CONFLICT (user_id, guild_id) DO UPDATE SET
+        words_submitted = player_stats.words_submitted + 1,
+        correct_words = player_stats.correct_words + EXCLUDED.correct_words,
+        wrong_words = player_stats.wrong_words + EXCLUDED.wrong_words,
+        longest_word = CASE WHEN EXCLUDED.longest_word_length > player_stats.longest_word_length
+                            THEN EXCLUDED.longest_word ELSE player_stats.longest_word END,
+        longest_word_length = GREATEST(player_stats.longest_word_length, EXCLUDED.longest_word_length),
+        last_played = NOW();
+$$;
+
+-- Áp dụng trọn một lượt nối từ trong một transaction:
+-- thêm từ, chuyển người chơi, cộng điểm phiên, cộng điểm global, cập nhật stats
+CREATE OR REPLACE FUNCTION commit_turn(
+    p_channel_id BIGINT,
+    p_guild_id BIGINT,
+    p_user_id BIGINT,
+    p_word TEXT,
+    p_points NUMERIC,
+    p_is_correct BOOLEAN,
+    p_next_player_id BIGINT DEFAULT NULL
+)
+RETURNS NUMERIC
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_total NUMERIC;
+    v_key TEXT := p_user_id::TEXT;
+    v_word TEXT := lower(p_word);
+BEGIN
+    v_total := increment_points(p_user_id, p_points);
+    PERFORM record_word_stats(p_user_id, p_guild_id, v_word, p_is_correct);
+
+    -- Điểm trong phiên
+    UPDATE game_states SET
+        scores = jsonb_set(
+            COALESCE(scores, '{}'::jsonb), ARRAY[v_key],
+            to_jsonb(COALESCE((scores ->> v_key)::NUMERIC, 0) + p_points)
+        )
+    WHERE channel_id = p_channel_id;
+
+    IF p_is_correct THEN
+        UPDATE game_states SET
+            current_word = p_word,
+            current_player_id = COALESCE(p_next_player_id, current_player_id),
+            used_words = CASE WHEN used_words ? v_word THEN used_words
+                              ELSE used_words || to_jsonb(v_word) END,
+            -- Thách đấu bot: bot không vào danh sách người chơi
+            players = CASE WHEN p_next_player_id IS NULL OR is_bot_challenge OR players @> to_jsonb(p_next_player_id)
+                           THEN players ELSE players || to_jsonb(p_next_player_id) END,
+            turn_count = turn_count + 1,
+            turn_start_time = EXTRACT(EPOCH FROM clock_timestamp()),
+            wrong_attempts = 0
+        WHERE channel_id = p_channel_id;
+    ELSIF p_next_player_id IS NOT NULL THEN
+        -- Sai quá số lần cho phép: giữ nguyên từ, chuyển lượt
+        UPDATE game_states SET
+            current_player_id = p_next_player_id,
+            turn_count = turn_count + 1,
+            turn_start_time = EXTRACT(EPOCH FROM clock_timestamp()),
+            wrong_attempts = 0
+        WHERE channel_id = p_channel_id;
+    ELSE
+        UPDATE game_states SET wrong_attempts = wrong_attempts + 1
+        WHERE channel_id = p_channel_id;
+    END IF;
+
+    RETURN v_total;
+END;
+$$;
+
+-- Ghi nhiều delta điểm global trong một lệnh (WalletService flush)
+-- p_deltas: {"<user_id>": <delta>, ...}
+-- p_batch_id: lô đã ghi thì bỏ qua (WalletService gửi lại lô bị lỗi / timeout)
+DROP FUNCTION IF EXISTS apply_point_deltas(JSONB);
+CREATE OR REPLACE FUNCTION apply_point_deltas(p_deltas JSONB, p_batch_id TEXT)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO point_batches (batch_id) VALUES (p_batch_id)
+    ON CONFLICT (batch_id) DO NOTHING;
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    DELETE FROM point_batches WHERE applied_at < NOW() - INTERVAL '1 day';
+
+    INSERT INTO player_stats (user_id, guild_id, total_points)
+    SELECT key::BIGINT, 0, value::NUMERIC
+    FROM jsonb_each_text(p_deltas)
+    ON CONFLICT (user_id, guild_id) DO UPDATE SET
+        total_points = player_stats.total_points + EXCLUDED.total_points;
+END;
+$$;
@@ -0,0 +1,148 @@
+"""
+Versioning - Optimistic concurrency cho các row JSON (fishing_inventory)
+Compare-and-swap theo cột version, xung đột thì merge 3 chiều rồi thử lại
+"""
+import copy
+from typing import Any, Awaitable, Callable, Dict
+
+MISSING = object()
+MAX_CAS_RETRIES = 5
+COUNT_KEY = "count"  # Entry kho (cá...) hết số lượng thì bị xóa khỏi dict
+
+
+class ConcurrentUpdateError(Exception):
+    """Không ghi được sau nhiều lần retry vì row liên tục bị thay đổi"""
+
+
+class VersionedRecord(dict):
+    """Dict dữ liệu + version đã đọc + bản sao gốc (base) dùng để merge khi xung đột"""
+
+    def __init__(self, data: Dict, version: int = 0):
+        super().__init__(data)
+        self.version = version
+        self.base = copy.deepcopy(data)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_counter(value) -> bool:
+    """Số lượng tồn kho: số, hoặc entry dạng {"count": ...}"""
+    return _is_number(value) or (isinstance(value, dict) and _is_number(value.get(COUNT_KEY)))
+
+
+def merge_json(base: Any, mine: Any, theirs: Any) -> Any:
+    """Merge 3 chiều: giữ thay đổi của cả mình (mine) và người khác (theirs) so với base
+
+    - dict: merge từng key
+    - số: cộng dồn delta (theirs + (mine - base)), bên đã xóa key tính là 0
+      (bán hết cá / dùng hết mồi rồi xóa key vẫn giữ được delta âm khi merge với lượt câu cùng lúc)
+    - list: như set có thứ tự (thêm phần tử mới của mình, bỏ phần tử mình đã xóa)
+    - còn lại: nếu mình có đổi thì mình thắng
+
+    Hai bên cùng lấy ra một món (cùng xóa một entry, hoặc merge làm số lượng âm) thì không merge được:
+    raise ConcurrentUpdateError để người gọi đọc lại và kiểm tra tồn kho (không trả tiền hai lần)
+    """
+    if mine == base:
+        return theirs
+    if theirs == base:
+        return mine
+    if theirs == mine:
+        if mine is MISSING:
+            if _is_counter(base):
+                raise ConcurrentUpdateError("Both writers removed the same inventory entry")
+            return mine
+        # Cùng giảm một số lượng (vd: bấm bán hai lần) là hai lần lấy ra, không phải một thay đổi
+        decreased = _is_number(mine) and _is_number(base) and mine < base
+        if not decreased and not isinstance(mine, dict):
+            return mine
+
+    deleted = mine is MISSING or theirs is MISSING
+    if deleted:
+        # Một bên xóa, bên kia sửa: số và dict (vd: {"count", "total_value"}) merge theo delta với bên xóa = rỗng
+        changed = theirs if mine is MISSING else mine
+        if _is_number(changed) and _is_number(base):
+            mine = 0 if mine is MISSING else mine
+            theirs = 0 if theirs is MISSING else theirs
+        elif isinstance(changed, dict) and isinstance(base, dict):
+            mine = {} if mine is MISSING else mine
+            theirs = {} if theirs is MISSING else theirs
+        else:
+            # Không merge được: giữ bên đã sửa
+            return changed
+
+    if isinstance(mine, dict) and isinstance(theirs, dict):
+        base = base if isinstance(base, dict) else {}
+        result = {}
+        keys = list(theirs.keys()) + [k for k in mine.keys() if k not in theirs]
+        # Key cả hai bên cùng xóa cũng phải xét (cùng lấy ra một món)
+        keys += [k for k in base.keys() if k not in theirs and k not in mine]
+        for key in keys:
+            merged = merge_json(base.get(key, MISSING), mine.get(key, MISSING), theirs.get(key, MISSING))
+            if merged is not MISSING:
+                result[key] = merged
+        if deleted and (not result or (_is_number(result.get(COUNT_KEY)) and result[COUNT_KEY] <= 0)):
+            return MISSING
+        return result
+
+    if _is_number(mine) and _is_number(theirs):
+        base_num = base if _is_number(base) else 0
+        result = theirs + (mine - base_num)
+        if result < 0 and mine >= 0 and theirs >= 0:
+            raise ConcurrentUpdateError("Merged inventory count would go below zero")
+        if deleted and result == 0:
+            return MISSING  # Về 0 thì key bị xóa như lúc ghi
+        return result
+
+    if isinstance(mine, list) and isinstance(theirs, list):
+        base_list = base if isinstance(base, list) else []
+        removed = [x for x in base_list if x not in mine]
+        result = [x for x in theirs if x not in removed]
+        result += [x for x in mine if x not in base_list and x not in result]
+        return result
+
+    return mine
+
+
+async def versioned_update(
+    base: VersionedRecord,
+    changes: Dict[str, Any],
+    fetch_current: Callable[[], Awaitable[VersionedRecord]],
+    try_write: Callable[[int, Dict[str, Any]], Awaitable[bool]],
+    max_retries: int = MAX_CAS_RETRIES
+) -> VersionedRecord:
+    """Ghi các cột trong `changes` bằng CAS trên version của `base`
+
+    try_write(expected_version, values) trả về False khi version đã đổi.
+    Khi xung đột: đọc bản mới, merge 3 chiều từng cột rồi thử lại.
+    Thành công thì cập nhật `base` (version, base, giá trị) để dùng tiếp được.
+    """
+    originals = dict(changes)
+    mine = dict(changes)
+    current = base
+
+    for _ in range(max_retries):
+        if await try_write(current.version, mine):
+            # Cập nhật record của người gọi (giữ nguyên object dict đã truyền vào)
+            for column, value in mine.items():
+                original = originals.get(column)
+                if isinstance(original, dict) and original is not value:
+                    original.clear()
+                    original.update(value)
+                    value = original
+                base[column] = value
+            base.version = current.version + 1
+            base.base = copy.deepcopy(dict(base))
+            return base
+
+        # Xung đột: merge thay đổi của mình lên bản mới nhất rồi thử lại
+        theirs = await fetch_current()
+        merged = {
+            column: merge_json(current.base.get(column, MISSING), value, theirs.get(column, MISSING))
+            for column, value in mine.items()
+        }
+        mine = {k: v for k, v in merged.items() if v is not MISSING}
+        current = theirs
+
+    raise ConcurrentUpdateError(f"Version conflict after {max_retries} retries")
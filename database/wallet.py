@@ -0,0 +1,146 @@
+"""
+Wallet Service - Gom các thay đổi Coiz (add_points) trong RAM và flush theo lô
+Vẫn đảm bảo read-your-writes: số dư = số dư đã biết + delta đang ghi + delta đang chờ ghi
+Mỗi lô có batch_id, lô lỗi giữa chừng (không biết đã ghi hay chưa) được gửi lại nguyên lô, database bỏ qua nếu đã áp dụng
+"""
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import config
+
+
+class WalletService:
+    """Cache số dư + gom delta, flush bằng một lệnh bulk (apply_point_deltas) mỗi chu kỳ
+
+    backend cần có:
+        - fetch_points(user_id) -> số dư trong database
+        - apply_point_deltas({user_id: delta}, batch_id) -> ghi nhiều delta trong một lệnh (idempotent theo batch_id)
+    """
+
+    def __init__(self, backend, flush_interval: float = None, cache_ttl: float = None, max_cached: int = None):
+        self.backend = backend
+        self.flush_interval = flush_interval if flush_interval is not None else config.WALLET_FLUSH_INTERVAL
+        self.cache_ttl = cache_ttl if cache_ttl is not None else config.WALLET_CACHE_TTL
+        self.max_cached = max_cached if max_cached is not None else config.WALLET_CACHE_SIZE
+
+        self._balances: "OrderedDict[int, tuple]" = OrderedDict()  # user_id -> (số dư đã ghi, thời điểm nạp)
+        self._pending: Dict[int, float] = {}  # user_id -> delta chưa ghi
+        self._inflight: Dict[int, float] = {}  # Lô đang ghi (hoặc ghi lỗi, chờ gửi lại): chưa có trong số dư đã biết
+        self._batch_id: Optional[str] = None
+        self._lock = asyncio.Lock()  # Không cho fetch chạy chen giữa lúc flush
+        self._task: Optional[asyncio.Task] = None
+
+        # Thống kê
+        self.adds = 0
+        self.flushes = 0
+        self.rows_written = 0
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        """Dừng vòng flush và ghi nốt các delta còn lại"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def add(self, user_id: int, delta: float):
+        """Ghi nhận delta (không I/O)"""
+        if not delta:
+            return
+        self._pending[user_id] = self._pending.get(user_id, 0) + delta
+        self.adds += 1
+
+    def observe(self, user_id: int, delta: float):
+        """Database đã được cộng delta bởi lệnh khác (vd commit_turn) -> cập nhật cache"""
+        cached = self._balances.get(user_id)
+        if cached:
+            self._balances[user_id] = (cached[0] + delta, cached[1])
+
+    def invalidate(self, user_id: int = None):
+        """Bỏ cache số dư (1 user hoặc tất cả) sau các thao tác ghi trực tiếp"""
+        if user_id is None:
+            self._balances.clear()
+        else:
+            self._balances.pop(user_id, None)
+
+    async def get_balance(self, user_id: int) -> float:
+        """Số dư hiện tại (read-your-writes)"""
+        cached = self._balances.get(user_id)
+        if cached and time.monotonic() - cached[1] < self.cache_ttl:
+            self._balances.move_to_end(user_id)
+            return cached[0] + self._inflight.get(user_id, 0) + self._pending.get(user_id, 0)
+
+        async with self._lock:
+            # Lô lỗi trước đó phải ngã ngũ trước khi đọc database, không thì không biết số dư đã gồm lô đó chưa
+            if user_id in self._inflight:
+                await self._send_inflight()
+            base = await self.backend.fetch_points(user_id) or 0
+            in_flight = self._inflight.get(user_id)
+            if in_flight is None:
+                self._remember(user_id, base)
+                return base + self._pending.get(user_id, 0)
+        # Vẫn lỗi: không biết database đã gồm lô chưa -> lấy số dư thấp hơn (không cache) để không tiêu lố
+        return min(base, base + in_flight) + self._pending.get(user_id, 0)
+
+    async def flush(self):
+        """Ghi tất cả delta đang chờ trong một lệnh bulk (gửi lại lô lỗi trước nếu có)"""
+        if not self._pending and not self._inflight:
+            return
+
+        async with self._lock:
+            if self._inflight and not await self._send_inflight():
+                return
+
+            batch, self._pending = self._pending, {}
+            batch = {uid: d for uid, d in batch.items() if d}
+            if not batch:
+                return
+            self._inflight, self._batch_id = batch, uuid.uuid4().hex
+            await self._send_inflight()
+
+    async def _send_inflight(self) -> bool:
+        """Gửi lô đang ghi (gọi khi giữ lock), lỗi thì giữ nguyên lô + batch_id để gửi lại"""
+        batch = self._inflight
+        try:
+            await self.backend.apply_point_deltas(batch, self._batch_id)
+        except Exception as e:
+            print(f"⚠️ Wallet flush failed ({len(batch)} users), will retry batch {self._batch_id}: {e}")
+            return False
+
+        self.flushes += 1
+        self.rows_written += len(batch)
+        for uid, d in batch.items():
+            self.observe(uid, d)
+        self._inflight, self._batch_id = {}, None
+        return True
+
+    def get_stats(self) -> Dict:
+        return {
+            'adds': self.adds,
+            'flushes': self.flushes,
+            'rows_written': self.rows_written,
+            'pending_users': len(self._pending),
+            'inflight_users': len(self._inflight),
+            'cached_users': len(self._balances)
+        }
+
+    def _remember(self, user_id: int, balance: float):
+        self._balances[user_id] = (balance, time.monotonic())
+        self._balances.move_to_end(user_id)
+        while len(self._balances) > self.max_cached:
+            self._balances.popitem(last=False)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
@@ -0,0 +1,240 @@
+"""
+Mô phỏng kinh tế câu cá (Monte Carlo, NumPy) - không cần Discord/database
+Dùng chung bảng trọng số và công thức với cogs/cau_ca.py (utils/catch_tables.py)
+Run: python simulate_fishing.py --rod "Golden Rod" --bait "Magic Bait" --biome River --casts 1000000
+     python simulate_fishing.py --benchmark
+Cần numpy: pip install numpy
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import numpy as np
+except ImportError:
+    print("❌ simulate_fishing.py cần numpy: pip install numpy")
+    sys.exit(1)
+
+from utils import catch_tables as ct
+from utils.fishing_data import BAITS, BIOMES, CHARMS, RARITIES, RODS, TREASURES, XP_RARITY_MUL
+
+RARITY_ORDER = ("Common",) + tuple(rarity for _, rarity in reversed(ct.RARITY_THRESHOLDS))
+RARITY_VALUE_MUL = np.array([RARITIES.get(r, {}).get("mul", 1.0) for r in RARITY_ORDER])
+RARITY_XP_MUL = np.array([XP_RARITY_MUL.get(r, 1.0) for r in RARITY_ORDER])
+RARITY_EDGES = np.array([threshold for threshold, _ in reversed(ct.RARITY_THRESHOLDS)], dtype=float)
+CHEST_VALUES = np.array([chest["value"] for chest in TREASURES], dtype=float)
+
+
+def loadout_stats(rod_key: str, bait_key: str, charm_keys):
+    """Power, Luck, XP multiplier giống get_stats_multiplier (bùa coi như luôn còn hiệu lực)"""
+    rod = RODS[rod_key]
+    bait = BAITS.get(bait_key, {"power": 0, "luck": 0})
+    power = rod["power"] + bait.get("power", 0)
+    luck = rod["luck"] + bait.get("luck", 0)
+    xp_mul = 1.0
+    for key in charm_keys:
+        charm = CHARMS[key]
+        power += charm.get("power", 0)
+        luck += charm.get("luck", 0)
+        xp_mul = max(xp_mul, charm.get("xp_mul", 1.0))
+    return power, luck, xp_mul
+
+
+def triangular(rng, low, high, mode, size):
+    """random.triangular dạng vector (cùng công thức, kể cả khi mode nằm ngoài [low, high])"""
+    low = np.broadcast_to(np.asarray(low, dtype=float), (size,))
+    high = np.broadcast_to(np.asarray(high, dtype=float), (size,))
+    mode = np.broadcast_to(np.asarray(mode, dtype=float), (size,))
+    u = rng.random(size)
+    span = high - low
+    with np.errstate(divide="ignore", invalid="ignore"):
+        c = np.where(span != 0, (mode - low) / span, 0.5)
+    swap = u > c
+    u = np.where(swap, 1.0 - u, u)
+    c = np.where(swap, 1.0 - c, c)
+    lo = np.where(swap, high, low)
+    hi = np.where(swap, low, high)
+    return lo + (hi - lo) * np.sqrt(u * c)
+
+
+def simulate(rod_key: str, bait_key: str, biome_name: str, casts: int, charm_keys=(), seed: int = None):
+    """Mô phỏng `casts` lần câu, trả về dict tổng hợp"""
+    rng = np.random.default_rng(seed)
+    power, luck, xp_mul = loadout_stats(rod_key, bait_key, charm_keys)
+    biome = ct.biome_key(biome_name)
+    pool = ct.POOLS[biome]
+
+    base_value = np.array([f["base_value"] for f in pool], dtype=float)
+    min_size = np.array([f["min_size"] for f in pool], dtype=float)
+    max_size = np.array([f["max_size"] for f in pool], dtype=float)
+    boss = np.array([f["name"] in ct.BOSS_FISH for f in pool])
+
+    # --- Kho báu (mỗi lần câu) ---
+    treasure = rng.random(casts) * 100 < ct.treasure_chance(luck)
+    n_treasure = int(treasure.sum())
+    last_chest = len(TREASURES) - 1
+    chest_idx = np.minimum(last_chest, triangular(
+        rng, 0, last_chest, luck / ct.TREASURE_LUCK_DIV, n_treasure
+    ).astype(np.int64))
+    treasure_coiz = (CHEST_VALUES[chest_idx] * rng.uniform(2.0, 5.0, n_treasure)).astype(np.int64)
+
+    # Cá trong rương: spawn_rate gốc, số lượng theo cấp rương, giá x1.5
+    has_fish = rng.random(n_treasure) < ct.TREASURE_FISH_CHANCE
+    chest_fish_idx = chest_idx[has_fish]
+    treasure_cum = np.asarray(ct._TREASURE_CUM[biome])
+    picked = np.searchsorted(treasure_cum, rng.random(has_fish.sum()) * treasure_cum[-1], side="right")
+    picked = np.minimum(picked, len(pool) - 1)
+    qty = rng.integers(3 + chest_fish_idx * 2, 10 + chest_fish_idx * 5, endpoint=True)
+    treasure_fish_value = (qty * (base_value[picked] * 1.5).astype(np.int64)).sum()
+    dragon_balls = int((rng.random(n_treasure) < ct.DRAGON_BALL_CHANCE).sum())
+
+    # --- Lượt câu cá (Magnet: 2-5 con mỗi lần) ---
+    if bait_key == "Magnet":
+        attempts = int(rng.integers(ct.MAGNET_MIN_FISH, ct.MAGNET_MAX_FISH, endpoint=True, size=casts).sum())
+    else:
+        attempts = casts
+
+    caught = rng.uniform(0, 100, attempts) <= ct.success_chance(luck)
+    n = int(caught.sum())
+
+    rarity_idx = np.searchsorted(RARITY_EDGES, rng.uniform(0, 100, n) + luck * ct.RARITY_LUCK_BONUS, side="left")
+    cum = np.asarray(ct.luck_table(biome, luck))
+    fish_idx = np.minimum(np.searchsorted(cum, rng.random(n) * cum[-1], side="right"), len(pool) - 1)
+
+    lo, hi = min_size[fish_idx], max_size[fish_idx]
+    power_factor = min(1.0, power / ct.POWER_CAP)
+    raw_size = triangular(rng, lo, hi, lo + (hi - lo) * (0.2 + 0.8 * power_factor), n)
+    size = np.round(raw_size * (1.0 + power * ct.SIZE_PER_POWER), 2)
+
+    value = ((base_value[fish_idx] + size * ct.VALUE_PER_SIZE) * RARITY_VALUE_MUL[rarity_idx]).astype(np.int64)
+    value = np.where(rng.random(n) < ct.CRIT_CHANCE, value * ct.CRIT_MUL, value)
+
+    xp = np.maximum(ct.MIN_XP, (value / ct.XP_VALUE_DIV * RARITY_XP_MUL[rarity_idx]).astype(np.int64))
+    xp = (xp * xp_mul).astype(np.int64)
+
+    # --- Chi phí ---
+    durability = RODS[rod_key].get("durability")
+    bait_cost = BAITS.get(bait_key, {}).get("price", 0) * casts
+    charm_minutes = {key: (CHARMS[key]["duration_min"] + CHARMS[key]["duration_max"]) / 2 for key in charm_keys}
+
+    return {
+        "casts": casts,
+        "attempts": attempts,
+        "power": power,
+        "luck": luck,
+        "xp_mul": xp_mul,
+        "caught": n,
+        "fish_value": int(value.sum()),
+        "xp": int(xp.sum()),
+        "bosses": int(boss[fish_idx].sum()),
+        "rarity_counts": dict(zip(RARITY_ORDER, np.bincount(rarity_idx, minlength=len(RARITY_ORDER)).tolist())),
+        "treasures": n_treasure,
+        "treasure_coiz": int(treasure_coiz.sum()),
+        "treasure_fish_value": int(treasure_fish_value),
+        "dragon_balls": dragon_balls,
+        "fishing_cost": ct.FISHING_COST * casts,
+        "bait_cost": bait_cost,
+        "rod_breaks": casts // durability if durability else 0,
+        "rod_cost": (casts // durability) * RODS[rod_key]["price"] if durability else 0,
+        "charm_minutes": charm_minutes,
+    }
+
+
+def hours_to_levels(xp_per_hour: float, levels=(5, 10, 20, 30, 40, 50)):
+    """Số giờ để đạt các mốc level với tốc độ XP cho trước (XP curve)"""
+    result = {}
+    total = 0
+    level = 1
+    for target in levels:
+        while level < target:
+            total += ct.xp_required(level)
+            level += 1
+        result[target] = total / xp_per_hour if xp_per_hour else float("inf")
+    return result
+
+
+def report(result, casts_per_hour: float):
+    hours = result["casts"] / casts_per_hour
+    charm_cost = sum(
+        CHARMS[key]["price"] * (60 / minutes) * hours for key, minutes in result["charm_minutes"].items()
+    )
+    income = result["fish_value"] + result["treasure_coiz"] + result["treasure_fish_value"]
+    costs = result["fishing_cost"] + result["bait_cost"] + result["rod_cost"] + charm_cost
+    xp_per_hour = result["xp"] / hours
+
+    print("\n" + "=" * 60)
+    print(f"🎣 {result['casts']:,} casts | Power {result['power']} | Luck {result['luck']} | XP x{result['xp_mul']}")
+    print("=" * 60)
+    print(f"  💰 Coiz/giờ (lãi):   {(income - costs) / hours:,.0f}")
+    print(f"     - Bán cá:         {result['fish_value'] / hours:,.0f}")
+    print(f"     - Kho báu:        {(result['treasure_coiz'] + result['treasure_fish_value']) / hours:,.0f}")
+    print(f"     - Chi phí:        {costs / hours:,.0f}")
+    print(f"  ✨ XP/giờ:           {xp_per_hour:,.0f}")
+    print(f"  🎯 Tỉ lệ trúng:      {result['caught'] / max(1, result['attempts']):.2%}")
+    print(f"  👑 Vua Cá:           {result['bosses'] / hours:.3f}/giờ ({result['bosses'] * 1_000_000 / result['casts']:,.1f}/1M casts)")
+    print(f"  📦 Kho báu:          {result['treasures'] / hours:.2f}/giờ | 🐉 Ngọc Rồng: {result['dragon_balls'] / hours:.4f}/giờ")
+    print(f"  🔧 Gãy cần:          {result['rod_breaks'] / hours:.2f}/giờ")
+
+    caught = max(1, result["caught"])
+    print("  🎲 Độ hiếm:          " + " | ".join(
+        f"{rarity} {count / caught:.2%}" for rarity, count in result["rarity_counts"].items() if count
+    ))
+    print("  📈 Giờ để đạt level: " + " | ".join(
+        f"Lv{level}: {h:,.1f}h" for level, h in hours_to_levels(xp_per_hour).items()
+    ))
+
+
+def benchmark(casts: int = 200_000):
+    """So sánh tốc độ: mô phỏng vector hóa vs roll từng con bằng catch_tables (như process_fishing)"""
+    rod, bait, biome = "Golden Rod", "Magic Bait", "River"
+    power, luck, xp_mul = loadout_stats(rod, bait, ())
+
+    start = time.perf_counter()
+    simulate(rod, bait, biome, casts, seed=1)
+    vector_time = time.perf_counter() - start
+
+    scalar_casts = casts // 10
+    start = time.perf_counter()
+    for _ in range(scalar_casts):
+        if random.uniform(0, 100) > ct.success_chance(luck):
+            continue
+        rarity = ct.roll_rarity(luck)
+        fish = ct.roll_fish(biome, luck)
+        value = ct.fish_value(fish, ct.roll_size(fish, power), rarity)
+        ct.xp_for_catch(value, rarity, xp_mul)
+    scalar_time = time.perf_counter() - start
+
+    print(f"⚡ NumPy:  {casts / vector_time:,.0f} casts/s ({casts:,} casts in {vector_time:.3f}s)")
+    print(f"🐢 Scalar: {scalar_casts / scalar_time:,.0f} casts/s ({scalar_casts:,} casts in {scalar_time:.3f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mô phỏng kinh tế câu cá")
+    parser.add_argument("--rod", default="Plastic Rod", choices=list(RODS.keys()))
+    parser.add_argument("--bait", default="Worms", choices=list(BAITS.keys()))
+    parser.add_argument("--charm", action="append", default=[], choices=list(CHARMS.keys()))
+    parser.add_argument("--biome", default="River", choices=list(BIOMES.keys()))
+    parser.add_argument("--casts", type=int, default=1_000_000)
+    parser.add_argument("--casts-per-hour", type=float, default=360, help="Số lần câu mỗi giờ (mặc định: 1 lần/10s)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--benchmark", action="store_true")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark()
+        return
+
+    start = time.perf_counter()
+    result = simulate(args.rod, args.bait, args.biome, args.casts, args.charm, args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"🎣 {args.rod} + {args.bait} @ {args.biome} ({elapsed:.2f}s)")
+    report(result, args.casts_per_hour)
+
+
+if __name__ == "__main__":
+    main()
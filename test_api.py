@@ -10,6 +10,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from utils.dictionary_api import init_dictionary_service, close_dictionary_service
+from utils.http_client import close_http_session
 
 
 async def test_english_words():
@@ -115,6 +116,221 @@ async def test_fallback():
     print(f"❌ 'python' (NOT in fallback): {result}")
 
 
+async def start_cambridge_stub(delay: float = 0.2):
+    """Stub server local giả lập 2 trang Cambridge (Anh-Anh, Anh-Việt) + Free Dictionary, đếm số request"""
+    from aiohttp import web
+    
+    hits = {'count': 0, 'vi': 0, 'free': 0, 'delay': delay, 'down': False}
+    
+    async def cambridge_page(request):
+        hits['count'] += 1
+        if hits['down']:
+            return web.Response(status=503)
+        await asyncio.sleep(hits['delay'])  # Giữ request "đang bay" để các caller khác chồng lên
+        word = request.match_info['word']
+        return web.Response(
+            text=f'<span class="ipa dipa">{word}</span><div class="def ddef_d db">a stub definition</div><span>c1</span>',
+            content_type='text/html'
+        )
+    
+    async def vietnamese_page(request):
+        hits['vi'] += 1
+        await asyncio.sleep(0.2)
+        return web.Response(text='<span class="trans dtrans" lang="vi">nghĩa thử</span>', content_type='text/html')
+    
+    async def free_dictionary(request):
+        hits['free'] += 1
+        if hits['down']:
+            return web.Response(status=503)
+        return web.json_response([{'word': request.match_info['word']}])
+    
+    app = web.Application()
+    app.router.add_get('/dictionary/english/{word}', cambridge_page)
+    app.router.add_get('/dictionary/english-vietnamese/{word}', vietnamese_page)
+    app.router.add_get('/api/v2/entries/en/{word}', free_dictionary)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    base = f"http://127.0.0.1:{port}"
+    hits['free_url'] = f"{base}/api/v2/entries"
+    return runner, f"{base}/dictionary/english", f"{base}/dictionary/english-vietnamese", hits
+
+
+async def test_word_info_reuse():
+    """Test luồng trả lời đúng: validate + lấy WordInfo chỉ tải mỗi trang Cambridge 1 lần (song song)"""
+    print("\n" + "="*60)
+    print("📖 Testing WordInfo Reuse")
+    print("="*60)
+    
+    import tempfile
+    import time
+    from utils.dictionary_api import HybridDictionaryService
+    from utils.word_cache import WordCache
+    
+    runner, stub_url, vi_url, hits = await start_cambridge_stub()
+    passed = True
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            service = HybridDictionaryService(use_api=True)
+            service.word_cache = WordCache(os.path.join(tmp, 'word_cache.db'))
+            service.cambridge_api.BASE_URL = stub_url
+            service.cambridge_api.VI_URL = vi_url
+            await service.initialize()
+            
+            start = time.time()
+            valid = await service.is_valid_word('Ubiquitous', 'en')
+            elapsed = time.time() - start
+            info = await service.get_word_info('ubiquitous', 'en')
+            
+            ok = (
+                valid and hits['count'] == 1 and hits['vi'] == 1 and elapsed < 0.35
+                and info['level'] == 'c1' and info['meaning_vi'] == 'nghĩa thử'
+            )
+            passed &= ok
+            print(f"{'✅' if ok else '❌'} pages: english={hits['count']} vietnamese={hits['vi']} "
+                  f"(validate {elapsed * 1000:.0f}ms, stub delay 200ms/page)")
+            
+            # Lookup tiếp theo dùng lại connection keep-alive của session chung
+            from utils.http_client import get_http_stats
+            await service.is_valid_word('eloquent', 'en')
+            stub_stats = get_http_stats().get('127.0.0.1', {})
+            ok = stub_stats.get('reused_connections', 0) > 0
+            passed &= ok
+            print(f"{'✅' if ok else '❌'} shared session: {stub_stats}")
+            await service.close()
+    finally:
+        await runner.cleanup()
+    
+    return passed
+
+
+async def test_hedging():
+    """Test hedge: Cambridge chậm hơn p95 thì Free Dictionary được đua và thắng, validate không bị chặn"""
+    print("\n" + "="*60)
+    print("🏁 Testing Hedged Provider Racing")
+    print("="*60)
+    
+    import time
+    from utils.dictionary_api import HybridDictionaryService
+    
+    runner, stub_url, vi_url, hits = await start_cambridge_stub(delay=3.0)
+    passed = True
+    try:
+        service = HybridDictionaryService(use_api=True)
+        service.word_cache = None
+        service.cambridge_api.BASE_URL = stub_url
+        service.cambridge_api.VI_URL = vi_url
+        service.free_dict_api.BASE_URL = hits['free_url']
+        # Lịch sử: Cambridge thường trả lời trong ~100ms
+        for _ in range(50):
+            service.latency['cambridge'].record(0.1)
+        
+        start = time.time()
+        valid = await service.is_valid_word('serendipity', 'en')
+        elapsed = time.time() - start
+        
+        stats = service.get_latency_stats()
+        ok = valid and elapsed < 1.0 and hits['free'] == 1 and stats['cambridge']['hedged'] == 1
+        passed &= ok
+        print(f"{'✅' if ok else '❌'} slow Cambridge (3s) -> validated in {elapsed * 1000:.0f}ms via Free Dictionary")
+        print(f"Latency Stats: {stats}")
+        await service.close()
+    finally:
+        await runner.cleanup()
+    
+    return passed
+
+
+async def test_circuit_breaker():
+    """Test circuit breaker: provider sập thì sau vài lần lỗi bỏ qua hẳn, dùng local list ngay"""
+    print("\n" + "="*60)
+    print("🔌 Testing Circuit Breaker")
+    print("="*60)
+    
+    import time
+    from utils.dictionary_api import HybridDictionaryService
+    
+    runner, stub_url, vi_url, hits = await start_cambridge_stub(delay=0.05)
+    hits['down'] = True
+    passed = True
+    try:
+        service = HybridDictionaryService(use_api=True, fallback_words={'en': {'apple', 'banana'}})
+        service.word_cache = None
+        service.cambridge_api.BASE_URL = stub_url
+        service.cambridge_api.VI_URL = vi_url
+        service.free_dict_api.BASE_URL = hits['free_url']
+        
+        for word in ['one', 'two', 'three', 'four', 'five']:
+            await service.is_valid_word(word, 'en')
+        calls_before = hits['count']
+        
+        start = time.time()
+        result = await service.is_valid_word('apple', 'en')
+        elapsed = time.time() - start
+        
+        breakers = service.get_breaker_stats()
+        ok = (
+            result and hits['count'] == calls_before and elapsed < 0.05
+            and breakers['Cambridge']['state'] == 'open'
+        )
+        passed &= ok
+        print(f"{'✅' if ok else '❌'} provider down -> local answer in {elapsed * 1000:.1f}ms "
+              f"({hits['count'] - calls_before} upstream calls)")
+        print(f"Breakers: {breakers}")
+        await service.close()
+    finally:
+        await runner.cleanup()
+    
+    return passed
+
+
+async def test_single_flight(concurrency: int = 10):
+    """Test gộp request: N lookup đồng thời cùng một từ chỉ gọi upstream 1 lần (stub server local)"""
+    print("\n" + "="*60)
+    print("🛬 Testing Single-Flight Coalescing")
+    print("="*60)
+    
+    from utils.dictionary_api import CambridgeDictionaryAPI, HybridDictionaryService
+    
+    runner, stub_url, vi_url, hits = await start_cambridge_stub()
+    
+    passed = True
+    try:
+        # 1. CambridgeDictionaryAPI.get_word_info
+        api = CambridgeDictionaryAPI()
+        api.BASE_URL = stub_url
+        results = await asyncio.gather(*(api.get_word_info('hello', 'en') for _ in range(concurrency)))
+        ok = hits['count'] == 1 and all(r and r['definition'] == 'a stub definition' for r in results)
+        passed &= ok
+        print(f"{'✅' if ok else '❌'} get_word_info: {concurrency} callers -> {hits['count']} upstream call(s)")
+        await api.close()
+        
+        # 2. HybridDictionaryService.is_valid_word (tắt word cache để chắc chắn đi qua upstream)
+        hits['count'] = 0
+        service = HybridDictionaryService(use_api=True)
+        service.word_cache = None
+        service.cambridge_api.BASE_URL = stub_url
+        service.cambridge_api.VI_URL = vi_url
+        results = await asyncio.gather(*(service.is_valid_word('World', 'en') for _ in range(concurrency)))
+        ok = hits['count'] == 1 and all(results)
+        passed &= ok
+        print(f"{'✅' if ok else '❌'} is_valid_word: {concurrency} callers -> {hits['count']} upstream call(s)")
+        
+        # 3. Request đã xong thì lần sau phải gọi lại (không giữ kết quả cũ trong bảng in-flight)
+        hits['count'] = 0
+        await service.is_valid_word('World', 'en')
+        ok = hits['count'] == 1 and service.inflight.in_flight() == 0
+        passed &= ok
+        print(f"{'✅' if ok else '❌'} sequential call after completion -> {hits['count']} upstream call(s)")
+        await service.close()
+    finally:
+        await runner.cleanup()
+    
+    return passed
+
+
 async def main():
     """Main test function"""
     print("\n" + "="*60)
@@ -135,6 +351,10 @@ async def main():
         print("✅ Service initialized!")
         
         # Run tests
+        await test_single_flight()
+        await test_word_info_reuse()
+        await test_hedging()
+        await test_circuit_breaker()
         await test_english_words()
         await test_vietnamese_words()
         await test_cache()
@@ -152,6 +372,7 @@ async def main():
     finally:
         # Cleanup
         await close_dictionary_service()
+        await close_http_session()
 
 
 if __name__ == "__main__":
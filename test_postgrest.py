@@ -0,0 +1,172 @@
+"""
+Test script để kiểm tra PostgrestClient với một PostgREST giả (aiohttp server chạy local)
+Run: python test_postgrest.py
+"""
+import asyncio
+import json
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from aiohttp import web
+
+from database.postgrest_client import PostgrestClient, PostgrestError
+
+
+class FakePostgrest:
+    """PostgREST giả: ghi lại request, trả lời theo bảng / function"""
+
+    def __init__(self):
+        self.requests = []
+        self.fail_next = {}  # path -> [status, ...] trả về trước khi trả lời bình thường
+        self.version = 1
+        self.runner = None
+        self.url = None
+
+    async def handle(self, request: web.Request):
+        body = await request.text()
+        path = request.match_info['path']
+        self.requests.append({
+            'method': request.method,
+            'path': path,
+            'query': list(request.query.items()),
+            'prefer': request.headers.get('Prefer'),
+            'body': json.loads(body) if body else None
+        })
+
+        failures = self.fail_next.get(path)
+        if failures:
+            return web.Response(status=failures.pop(0), text='{"message": "fail"}')
+
+        if path == 'items' and request.method == 'GET':
+            return web.json_response([{'id': 1, 'name': 'cá rô'}])
+        if path == 'items' and request.method == 'PATCH':
+            # Compare-and-swap: chỉ cập nhật khi version khớp
+            if request.query.get('version') != f"eq.{self.version}":
+                return web.json_response([])
+            self.version += 1
+            return web.json_response([{'id': 1, 'version': self.version}])
+        if path == 'items' and request.method == 'POST':
+            return web.Response(status=201)
+        if path == 'rpc/add':
+            data = json.loads(body)
+            return web.json_response(data['a'] + data['b'])
+        return web.Response(status=404, text='{"message": "not found"}')
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_route('*', '/rest/v1/{path:.*}', self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+async def _with_server(check):
+    server = FakePostgrest()
+    await server.start()
+    client = PostgrestClient(server.url, 'test-key', timeout=5, retries=2)
+    try:
+        await check(server, client)
+    finally:
+        await client.close()
+        await server.stop()
+
+
+def run(check):
+    asyncio.run(_with_server(check))
+
+
+def test_select_filters():
+    """select dựng đúng query PostgREST từ filter"""
+    async def check(server, client):
+        rows = await client.select('items', "id, name", {'status': 'success', 'rewarded': False,
+                                                         'id': ('in', [1, 2]), 'note': None},
+                                   order='id', desc=True, limit=5)
+        assert rows == [{'id': 1, 'name': 'cá rô'}]
+        query = server.requests[-1]['query']
+        assert ('select', 'id, name') in query
+        assert ('status', 'eq.success') in query
+        assert ('rewarded', 'eq.false') in query
+        assert ('id', 'in.(1,2)') in query
+        assert ('note', 'is.null') in query
+        assert ('order', 'id.desc') in query and ('limit', '5') in query
+        print("✅ select with filters")
+    run(check)
+
+
+def test_update_representation():
+    """update trả về row đã cập nhật (1 row) hoặc [] khi version không khớp (CAS thua)"""
+    async def check(server, client):
+        rows = await client.update('items', {'name': 'cá mè'}, {'id': 1, 'version': 1})
+        assert rows == [{'id': 1, 'version': 2}]
+        assert server.requests[-1]['prefer'] == 'return=representation'
+        rows = await client.update('items', {'name': 'cá chép'}, {'id': 1, 'version': 1})
+        assert rows == []
+        print("✅ update with return=representation")
+    run(check)
+
+
+def test_rpc():
+    async def check(server, client):
+        assert await client.rpc('add', {'a': 2, 'b': 3}) == 5
+        assert server.requests[-1]['method'] == 'POST' and server.requests[-1]['body'] == {'a': 2, 'b': 3}
+        print("✅ rpc")
+    run(check)
+
+
+def test_retry_idempotent():
+    """select / rpc idempotent gặp 503 thì retry, rpc mặc định thì không"""
+    async def check(server, client):
+        server.fail_next['items'] = [503]
+        assert await client.select('items') == [{'id': 1, 'name': 'cá rô'}]
+        assert len(server.requests) == 2
+
+        server.fail_next['rpc/add'] = [503]
+        assert await client.rpc('add', {'a': 1, 'b': 1}, idempotent=True) == 2
+        assert len(server.requests) == 4
+
+        server.fail_next['rpc/add'] = [503]
+        try:
+            await client.rpc('add', {'a': 1, 'b': 1})
+            assert False, "non-idempotent rpc must not retry"
+        except PostgrestError as e:
+            assert e.status == 503
+        assert len(server.requests) == 5
+        print("✅ retry on 503 for idempotent calls")
+    run(check)
+
+
+def test_no_retry_insert():
+    """insert không retry (503 hay 409 đều trả lỗi ngay sau một request)"""
+    async def check(server, client):
+        for status in (503, 409):
+            before = len(server.requests)
+            server.fail_next['items'] = [status]
+            try:
+                await client.insert('items', {'name': 'cá rô'})
+                assert False, "insert must raise"
+            except PostgrestError as e:
+                assert e.status == status
+            assert len(server.requests) == before + 1
+        await client.insert('items', {'name': 'cá rô'})
+        assert server.requests[-1]['prefer'] == 'return=minimal'
+        print("✅ no retry on insert / 409")
+    run(check)
+
+
+if __name__ == "__main__":
+    print("\n🚀 Starting tests...\n")
+    test_select_filters()
+    test_update_representation()
+    test_rpc()
+    test_retry_idempotent()
+    test_no_retry_insert()
+    print("\n✨ All tests completed!\n")
@@ -0,0 +1,75 @@
+"""
+Test script để kiểm tra merge 3 chiều của fishing_inventory
+Run: python test_versioning.py
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database.versioning import ConcurrentUpdateError, merge_json
+
+
+def test_sell_vs_catch():
+    """Bán hết một loài cá trong lúc lượt câu khác thêm đúng loài đó"""
+    base = {"fish": {"Cá Rô": {"count": 3, "total_value": 30}, "Cá Mè": {"count": 1, "total_value": 5}}}
+    sold = {"fish": {"Cá Mè": {"count": 1, "total_value": 5}}}  # /sell đã xóa key
+    caught = {"fish": {"Cá Rô": {"count": 4, "total_value": 42}, "Cá Mè": {"count": 1, "total_value": 5}}}
+
+    expected = {"fish": {"Cá Rô": {"count": 1, "total_value": 12}, "Cá Mè": {"count": 1, "total_value": 5}}}
+    # Bên nào ghi trước thì kết quả cũng chỉ còn con cá vừa câu (không khôi phục chồng cá đã bán)
+    assert merge_json(base, sold, caught) == expected, merge_json(base, sold, caught)
+    assert merge_json(base, caught, sold) == expected, merge_json(base, caught, sold)
+    print("✅ sell vs catch")
+
+
+def _rejected(base, mine, theirs) -> bool:
+    try:
+        merge_json(base, mine, theirs)
+    except ConcurrentUpdateError:
+        return True
+    return False
+
+
+def test_double_sell_rejected():
+    """Hai lần bán cùng lúc lấy ra nhiều cá hơn trong túi: không merge, người gọi phải đọc lại"""
+    base = {"Cá Rô": {"count": 3, "total_value": 30}}
+    sold_all = {}
+    sold_one = {"Cá Rô": {"count": 2, "total_value": 20}}
+    # /sell bán hết trong lúc Bán Nhanh bán 1 con (không được trả 30 + 10 cho 3 con cá giá 30)
+    assert _rejected(base, sold_all, sold_one)
+    assert _rejected(base, sold_one, sold_all)
+    # Bấm Bán Nhanh hai lần cho con cá duy nhất
+    assert _rejected({"Cá Rô": {"count": 1, "total_value": 10}}, {}, {})
+    # Hai lần bán 2 con khi chỉ có 3 con
+    sold_two = {"Cá Rô": {"count": 1, "total_value": 10}}
+    assert _rejected(base, sold_two, sold_two)
+    print("✅ double sell rejected")
+
+
+def test_two_partial_sells():
+    """Hai lần bán 1 con khi còn đủ cá: cả hai đều được trừ"""
+    base = {"Cá Rô": {"count": 3, "total_value": 30}}
+    sold_one = {"Cá Rô": {"count": 2, "total_value": 20}}
+    assert merge_json(base, sold_one, sold_one) == {"Cá Rô": {"count": 1, "total_value": 10}}
+    print("✅ two partial sells")
+
+
+def test_bait_used_up_vs_bought():
+    """Dùng hết mồi (xóa key) trong lúc mua thêm mồi"""
+    base = {"Worms": 1, "Magnet": 2}
+    used = {"Magnet": 2}
+    bought = {"Worms": 11, "Magnet": 2}
+    assert merge_json(base, used, bought) == {"Worms": 10, "Magnet": 2}
+    assert merge_json(base, bought, used) == {"Worms": 10, "Magnet": 2}
+    print("✅ bait used up vs bought")
+
+
+if __name__ == "__main__":
+    print("\n🚀 Starting tests...\n")
+    test_sell_vs_catch()
+    test_double_sell_rejected()
+    test_two_partial_sells()
+    test_bait_used_up_vs_bought()
+    print("\n✨ All tests completed!\n")
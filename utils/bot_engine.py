@@ -0,0 +1,114 @@
+"""
+Bot Engine - Bot chọn từ theo độ khó dựa trên đồ thị nối từ của lexicon
+Node là key nối (chữ cái đầu của từ tiếp theo), cạnh là các từ: key đầu -> key cuối
+- easy: từ ngẫu nhiên
+- normal: từ dài nhất (kiểu cũ)
+- hard: từ để lại cho người chơi ít đường đi tiếp nhất, nhìn trước vài lượt (có memo)
+"""
+import random
+import threading
+from array import array
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from utils.lexicon import Lexicon
+
+DIFFICULTIES = ('easy', 'normal', 'hard')
+DEFAULT_DIFFICULTY = 'normal'  # Như bot cũ (từ dài nhất), 'hard' chỉ khi người chơi chọn trong /challenge-bot
+SEARCH_DEPTH = 2      # Số lượt (mỗi bên) nhìn trước ở mức hard, trên đồ thị key nên không phụ thuộc số từ
+RANDOM_TRIES = 32     # easy: số lần bốc ngẫu nhiên trước khi duyệt tuần tự
+
+
+class ChainGraph:
+    """Đồ thị nối từ dựng một lần trên lexicon
+
+    edges[key đầu][key cuối] = index các từ (dài trước), out_degree[key] = số từ bắt đầu bằng key
+    """
+
+    def __init__(self, lexicon: Lexicon, end_key: Callable[[str], str]):
+        self.lexicon = lexicon
+        start_index = lexicon.start_index('char')
+        self.out_degree: Dict[str, int] = {key: len(indexes) for key, indexes in start_index.items()}
+        self.edges: Dict[str, Dict[str, array]] = {}
+        for key, indexes in start_index.items():
+            groups = defaultdict(lambda: array('I'))
+            for i in indexes:
+                groups[end_key(lexicon.word_at(i))].append(i)
+            self.edges[key] = dict(groups)
+        self._memo: Dict[Tuple[str, int], bool] = {}
+
+    def wins(self, key: str, depth: int) -> bool:
+        """Người đi ở key ép được đối thủ hết đường trong `depth` lượt của mình (bỏ qua từ đã dùng)"""
+        return depth > 0 and any(self.lost(end, depth - 1) for end in self.edges.get(key, ()))
+
+    def lost(self, key: str, depth: int) -> bool:
+        """Người đi ở key thua chắc: hết từ, hoặc mọi nước đi đều để đối thủ thắng trong `depth` lượt"""
+        memo = (key, depth)
+        result = self._memo.get(memo)
+        if result is None:
+            result = all(self.wins(end, depth) for end in self.edges.get(key, ()))
+            self._memo[memo] = result
+        return result
+
+
+class BotEngine:
+    """Chọn từ cho bot theo độ khó (đồ thị dựng lazy, gọi warm() trong thread để làm nóng)"""
+
+    def __init__(self, lexicon: Lexicon, end_key: Callable[[str], str], rng=random):
+        self.lexicon = lexicon
+        self.end_key = end_key
+        self.rng = rng
+        self._graph: Optional[ChainGraph] = None
+        self._lock = threading.Lock()
+
+    @property
+    def graph(self) -> ChainGraph:
+        if self._graph is None:
+            with self._lock:
+                if self._graph is None:
+                    self._graph = ChainGraph(self.lexicon, self.end_key)
+        return self._graph
+
+    def warm(self):
+        self.graph
+
+    def _first_unused(self, indexes: Iterable[int], used_words: set) -> Optional[str]:
+        for i in indexes:
+            word = self.lexicon.word_at(i)
+            if word not in used_words:
+                return word
+        return None
+
+    def choose(self, start_char: str, used_words: set, difficulty: str = DEFAULT_DIFFICULTY) -> Optional[str]:
+        """Từ bot đánh khi phải bắt đầu bằng start_char, None nếu hết từ"""
+        start_char = start_char.lower()
+        indexes = self.lexicon.start_index('char').get(start_char)
+        if not indexes:
+            return None
+
+        if difficulty == 'easy':
+            for _ in range(min(RANDOM_TRIES, len(indexes))):
+                word = self.lexicon.word_at(indexes[self.rng.randrange(len(indexes))])
+                if word not in used_words:
+                    return word
+            return self._first_unused(indexes, used_words)
+
+        if difficulty != 'hard':
+            return self._first_unused(indexes, used_words)
+
+        graph = self.graph
+        used_by_key = Counter(word[0] for word in used_words if word and word in self.lexicon)
+        best, best_score = None, None
+        for end, group in graph.edges[start_char].items():
+            word = self._first_unused(group, used_words)
+            if word is None:
+                continue
+            # Số từ người chơi còn dùng được sau khi bot đánh `word`
+            remaining = graph.out_degree.get(end, 0) - used_by_key[end] - (end == start_char)
+            if remaining <= 0:
+                return word
+            # Ưu tiên: người chơi thua chắc > người chơi không ép thắng được > ít đường đi > từ dài
+            score = (not graph.lost(end, SEARCH_DEPTH), graph.wins(end, SEARCH_DEPTH), remaining, -len(word))
+            if best_score is None or score < best_score:
+                best, best_score = word, score
+        return best
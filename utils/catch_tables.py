@@ -0,0 +1,184 @@
+"""
+Catch Tables - Bảng tra cứu và công thức câu cá dựng sẵn lúc import
+Trọng số cộng dồn theo biome (chia theo luck), index tên cá -> metadata, danh sách Vua Cá
+Mỗi lần roll chỉ là một phép bisect trên mảng có sẵn
+Các công thức (tỉ lệ trúng, độ hiếm, size, giá trị, XP, level) dùng chung với simulate_fishing.py
+"""
+import random
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, Tuple
+
+from utils.fishing_data import BIOMES, RARITIES, TREASURES, XP_RARITY_MUL
+
+DEFAULT_BIOME = "River"
+DEFAULT_SPAWN_RATE = 10
+BOSS_SPAWN_RATE = 1.0    # spawn_rate < 1.0: Vua Cá (tỉ lệ cố định, không theo luck)
+RARE_SPAWN_RATE = 20     # spawn_rate <= 20: cá hiếm, được luck tăng trọng số
+KING_SPAWN_RATE = 0.02   # spawn_rate <= 0.02: tính cho huy hiệu KingFisher
+BOSS_WEIGHT_MUL = 5      # Vua Cá được nhân cố định
+LUCK_RARE_BONUS = 0.002  # +0.2% trọng số cá hiếm mỗi điểm luck
+LUCK_TABLE_CACHE = 4096  # Số bảng (biome, luck) giữ lại
+
+FISHING_COST = 10          # Coiz mỗi lần câu
+
+# Công thức (đơn vị %: roll uniform(0, 100))
+TREASURE_BASE = 2          # Kho báu: 2% + 0.002%/luck, tối đa 15%
+TREASURE_PER_LUCK = 0.002
+TREASURE_MAX = 15
+TREASURE_LUCK_DIV = 50     # Mode của phân phối tam giác chọn rương = luck / 50
+TREASURE_FISH_CHANCE = 0.5
+TREASURE_BAIT_CHANCE = 0.35
+TREASURE_CHARM_CHANCE = 0.15
+DRAGON_BALL_CHANCE = 0.005
+SUCCESS_BASE = 70          # Tỉ lệ không hụt: 70% + 0.2%/luck
+SUCCESS_PER_LUCK = 0.2
+RARITY_LUCK_BONUS = 0.15   # Roll độ hiếm = uniform(0, 100) + luck * 0.15
+RARITY_THRESHOLDS = (
+    (120, "Exotic"), (110, "Mythical"), (95, "Legendary"),
+    (80, "Epic"), (60, "Rare"), (40, "Uncommon")
+)
+POWER_CAP = 500            # Power >= 500: đỉnh phân phối size ở max_size
+SIZE_PER_POWER = 0.0002    # "Limit Break": +0.02% size mỗi điểm power
+VALUE_PER_SIZE = 5
+CRIT_CHANCE = 0.05
+CRIT_MUL = 2
+XP_VALUE_DIV = 50
+MIN_XP = 10
+LEVEL_BASE_XP = 1000
+LEVEL_GROWTH = 1.35
+MAGNET_MIN_FISH = 2
+MAGNET_MAX_FISH = 5
+
+# Tên cá -> metadata (biome sau ghi đè biome trước, giống cách dựng fish_meta cũ)
+FISH_META: Dict[str, Dict] = {
+    fish["name"]: fish for biome in BIOMES.values() for fish in biome["fish"]
+}
+BOSS_FISH = frozenset(
+    name for name, fish in FISH_META.items() if fish.get("spawn_rate", DEFAULT_SPAWN_RATE) < BOSS_SPAWN_RATE
+)
+KING_FISH = tuple(dict.fromkeys(
+    fish["name"] for biome in BIOMES.values() for fish in biome["fish"]
+    if fish.get("spawn_rate", 100) <= KING_SPAWN_RATE
+))
+
+
+def _split_weights(pool) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+    """Tách trọng số thành phần cố định và phần nhân theo luck: w(luck) = fixed + rare * (1 + 0.002 * luck)"""
+    fixed, rare = [], []
+    for fish in pool:
+        rate = fish.get("spawn_rate", DEFAULT_SPAWN_RATE)
+        if rate < BOSS_SPAWN_RATE:
+            fixed.append(rate * BOSS_WEIGHT_MUL)
+            rare.append(0)
+        elif rate <= RARE_SPAWN_RATE:
+            fixed.append(0)
+            rare.append(rate)
+        else:
+            fixed.append(rate)
+            rare.append(0)
+    return tuple(accumulate(fixed)), tuple(accumulate(rare))
+
+
+POOLS = {key: tuple(biome["fish"]) for key, biome in BIOMES.items()}
+_SPLIT_CUM = {key: _split_weights(pool) for key, pool in POOLS.items()}
+# Rương kho báu: chọn cá theo spawn_rate gốc (không theo luck)
+_TREASURE_CUM = {
+    key: tuple(accumulate(f.get("spawn_rate", DEFAULT_SPAWN_RATE) for f in pool))
+    for key, pool in POOLS.items()
+}
+
+
+def biome_key(biome_name: str) -> str:
+    """Biome không tồn tại thì dùng River (giống BIOMES.get(name, BIOMES['River']))"""
+    return biome_name if biome_name in POOLS else DEFAULT_BIOME
+
+
+@lru_cache(maxsize=LUCK_TABLE_CACHE)
+def luck_table(biome: str, luck: float) -> Tuple[float, ...]:
+    """Mảng trọng số cộng dồn của biome ở một mức luck (luck là số nguyên nên mỗi mức là một bucket)"""
+    fixed_cum, rare_cum = _SPLIT_CUM[biome]
+    mul = 1 + luck * LUCK_RARE_BONUS
+    return tuple(f + r * mul for f, r in zip(fixed_cum, rare_cum))
+
+
+def _pick(pool, cum_weights, rng) -> Dict:
+    # Giống random.choices: bisect trên mảng cộng dồn, chặn hi để tránh lỗi làm tròn
+    return pool[bisect_right(cum_weights, rng.random() * cum_weights[-1], 0, len(pool) - 1)]
+
+
+def roll_fish(biome_name: str, luck: float, rng=random) -> Dict:
+    """Chọn một con cá trong biome theo spawn_rate đã điều chỉnh bởi luck"""
+    key = biome_key(biome_name)
+    return _pick(POOLS[key], luck_table(key, luck), rng)
+
+
+def roll_treasure_fish(biome_name: str, rng=random) -> Dict:
+    """Chọn cá thưởng trong rương kho báu (trọng số spawn_rate gốc)"""
+    key = biome_key(biome_name)
+    return _pick(POOLS[key], _TREASURE_CUM[key], rng)
+
+
+def is_boss(name: str) -> bool:
+    return name in BOSS_FISH
+
+
+# ===== FORMULAS =====
+
+def treasure_chance(luck: float) -> float:
+    return min(TREASURE_MAX, TREASURE_BASE + luck * TREASURE_PER_LUCK)
+
+
+def roll_chest_index(luck: float, rng=random) -> int:
+    last = len(TREASURES) - 1
+    return min(last, int(rng.triangular(0, last, luck / TREASURE_LUCK_DIV)))
+
+
+def success_chance(luck: float) -> float:
+    return min(100, SUCCESS_BASE + luck * SUCCESS_PER_LUCK)
+
+
+def rarity_for_roll(roll: float) -> str:
+    for threshold, rarity in RARITY_THRESHOLDS:
+        if roll > threshold:
+            return rarity
+    return "Common"
+
+
+def roll_rarity(luck: float, rng=random) -> str:
+    return rarity_for_roll(rng.uniform(0, 100) + luck * RARITY_LUCK_BONUS)
+
+
+def roll_size(fish: Dict, power: float, rng=random) -> float:
+    """Power dời đỉnh phân phối tam giác về max_size (0 power: 20%, >= 500: 100%) và cho vượt max một chút"""
+    min_s, max_s = fish['min_size'], fish['max_size']
+    power_factor = min(1.0, power / POWER_CAP)
+    mode_s = min_s + (max_s - min_s) * (0.2 + 0.8 * power_factor)
+    raw_size = rng.triangular(min_s, max_s, mode_s)
+    return round(raw_size * (1.0 + power * SIZE_PER_POWER), 2)
+
+
+def fish_value(fish: Dict, size: float, rarity: str) -> int:
+    rarity_mul = RARITIES.get(rarity, {}).get("mul", 1.0)
+    return int((fish['base_value'] + size * VALUE_PER_SIZE) * rarity_mul)
+
+
+def xp_for_catch(value: int, rarity: str, xp_mul: float = 1.0) -> int:
+    xp_gain = max(MIN_XP, int((value / XP_VALUE_DIV) * XP_RARITY_MUL.get(rarity, 1.0)))
+    return int(xp_gain * xp_mul)
+
+
+def xp_required(level: int) -> int:
+    """XP cần để lên level tiếp theo"""
+    return int(LEVEL_BASE_XP * (LEVEL_GROWTH ** (level - 1)))
+
+
+def apply_xp(level: int, xp: int):
+    """Cộng dồn XP, trả về (level, xp còn dư, có lên level không)"""
+    leveled_up = False
+    while xp >= xp_required(level):
+        xp -= xp_required(level)
+        level += 1
+        leveled_up = True
+    return level, xp, leveled_up
@@ -0,0 +1,110 @@
+"""
+Channel Actor - Mỗi kênh một hàng đợi sự kiện game, xử lý lần lượt
+Tin nhắn, timeout, lượt của bot... cùng kênh chạy tuần tự (không còn hai sự kiện cùng đọc session rồi cùng chuyển lượt),
+các kênh khác nhau vẫn chạy song song. Worker của kênh chỉ sống khi hàng đợi còn việc.
+Không gọi run() cho chính kênh đang xử lý từ bên trong một sự kiện của kênh đó (sẽ tự chờ mình).
+"""
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from utils.hedging import LatencyTracker
+
+
+def _consume(future: asyncio.Future):
+    # Sự kiện fire-and-forget (vd: timer) lỗi thì đã log trong worker, không để asyncio báo lại
+    if not future.cancelled():
+        future.exception()
+
+
+class ChannelActorPool:
+    """channel_id -> hàng đợi (fn, args, future, thời điểm vào hàng) + một worker"""
+
+    def __init__(self):
+        self.queues: Dict[Hashable, deque] = {}
+        self.workers: Dict[Hashable, asyncio.Task] = {}
+        self.wait_latency = LatencyTracker()  # Thời gian chờ trong hàng
+        self.run_latency = LatencyTracker()   # Thời gian xử lý một sự kiện
+        self.processed = 0
+        self.failed = 0
+        self.max_depth = 0
+
+    def submit(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args: Any) -> asyncio.Future:
+        """Xếp fn(*args) vào hàng đợi của kênh, trả về future kết quả (không cần await)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        future.add_done_callback(_consume)
+
+        queue = self.queues.setdefault(key, deque())
+        queue.append((fn, args, future, loop.time()))
+        self.max_depth = max(self.max_depth, len(queue))
+        if key not in self.workers:
+            self.workers[key] = asyncio.create_task(self._drain(key, queue))
+        return future
+
+    async def run(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """Xếp hàng rồi chờ tới lượt xử lý xong"""
+        return await self.submit(key, fn, *args)
+
+    async def _drain(self, key: Hashable, queue: deque):
+        loop = asyncio.get_running_loop()
+        try:
+            while queue:
+                fn, args, future, enqueued_at = queue.popleft()
+                if future.cancelled():
+                    continue  # Người gửi đã bỏ cuộc trước khi tới lượt
+
+                started = loop.time()
+                self.wait_latency.record(started - enqueued_at)
+                try:
+                    result = await fn(*args)
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+                except Exception as e:
+                    self.failed += 1
+                    print(f"⚠️ Channel {key} event failed: {e}")
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+                finally:
+                    self.processed += 1
+                    self.run_latency.record(loop.time() - started)
+        finally:
+            for _, _, future, _ in queue:
+                future.cancel()
+            queue.clear()
+            self.workers.pop(key, None)
+            if self.queues.get(key) is queue:
+                del self.queues[key]
+
+    def depth(self, key: Hashable) -> int:
+        return len(self.queues.get(key, ()))
+
+    async def close(self):
+        """Hủy các worker còn chạy (lúc tắt bot)"""
+        workers = list(self.workers.values())
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    @staticmethod
+    def _latency_stats(tracker: LatencyTracker) -> Dict:
+        p50, p95 = tracker.percentile(0.5), tracker.percentile(0.95)
+        return {
+            'p50_ms': round(p50 * 1000, 1) if p50 is not None else None,
+            'p95_ms': round(p95 * 1000, 1) if p95 is not None else None
+        }
+
+    def get_stats(self) -> Dict:
+        return {
+            'active_channels': len(self.workers),
+            'queued': sum(len(queue) for queue in self.queues.values()),
+            'max_depth': self.max_depth,
+            'processed': self.processed,
+            'failed': self.failed,
+            'wait': self._latency_stats(self.wait_latency),
+            'run': self._latency_stats(self.run_latency)
+        }
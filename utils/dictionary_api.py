@@ -4,12 +4,26 @@ Hỗ trợ nhiều nguồn API và fallback strategy
 """
 import aiohttp
 import asyncio
+import json
 import re
-from typing import Optional, Dict, List
+import time
+from collections import deque
+from typing import Optional, Dict, List, Tuple
 import logging
+import config
+from utils.http_client import TIMEOUT_API, TIMEOUT_PAGE, client_timeout, get_http_session
+from utils.hedging import LatencyTracker, hedged_race
+from utils.single_flight import SingleFlight
+from utils.word_cache import WordCache
 
 logger = logging.getLogger(__name__)
 
+# Circuit breaker mỗi provider
+BREAKER_WINDOW = 20         # Số lần gọi gần nhất để tính tỉ lệ lỗi
+BREAKER_MIN_CALLS = 5       # Chưa đủ số lần gọi thì không mở
+BREAKER_FAILURE_RATE = 0.5  # Tỉ lệ lỗi để mở circuit
+BREAKER_COOLDOWN = 30       # Giây mở circuit trước khi thử lại (half-open)
+
 def clean_html(raw_html: str) -> str:
     """Remove HTML tags from string"""
     cleanr = re.compile('<.*?>')
@@ -17,22 +31,125 @@ def clean_html(raw_html: str) -> str:
     return ' '.join(cleantext.split())
 
 
+class ProviderUnavailable(Exception):
+    """Provider lỗi mạng / timeout / status bất thường, hoặc circuit breaker đang mở"""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker theo tỉ lệ lỗi trong cửa sổ các lần gọi gần nhất
+    closed → open (lỗi >= 50%) → half-open sau cooldown (cho 1 request thử) → closed / open lại
+    """
+    
+    def __init__(self, name: str, window: int = BREAKER_WINDOW, min_calls: int = BREAKER_MIN_CALLS,
+                 failure_rate: float = BREAKER_FAILURE_RATE, cooldown: float = BREAKER_COOLDOWN):
+        self.name = name
+        self.results: deque = deque(maxlen=window)  # True = thành công
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.cooldown = cooldown
+        self.state = 'closed'
+        self.opened_at = 0.0
+        self._probing = False
+    
+    def allow(self) -> bool:
+        """Có được gửi request không (half-open chỉ cho một request thử tại một thời điểm)"""
+        if self.state == 'closed':
+            return True
+        if self.state == 'open':
+            if time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.state = 'half_open'
+            logger.info(f"🟡 {self.name}: circuit half-open, probing")
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+    
+    def release(self):
+        """Request thử bị hủy giữa chừng (vd thua hedge) -> cho request khác thử"""
+        self._probing = False
+    
+    def record_success(self):
+        self._probing = False
+        if self.state != 'closed':
+            logger.info(f"🟢 {self.name}: circuit closed")
+            self.state = 'closed'
+            self.results.clear()
+        self.results.append(True)
+    
+    def record_failure(self):
+        self._probing = False
+        self.results.append(False)
+        if self.state == 'half_open':
+            self._open()
+        elif len(self.results) >= self.min_calls:
+            failures = self.results.count(False)
+            if failures / len(self.results) >= self.failure_rate:
+                self._open()
+    
+    def _open(self):
+        self.state = 'open'
+        self.opened_at = time.monotonic()
+        logger.warning(f"🔴 {self.name}: circuit open for {self.cooldown:.0f}s")
+    
+    def get_stats(self) -> Dict:
+        return {
+            'state': self.state,
+            'failures': self.results.count(False),
+            'window': len(self.results)
+        }
+
+
 class DictionaryAPI:
     """Base class cho Dictionary API"""
     
+    NAME = "dictionary"
+    
     def __init__(self):
         self.session: Optional[aiohttp.ClientSession] = None
+        self.inflight = SingleFlight()  # Gộp request trùng (language, word) đang chạy
+        self.breaker = CircuitBreaker(self.NAME)
+        self.latency = LatencyTracker()
     
     async def initialize(self):
-        """Initialize HTTP session"""
-        if not self.session:
-            self.session = aiohttp.ClientSession()
+        """Lấy HTTP session dùng chung (connection pool chung cho mọi provider)"""
+        if not self.session or self.session.closed:
+            self.session = get_http_session()
     
     async def close(self):
-        """Close HTTP session"""
-        if self.session:
-            await self.session.close()
-            self.session = None
+        """Bỏ tham chiếu session (session dùng chung đóng bằng close_http_session)"""
+        self.session = None
+    
+    async def _get(self, url: str, tracker: LatencyTracker, ceiling: aiohttp.ClientTimeout, **kwargs) -> Tuple[int, str]:
+        """
+        GET qua circuit breaker, timeout thích nghi theo latency đã đo (tối đa `ceiling`)
+        200/404 là câu trả lời hợp lệ; lỗi mạng, timeout, status khác -> ProviderUnavailable
+        """
+        if not self.breaker.allow():
+            raise ProviderUnavailable(f"{self.NAME} circuit open")
+        
+        await self.initialize()
+        timeout = client_timeout(tracker.adaptive_timeout(ceiling.total))
+        start = time.monotonic()
+        try:
+            async with self.session.get(url, timeout=timeout, **kwargs) as response:
+                status = response.status
+                body = await response.text()
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception as e:  # Lỗi mạng, timeout, decode...
+            self.breaker.record_failure()
+            raise ProviderUnavailable(f"{self.NAME}: {type(e).__name__} after {time.monotonic() - start:.1f}s") from e
+        
+        if status not in (200, 404):
+            self.breaker.record_failure()
+            raise ProviderUnavailable(f"{self.NAME} returned status {status}")
+        
+        self.breaker.record_success()
+        tracker.record(time.monotonic() - start)
+        return status, body
     
     async def check_word(self, word: str, language: str) -> bool:
         """
@@ -44,6 +161,9 @@ class DictionaryAPI:
         
         Returns:
             True nếu từ hợp lệ, False nếu không
+        
+        Raises:
+            ProviderUnavailable: provider lỗi / circuit breaker đang mở
         """
         raise NotImplementedError
 
@@ -55,7 +175,13 @@ class CambridgeDictionaryAPI(DictionaryAPI):
     Returns: (is_valid, word_info_dict)
     """
     
+    NAME = "Cambridge"
     BASE_URL = "https://dictionary.cambridge.org/dictionary/english"
+    VI_URL = "https://dictionary.cambridge.org/dictionary/english-vietnamese"
+    
+    def __init__(self):
+        super().__init__()
+        self.meaning_latency = LatencyTracker()  # Trang Anh-Việt đo riêng
     
     async def check_word(self, word: str, language: str) -> bool:
         """Check if English word is valid in Cambridge Dictionary"""
@@ -75,130 +201,100 @@ class CambridgeDictionaryAPI(DictionaryAPI):
         if language != 'en':
             return None
         
-        await self.initialize()
-        
-        try:
-            word_clean = word.lower().strip().replace(' ', '-')
-            url = f"{self.BASE_URL}/{word_clean}"
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            async with self.session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=8)) as response:
-                if response.status == 200:
-                    text = await response.text()
-                    
-                    # Check if it's a valid dictionary page
-                    if 'class="def ddef_d db"' not in text and 'data-id="cald4"' not in text:
-                        logger.info(f"❌ Cambridge: '{word}' not found")
-                        return None
-                    
-                    # Extract information using simple string parsing
-                    word_info = {
-                        'word': word,
-                        'phonetic': '',
-                        'definition': '',
-                        'level': None
-                    }
-                    
-                    # Extract phonetic (IPA)
-                    try:
-                        ipa_start = text.find('class="ipa dipa')
-                        if ipa_start > 0:
-                            ipa_end = text.find('</span>', ipa_start)
-                            ipa_section = text[ipa_start:ipa_end]
-                            # Get text between > and <
-                            ipa_text_start = ipa_section.rfind('>') + 1
-                            phonetic = ipa_section[ipa_text_start:].strip()
-                            if phonetic:
-                                word_info['phonetic'] = f"/{phonetic}/"
-                    except:
-                        pass
-                    
-                    # Extract first definition
-                    try:
-                        def_start = text.find('class="def ddef_d db"')
-                        if def_start > 0:
-                            def_section = text[def_start:def_start+500]
-                            def_text_start = def_section.find('>') + 1
-                            def_text_end = def_section.find('</div>')
-                            definition = def_section[def_text_start:def_text_end].strip()
-                            # Clean HTML tags
-                            definition = clean_html(definition)
-                            word_info['definition'] = definition[:150]
-                    except:
-                        pass
-                    
-                    # Check for proficiency levels
-                    text_lower = text.lower()
-                    
-                    # Regex to find exact level markers between tags
-                    # Matches A1-C2, formal, academic, specialized, technical, literary, ielts, toeic
-                    level_regex = r'>\s*(a1|a2|b1|b2|c1|c2|academic|formal|specialized|technical|literary|ielts|toeic)\s*<'
-                    level_match = re.search(level_regex, text_lower)
-                    
-                    if level_match:
-                        word_info['level'] = level_match.group(1)  # e.g., 'c1'
-                    
-                    logger.info(f"✅ Cambridge: '{word}' is valid (level: {word_info['level']})")
-                    return word_info
-                
-                elif response.status == 404:
-                    logger.info(f"❌ Cambridge: '{word}' - 404 not found")
-                    return None
-                else:
-                    logger.warning(f"Cambridge API returned status {response.status} for word '{word}'")
-                    return None
+        key = ('info', language, word.lower().strip())
+        return await self.inflight.do(key, lambda: self._fetch_word_info(word, language))
+    
+    async def _fetch_word_info(self, word: str, language: str) -> dict:
+        word_clean = word.lower().strip().replace(' ', '-')
+        status, text = await self._get(f"{self.BASE_URL}/{word_clean}", self.latency, TIMEOUT_PAGE)
         
+        if status == 404:
+            logger.info(f"❌ Cambridge: '{word}' - 404 not found")
             return None
         
-        except asyncio.TimeoutError:
-            logger.error(f"⏰ Timeout checking Cambridge for word '{word}'")  
-            return None
-        except Exception as e:
-            logger.error(f"❌ Error checking Cambridge for word '{word}': {e}")
+        # Check if it's a valid dictionary page
+        if 'class="def ddef_d db"' not in text and 'data-id="cald4"' not in text:
+            logger.info(f"❌ Cambridge: '{word}' not found")
             return None
+        
+        # Extract information using simple string parsing
+        word_info = {
+            'word': word,
+            'phonetic': '',
+            'definition': '',
+            'level': None
+        }
+        
+        # Extract phonetic (IPA)
+        try:
+            ipa_start = text.find('class="ipa dipa')
+            if ipa_start > 0:
+                ipa_end = text.find('</span>', ipa_start)
+                ipa_section = text[ipa_start:ipa_end]
+                # Get text between > and <
+                ipa_text_start = ipa_section.rfind('>') + 1
+                phonetic = ipa_section[ipa_text_start:].strip()
+                if phonetic:
+                    word_info['phonetic'] = f"/{phonetic}/"
+        except:
+            pass
+        
+        # Extract first definition
+        try:
+            def_start = text.find('class="def ddef_d db"')
+            if def_start > 0:
+                def_section = text[def_start:def_start+500]
+                def_text_start = def_section.find('>') + 1
+                def_text_end = def_section.find('</div>')
+                definition = def_section[def_text_start:def_text_end].strip()
+                # Clean HTML tags
+                definition = clean_html(definition)
+                word_info['definition'] = definition[:150]
+        except:
+            pass
+        
+        # Check for proficiency levels
+        text_lower = text.lower()
+        
+        # Regex to find exact level markers between tags
+        # Matches A1-C2, formal, academic, specialized, technical, literary, ielts, toeic
+        level_regex = r'>\s*(a1|a2|b1|b2|c1|c2|academic|formal|specialized|technical|literary|ielts|toeic)\s*<'
+        level_match = re.search(level_regex, text_lower)
+        
+        if level_match:
+            word_info['level'] = level_match.group(1)  # e.g., 'c1'
+        
+        logger.info(f"✅ Cambridge: '{word}' is valid (level: {word_info['level']})")
+        return word_info
 
     async def get_vietnamese_meaning(self, word: str) -> Optional[str]:
         """
         Get Vietnamese meaning from Cambridge English-Vietnamese Dictionary
         Returns: meaning string or None
         """
-        try:
-            word_clean = word.lower().strip().replace(' ', '-')
-            url = f"https://dictionary.cambridge.org/dictionary/english-vietnamese/{word_clean}"
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            if not self.session:
-                await self.initialize()
-
-            async with self.session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=8)) as response:
-                if response.status == 200:
-                    text = await response.text()
-                    
-                    # Extract first translation
-                    # Search for <span class="trans dtrans" lang="vi">
-                    start_marker = 'class="trans dtrans" lang="vi">'
-                    start_idx = text.find(start_marker)
-                    
-                    if start_idx > 0:
-                        # Found it
-                        content_start = start_idx + len(start_marker)
-                        end_idx = text.find('</span>', content_start)
-                        if end_idx > content_start:
-                            meaning = text[content_start:end_idx].strip()
-                            return clean_html(meaning)
-                    
-                    return None
-                else:
-                    return None
-        except Exception as e:
-            logger.error(f"❌ Error getting Vietnamese meaning for '{word}': {e}")
+        key = ('meaning', 'vi', word.lower().strip())
+        return await self.inflight.do(key, lambda: self._fetch_vietnamese_meaning(word))
+    
+    async def _fetch_vietnamese_meaning(self, word: str) -> Optional[str]:
+        word_clean = word.lower().strip().replace(' ', '-')
+        status, text = await self._get(f"{self.VI_URL}/{word_clean}", self.meaning_latency, TIMEOUT_PAGE)
+        if status != 200:
             return None
+        
+        # Extract first translation
+        # Search for <span class="trans dtrans" lang="vi">
+        start_marker = 'class="trans dtrans" lang="vi">'
+        start_idx = text.find(start_marker)
+        
+        if start_idx > 0:
+            # Found it
+            content_start = start_idx + len(start_marker)
+            end_idx = text.find('</span>', content_start)
+            if end_idx > content_start:
+                meaning = text[content_start:end_idx].strip()
+                return clean_html(meaning)
+        
+        return None
 
 
 class FreeDictionaryAPI(DictionaryAPI):
@@ -207,6 +303,7 @@ class FreeDictionaryAPI(DictionaryAPI):
     URL: https://dictionaryapi.dev/
     """
     
+    NAME = "FreeDictionary"
     BASE_URL = "https://api.dictionaryapi.dev/api/v2/entries"
     
     async def check_word(self, word: str, language: str) -> bool:
@@ -214,26 +311,11 @@ class FreeDictionaryAPI(DictionaryAPI):
         if language != 'en':
             return False
         
-        await self.initialize()
-        
-        try:
-            url = f"{self.BASE_URL}/en/{word.lower()}"
-            
-            async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                if response.status == 200:
-                    return True
-                elif response.status == 404:
-                    return False
-                else:
-                    logger.warning(f"Dictionary API returned status {response.status} for word '{word}'")
-                    return False
-        
-        except asyncio.TimeoutError:
-            logger.error(f"Timeout checking word '{word}'")
-            return False
-        except Exception as e:
-            logger.error(f"Error checking word '{word}': {e}")
-            return False
+        return await self.inflight.do(('check', language, word.lower()), lambda: self._fetch_check(word))
+    
+    async def _fetch_check(self, word: str) -> bool:
+        status, _ = await self._get(f"{self.BASE_URL}/en/{word.lower()}", self.latency, TIMEOUT_API)
+        return status == 200
 
 
 class VietnameseDictionaryAPI(DictionaryAPI):
@@ -242,6 +324,8 @@ class VietnameseDictionaryAPI(DictionaryAPI):
     Sử dụng multiple sources
     """
     
+    NAME = "Tracau"
+    
     # API endpoints (có thể thêm nhiều sources)
     SOURCES = [
         # Tratu API (Vietnamese)
@@ -253,29 +337,22 @@ class VietnameseDictionaryAPI(DictionaryAPI):
         if language != 'vi':
             return False
         
-        await self.initialize()
-        
+        return await self.inflight.do(('check', language, word.lower()), lambda: self._fetch_check(word))
+    
+    async def _fetch_check(self, word: str) -> bool:
         # Try Tracau API
-        try:
-            url = f"https://api.tracau.vn/WBBcwnwQpV89/tratu/api/v2/simple"
-            params = {'q': word.lower()}
-            
-            async with self.session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    # Kiểm tra có kết quả không
-                    if data and 'error' not in data:
-                        sentences = data.get('sentences', [])
-                        # Nếu có câu ví dụ chứa từ này -> từ hợp lệ
-                        if sentences:
-                            return True
-                    return False
-                else:
-                    return False
-        
-        except Exception as e:
-            logger.error(f"Error checking Vietnamese word '{word}': {e}")
+        status, body = await self._get(self.SOURCES[0], self.latency, TIMEOUT_API, params={'q': word.lower()})
+        if status != 200:
             return False
+        
+        data = json.loads(body) if body else None
+        # Kiểm tra có kết quả không
+        if data and 'error' not in data:
+            sentences = data.get('sentences', [])
+            # Nếu có câu ví dụ chứa từ này -> từ hợp lệ
+            if sentences:
+                return True
+        return False
 
 
 class HybridDictionaryService:
@@ -287,7 +364,7 @@ class HybridDictionaryService:
         """
         Args:
             use_api: Có sử dụng API không
-            fallback_words: Dictionary chứa local word lists {'vi': set(), 'en': set()}
+            fallback_words: Local word lists {'vi': Lexicon/set, 'en': Lexicon/set} (chỉ cần hỗ trợ `in`)
         """
         self.use_api = use_api
         self.fallback_words = fallback_words or {'vi': set(), 'en': set()}
@@ -297,12 +374,28 @@ class HybridDictionaryService:
         self.free_dict_api = FreeDictionaryAPI()       # BACKUP for English
         self.vi_api = VietnameseDictionaryAPI()        # For Vietnamese
         
-        # Cache để tránh gọi API nhiều lần cho cùng 1 từ
-        self.cache: Dict[str, bool] = {}
-        self.cache_size_limit = 1000
+        # Cache để tránh gọi API nhiều lần cho cùng 1 từ (lưu xuống đĩa, sống qua restart)
+        self.word_cache: Optional[WordCache] = None
+        if config.ENABLE_WORD_CACHE:
+            self.word_cache = WordCache(
+                config.WORD_CACHE_PATH,
+                size=config.CACHE_SIZE,
+                positive_ttl=config.WORD_CACHE_POSITIVE_TTL,
+                negative_ttl=config.WORD_CACHE_NEGATIVE_TTL
+            )
+        self.inflight = SingleFlight()
+        # Latency từng provider (p95 của Cambridge quyết định lúc hedge sang Free Dictionary)
+        self.latency: Dict[str, LatencyTracker] = {
+            'cambridge': self.cambridge_api.latency,
+            'cambridge_vi': self.cambridge_api.meaning_latency,
+            'freedictionary': self.free_dict_api.latency,
+            'tracau': self.vi_api.latency
+        }
     
     async def initialize(self):
-        """Initialize all API services"""
+        """Initialize all API services + nạp word cache"""
+        if self.word_cache:
+            await self.word_cache.initialize()
         if self.use_api:
             await self.cambridge_api.initialize()
             await self.free_dict_api.initialize()
@@ -313,6 +406,8 @@ class HybridDictionaryService:
         await self.cambridge_api.close()
         await self.free_dict_api.close()
         await self.vi_api.close()
+        if self.word_cache:
+            await self.word_cache.close()
     
     async def is_valid_word(self, word: str, language: str) -> bool:
         """
@@ -320,6 +415,7 @@ class HybridDictionaryService:
         1. Check cache
         2. English: Cambridge Dictionary (primary) → Free Dictionary (backup) → Local
         3. Vietnamese: Tracau API → Local
+        Provider đang mở circuit breaker thì bỏ qua ngay (không chờ timeout)
         
         Args:
             word: Từ cần kiểm tra
@@ -332,38 +428,46 @@ class HybridDictionaryService:
         cache_key = f"{language}:{word_lower}"
         
         # Check cache first
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        if self.word_cache:
+            cached = await self.word_cache.get(cache_key)
+            if cached:
+                return cached['valid']
         
+        # Cùng một từ đang được tra (kênh khác / người chơi gửi lại) -> chờ chung kết quả
+        return await self.inflight.do((language, word_lower), lambda: self._lookup_word(word, word_lower, language))
+    
+    async def _lookup_word(self, word: str, word_lower: str, language: str) -> bool:
+        """Tra API → local fallback, rồi ghi kết quả vào cache"""
+        cache_key = f"{language}:{word_lower}"
         result = False
+        word_info = None
         
         # Try API first
         if self.use_api:
             try:
                 if language == 'en':
-                    # Try Cambridge first (most authoritative)
+                    # Cambridge (most authoritative) → Free Dictionary, lấy luôn WordInfo cho bước tính điểm/embed
                     logger.info(f"🔍 Checking Cambridge for '{word}'...")
-                    result = await self.cambridge_api.check_word(word_lower, language)
-                    
-                    # If Cambridge fails or not found, try Free Dictionary as backup
-                    if not result:
-                        logger.info(f"🔄 Cambridge not found, trying Free Dictionary...")
-                        result = await self.free_dict_api.check_word(word_lower, language)
+                    word_info = await self._fetch_word_info(word_lower)
+                    result = word_info['valid']
                     
                 elif language == 'vi':
                     result = await self.vi_api.check_word(word_lower, language)
                 
                 # Nếu API thành công, cache và return
                 if result:
-                    self._add_to_cache(cache_key, result)
+                    # WordInfo thiếu (Cambridge bị hủy do hedge / chưa có nghĩa) thì chỉ giữ trên RAM
+                    await self._add_to_cache(cache_key, True, word_info, persist=not word_info or word_info['complete'])
                     logger.info(f"✅ API confirmed '{word}' is valid")
                     return result
                 else:
                     # API says word is invalid - this is definitive
                     logger.info(f"❌ API confirmed '{word}' is INVALID")
-                    self._add_to_cache(cache_key, False)
+                    await self._add_to_cache(cache_key, False)
                     return False
             
+            except ProviderUnavailable as e:
+                logger.info(f"⚡ {e}, using local list for '{word}'")
             except Exception as e:
                 logger.warning(f"⚠️ API check failed for '{word}': {e}, falling back to local")
         
@@ -372,34 +476,115 @@ class HybridDictionaryService:
             result = word_lower in self.fallback_words[language]
             logger.info(f"📚 Local fallback: '{word}' = {result}")
         
-        # Cache result
-        self._add_to_cache(cache_key, result)
+        # Cache result (chỉ trên RAM: kết quả local không chắc chắn bằng API)
+        await self._add_to_cache(cache_key, result, persist=False)
         
         return result
     
-    def _add_to_cache(self, key: str, value: bool):
-        """Add to cache with size limit"""
-        if len(self.cache) >= self.cache_size_limit:
-            # Remove oldest entry (simple FIFO)
-            oldest_key = next(iter(self.cache))
-            del self.cache[oldest_key]
+    async def get_word_info(self, word: str, language: str) -> Optional[Dict]:
+        """
+        WordInfo của từ tiếng Anh - ưu tiên cache (thường đã có sẵn từ bước is_valid_word)
+        
+        Returns:
+            {'word', 'valid', 'phonetic', 'definition', 'level', 'meaning_vi'} hoặc None nếu từ không hợp lệ
+        """
+        if language != 'en':
+            return None
+        
+        word_lower = word.lower().strip()
+        cache_key = f"{language}:{word_lower}"
+        
+        cached = await self.word_cache.get(cache_key) if self.word_cache else None
+        if cached and not cached['valid']:
+            return None
+        if cached and cached['info'] and 'meaning_vi' in cached['info']:
+            return cached['info']
+        
+        try:
+            word_info = await self.inflight.do(('info', word_lower), lambda: self._fetch_word_info(word_lower))
+        except ProviderUnavailable as e:
+            logger.info(f"⚡ {e}, no word info for '{word}'")
+            return None
+        await self._add_to_cache(
+            cache_key, word_info['valid'], word_info if word_info['valid'] else None,
+            persist=word_info['complete'] or not word_info['valid']
+        )
+        return word_info if word_info['valid'] else None
+    
+    async def _fetch_word_info(self, word: str) -> Dict:
+        """
+        Tải song song trang Cambridge (IPA, định nghĩa, level) và trang Anh-Việt (nghĩa), gộp thành một WordInfo
+        Cambridge chậm quá p95 thì đua thêm Free Dictionary, câu trả lời "hợp lệ" đầu tiên thắng
+        
+        Raises:
+            ProviderUnavailable: không provider nào trả lời được (không kết luận được từ không hợp lệ)
+        """
+        meaning_task = asyncio.ensure_future(self.cambridge_api.get_vietnamese_meaning(word))
+        meaning_vi = None
+        meaning_done = False
+        try:
+            info, backup_valid = await hedged_race(
+                lambda: self.cambridge_api.get_word_info(word, 'en'),
+                lambda: self.free_dict_api.check_word(word, 'en'),
+                self.latency['cambridge']
+            )
+            valid = info is not None or bool(backup_valid)
+            
+            if valid:
+                try:
+                    meaning_vi = await asyncio.wait_for(meaning_task, timeout=config.API_TIMEOUT)
+                    meaning_done = True
+                except asyncio.TimeoutError:
+                    logger.warning(f"⏰ Timeout getting Vietnamese meaning for '{word}'")
+                except ProviderUnavailable as e:
+                    logger.info(f"⚡ {e}, no Vietnamese meaning for '{word}'")
+        finally:
+            if not meaning_task.done():
+                meaning_task.cancel()
+            elif not meaning_task.cancelled():
+                meaning_task.exception()  # Từ không hợp lệ thì bỏ qua lỗi của trang nghĩa
+        
+        if info is None and valid:
+            logger.info(f"🏁 Free Dictionary confirmed '{word}' (Cambridge not found or too slow)")
         
-        self.cache[key] = value
+        return {
+            'word': word,
+            'valid': valid,
+            'phonetic': (info or {}).get('phonetic', ''),
+            'definition': (info or {}).get('definition', ''),
+            'level': (info or {}).get('level'),
+            'meaning_vi': meaning_vi,
+            'complete': info is not None and meaning_done
+        }
+    
+    async def _add_to_cache(self, key: str, valid: bool, info: Optional[Dict] = None, persist: bool = True):
+        """Lưu kết quả vào word cache (bỏ qua nếu ENABLE_WORD_CACHE tắt)"""
+        if self.word_cache:
+            await self.word_cache.put(key, valid, info, persist=persist)
+    
+    def get_latency_stats(self) -> Dict:
+        """Latency (p50/p95) và số lần hedge của từng provider"""
+        return {name: tracker.get_stats() for name, tracker in self.latency.items()}
+    
+    def get_breaker_stats(self) -> Dict:
+        """Trạng thái circuit breaker của từng provider"""
+        return {api.NAME: api.breaker.get_stats() for api in (self.cambridge_api, self.free_dict_api, self.vi_api)}
     
     def add_fallback_words(self, language: str, words: List[str]):
         """Add words to fallback list"""
-        if language not in self.fallback_words:
-            self.fallback_words[language] = set()
+        current = self.fallback_words.get(language)
+        if not isinstance(current, set):
+            # Lexicon là bất biến -> chuyển sang set riêng (chỉ khi thật sự cần thêm từ)
+            current = set(current or ())
+            self.fallback_words[language] = current
         
-        self.fallback_words[language].update(w.lower().strip() for w in words)
+        current.update(w.lower().strip() for w in words)
     
     def get_cache_stats(self) -> Dict:
         """Get cache statistics"""
-        return {
-            'size': len(self.cache),
-            'limit': self.cache_size_limit,
-            'hit_rate': 'N/A'  # Could implement hit rate tracking
-        }
+        if not self.word_cache:
+            return {'size': 0, 'limit': 0, 'hit_rate': 'N/A'}
+        return self.word_cache.get_stats()
 
 
 # Global instance (will be initialized in bot)
@@ -269,8 +269,8 @@ def create_leaderboard_embed(leaderboard_data: List[Dict], server_name: str) ->
     
     return embed
 
-def create_hint_embed(hint: str, cost: int) -> discord.Embed:
-    """Tạo embed cho gợi ý"""
+def create_hint_embed(hint: str, cost: int, examples: List[str] = None) -> discord.Embed:
+    """Tạo embed cho gợi ý (kèm vài từ ví dụ nếu có)"""
     embed = discord.Embed(
         title=f"{emojis.HINT} Gợi Ý",
         description=f"Từ tiếp theo bắt đầu bằng: **{hint}**",
@@ -284,6 +284,13 @@ def create_hint_embed(hint: str, cost: int) -> discord.Embed:
         inline=True
     )
     
+    if examples:
+        embed.add_field(
+            name="Ví Dụ",
+            value=", ".join(f"**{word}**" for word in examples),
+            inline=False
+        )
+    
     return embed
 
 def create_status_embed(game_state: Dict) -> discord.Embed:
@@ -320,6 +327,13 @@ def create_status_embed(game_state: Dict) -> discord.Embed:
     
     return embed
 
+BOT_DIFFICULTY_NOTES = {
+    'easy': "Bot chọn từ ngẫu nhiên.",
+    'normal': "Bot luôn chọn từ dài nhất!",
+    'hard': "Bot chọn từ để bạn còn ít đường nối nhất và tính trước vài lượt!"
+}
+
+
 def create_bot_challenge_embed(difficulty: str) -> discord.Embed:
     """Tạo embed cho chế độ đấu bot"""
     embed = discord.Embed(
@@ -331,7 +345,7 @@ def create_bot_challenge_embed(difficulty: str) -> discord.Embed:
     
     embed.add_field(
         name=f"{emojis.SWORD} Lưu Ý",
-        value="Bot sẽ luôn chọn từ khó và dài!\nChúc bạn may mắn!",
+        value=f"{BOT_DIFFICULTY_NOTES.get(difficulty, BOT_DIFFICULTY_NOTES['normal'])}\nChúc bạn may mắn!",
         inline=False
     )
     
@@ -0,0 +1,225 @@
+"""
+Fishing Data - Hằng số game câu cá (biome, cần, mồi, bùa, huy hiệu...)
+Tách khỏi cogs/cau_ca.py để dùng được ở nơi không cần discord (catch tables, script mô phỏng)
+"""
+from utils import emojis
+
+
+# --- CONSTANTS & CONFIGURATION ---
+
+RARITIES = {
+    "Common":    {"color": 0x95A5A6, "chance": 80, "mul": 1.0, "emoji": "⚪"},
+    "Uncommon":  {"color": 0x2ECC71, "chance": 30, "mul": 2.5, "emoji": "🟢"},
+    "Rare":      {"color": 0x3498DB, "chance": 10, "mul": 5.0, "emoji": "🔵"},
+    "Epic":      {"color": 0x9B59B6, "chance": 5,  "mul": 15.0, "emoji": "🟣"},
+    "Legendary": {"color": 0xF1C40F, "chance": 1, "mul": 50.0, "emoji": "🟡"},
+    "Mythical":  {"color": 0xE74C3C, "chance": 0.01, "mul": 500.0, "emoji": "🔴"}
+}
+
+# Hệ số XP theo độ hiếm
+XP_RARITY_MUL = {
+    "Common": 1.0, 
+    "Uncommon": 1.2, 
+    "Rare": 1.5,
+    "Epic": 2.5, 
+    "Legendary": 10.0, 
+    "Mythical": 50.0,
+    "Exotic": 100.0
+}
+
+# Tên độ hiếm tiếng Việt
+RARITY_VI = {
+    "Common": "Thường", "Uncommon": "Khá", "Rare": "Hiếm", 
+    "Epic": "Sử Thi", "Huyền Thoại": "Huyền Thoại", 
+    "Mythical": "Thần Thoại", "Exotic": "Cực Phẩm"
+}
+
+BIOMES = {
+    "River": {
+        "name": "Dòng Sông",
+        "desc": "Nơi bắt đầu của mọi cần thủ.",
+        "req_level": 1,
+        "req_money": 0,
+        "emoji": emojis.BIOME_RIVER,
+        "fish": [
+            {"name": "Cá Chép", "base_value": 10, "min_size": 10, "max_size": 30, "emoji": emojis.FISH_RAW, "spawn_rate": 35},
+            {"name": "Cá Diếp", "base_value": 20, "min_size": 5, "max_size": 20, "emoji": emojis.FISH_GOLDFISH, "spawn_rate": 30},
+            {"name": "Cá Hồi", "base_value": 30, "min_size": 30, "max_size": 60, "emoji": emojis.FISH_SALMON, "spawn_rate": 20},
+            {"name": "Cá Tuyết", "base_value": 40, "min_size": 40, "max_size": 80, "emoji": emojis.FISH_COD, "spawn_rate": 10},
+            {"name": "Cua", "base_value": 30, "min_size": 5, "max_size": 30, "emoji": emojis.FISH_CRAB, "spawn_rate": 15},
+            {"name": "Tôm", "base_value": 30, "min_size": 5, "max_size": 30, "emoji": emojis.FISH_SHRIMP, "spawn_rate": 15},
+            {"name": "Cá Koi", "base_value": 10000000, "min_size": 30, "max_size": 100, "emoji": emojis.KING_RIVER1, "spawn_rate": 0.02},
+            {"name": "Cá Vàng", "base_value": 2500000, "min_size": 5, "max_size": 30, "emoji": emojis.KING_RIVER2, "spawn_rate": 0.2},
+            {"name": "Mega Gyarados", "base_value": 50000000, "min_size": 300, "max_size": 1000, "emoji": emojis.KING_RIVER3, "spawn_rate": 0.01},
+            {"name": "Cá Mặt Trăng", "base_value": 100000, "min_size": 20, "max_size": 60, "emoji": emojis.KING_RIVER4, "spawn_rate": 0.05},
+            {"name": "Cá Xương", "base_value": 500000, "min_size": 5, "max_size": 30, "emoji": emojis.KING_RIVER5, "spawn_rate": 0.2},
+        ]
+    },
+    "Ocean": {
+        "name": "Đại Dương",
+        "desc": "Biển cả mênh mông với những loài cá lớn.",
+        "req_level": 5,
+        "req_money": 50000,
+        "emoji": emojis.BIOME_OCEAN,
+        "fish": [
+            {"name": "Cá Nhiệt Đới", "base_value": 50, "min_size": 10, "max_size": 30, "emoji": emojis.FISH_TROPICAL, "spawn_rate": 35},
+            {"name": "Cá Ngừ", "base_value": 100, "min_size": 50, "max_size": 150, "emoji": emojis.FISH_TUNA, "spawn_rate": 25},
+            {"name": "Cá Mập", "base_value": 300, "min_size": 200, "max_size": 500, "emoji": emojis.FISH_SHARK, "spawn_rate": 5},
+            {"name": "Cá Heo", "base_value": 500, "min_size": 150, "max_size": 300, "emoji": emojis.FISH_DOLPHIN, "spawn_rate": 10},
+            {"name": "Rùa Biển", "base_value": 200, "min_size": 50, "max_size": 100, "emoji": emojis.FISH_TURTLE, "spawn_rate": 15},
+            {"name": "Mực Ống", "base_value": 80, "min_size": 20, "max_size": 60, "emoji": emojis.FISH_SQUID, "spawn_rate": 10},
+            {"name": "Baby Dory", "base_value": 500000, "min_size": 5, "max_size": 30, "emoji": emojis.KING_OCEAN1, "spawn_rate": 0.05},
+            {"name": "Love Shark", "base_value": 25000000, "min_size": 200, "max_size": 800, "emoji": emojis.KING_OCEAN2, "spawn_rate": 0.02},
+            {"name": "Ngọc Trai", "base_value": 10000000, "min_size": 10, "max_size": 50, "emoji": emojis.KING_OCEAN3, "spawn_rate": 0.05},
+            {"name": "Jellyfish", "base_value": 100000, "min_size": 50, "max_size": 100, "emoji": emojis.KING_OCEAN4, "spawn_rate": 0.05},
+            {"name": "Aquaman", "base_value": 50000000, "min_size": 150, "max_size": 200, "emoji": emojis.KING_OCEAN5, "spawn_rate": 0.01},
+        ]
+    },
+    "Sky": {
+        "name": "Vùng Trời",
+        "desc": "Câu cá trên những đám mây.",
+        "req_level": 10,
+        "req_money": 100000,
+        "emoji": emojis.BIOME_SKY,
+        "fish": [
+            {"name": "Cá Cầu Vồng", "base_value": 800, "min_size": 30, "max_size": 100, "emoji": emojis.FISH_RAINBOW, "spawn_rate": 50},
+            {"name": "Cá Azure", "base_value": 1000, "min_size": 40, "max_size": 120, "emoji": emojis.FISH_AZURE, "spawn_rate": 35},
+            {"name": "Cá Kim Cương", "base_value": 2000, "min_size": 20, "max_size": 50, "emoji": emojis.FISH_DIAMOND, "spawn_rate": 15},
+            {"name": "Tiêm Kích F16", "base_value": 20000000, "min_size": 1000, "max_size": 2000, "emoji": emojis.KING_SKY1, "spawn_rate": 0.01},
+            {"name": "Phoenix", "base_value": 50000000, "min_size": 300, "max_size": 1000, "emoji": emojis.KING_SKY2, "spawn_rate": 0.005},
+            {"name": "Neon Dragon", "base_value": 100000000, "min_size": 500, "max_size": 2000, "emoji": emojis.KING_SKY3, "spawn_rate": 0.005},
+            {"name": "Mây", "base_value": 10000000, "min_size": 100, "max_size": 500, "emoji": emojis.KING_SKY4, "spawn_rate": 0.5},
+            {"name": "Cầu Vồng", "base_value": 10000000, "min_size": 100, "max_size": 500, "emoji": emojis.KING_SKY5, "spawn_rate": 0.5},
+        ]
+    },
+    "Volcano": {
+        "name": "Núi Lửa",
+        "desc": "Nóng bỏng tay, cá nướng tại chỗ.",
+        "req_level": 20,
+        "req_money": 500000,
+        "emoji": emojis.BIOME_VOLCANIC,
+        "fish": [
+            {"name": "Cá Nóng", "base_value": 1500, "min_size": 30, "max_size": 80, "emoji": emojis.FISH_HOTCOD, "spawn_rate": 50},
+            {"name": "Cá Dung Nham", "base_value": 3000, "min_size": 50, "max_size": 150, "emoji": emojis.FISH_LAVAFISH, "spawn_rate": 35},
+            {"name": "Cá Nóc Lửa", "base_value": 4000, "min_size": 40, "max_size": 90, "emoji": emojis.FISH_FIREPUFFER, "spawn_rate": 15},
+            {"name": "Altalavadrone", "base_value": 3000000, "min_size": 100, "max_size": 300, "emoji": emojis.KING_VOLCANIC1, "spawn_rate": 0.5},
+            {"name": "Fireheart", "base_value": 5000000, "min_size": 50, "max_size": 150, "emoji": emojis.KING_VOLCANIC2, "spawn_rate": 0.4},
+            {"name": "Netherstar", "base_value": 80000000, "min_size": 20, "max_size": 50, "emoji": emojis.KING_VOLCANIC3, "spawn_rate": 0.005},
+            {"name": "Netherite", "base_value": 50000000, "min_size": 30, "max_size": 80, "emoji": emojis.KING_VOLCANIC4, "spawn_rate": 0.05},
+            {"name": "Lavamerka", "base_value": 1000000, "min_size": 150, "max_size": 300, "emoji": emojis.KING_VOLCANIC5, "spawn_rate": 0.5},
+        ]
+    },
+    "Space": {
+        "name": "Vũ Trụ",
+        "desc": "Không trọng lực, cá siêu hiếm.",
+        "req_level": 40,
+        "req_money": 10000000,
+        "emoji": emojis.BIOME_SPACE,
+        "fish": [
+            {"name": "Cá Vũ Trụ", "base_value": 8000, "min_size": 100, "max_size": 300, "emoji": emojis.FISH_SPACE, "spawn_rate": 50},
+            {"name": "Cua Không Gian", "base_value": 10000, "min_size": 50, "max_size": 120, "emoji": emojis.FISH_SPACE_CRAB, "spawn_rate": 35},
+            {"name": "Cá Lục Bảo", "base_value": 15000, "min_size": 80, "max_size": 200, "emoji": emojis.FISH_EMERALD, "spawn_rate": 15},
+            {"name": "Meteor", "base_value": 100000000, "min_size": 5000, "max_size": 50000, "emoji": emojis.KING_SPACE1, "spawn_rate": 0.02},
+            {"name": "Milky Way", "base_value": 500000000, "min_size": 100000, "max_size": 500000, "emoji": emojis.KING_SPACE2, "spawn_rate": 0.001},
+            {"name": "Lọ Điều Ước", "base_value": 50000000, "min_size": 10, "max_size": 40, "emoji": emojis.KING_SPACE3, "spawn_rate": 0.5},
+            {"name": "Astronaut", "base_value": 80000000, "min_size": 150, "max_size": 250, "emoji": emojis.KING_SPACE4, "spawn_rate": 0.5},
+        ]
+    },
+    "Alien": {
+        "name": "Hành Tinh Lạ",
+        "desc": "Những sinh vật bí ẩn từ thế giới khác.",
+        "req_level": 60,
+        "req_money": 50000000,
+        "emoji": emojis.BIOME_ALIEN,
+        "fish": [
+            {"name": "Cá Ngoài Hành Tinh", "base_value": 25000, "min_size": 100, "max_size": 400, "emoji": emojis.FISH_ALIEN, "spawn_rate": 30},
+            {"name": "Vệ Binh Biển", "base_value": 40000, "min_size": 200, "max_size": 600, "emoji": emojis.FISH_GUARDIAN, "spawn_rate": 25},
+            {"name": "Axolotl Thần", "base_value": 50000, "min_size": 50, "max_size": 150, "emoji": emojis.FISH_AXOLOTL, "spawn_rate": 20},
+            {"name": "Mực Lục Bảo", "base_value": 60000, "min_size": 300, "max_size": 800, "emoji": emojis.FISH_EMERALD_SQUID, "spawn_rate": 15},
+            {"name": "Cá Ngựa Vằn", "base_value": 80000, "min_size": 100, "max_size": 200, "emoji": emojis.FISH_ZEBRA, "spawn_rate": 10},
+            {"name": "Alien Werk", "base_value": 200000000, "min_size": 100, "max_size": 300, "emoji": emojis.KING_ALIEN1, "spawn_rate": 0.05},
+            {"name": "Goku Ultra", "base_value": 1000000000, "min_size": 150, "max_size": 200, "emoji": emojis.KING_ALIEN2, "spawn_rate": 0.0001},
+            {"name": "Pink Among Us", "base_value": 10000000, "min_size": 50, "max_size": 150, "emoji": emojis.KING_ALIEN3, "spawn_rate": 0.1},
+            {"name": "Blueish UFO", "base_value": 150000000, "min_size": 500, "max_size": 2000, "emoji": emojis.KING_ALIEN4, "spawn_rate": 0.1},
+        ]
+    }
+}
+
+RODS = {
+    "Plastic Rod":    {"name": "Cần Nhựa",       "price": 0,          "power": 0,    "luck": 0,   "emoji": emojis.ROD_PLASTIC, "durability": None},
+    "Steel Rod":      {"name": "Cần Thép",       "price": 10000,       "power": 10,   "luck": 5,   "emoji": emojis.ROD_STEEL, "durability": 50},
+    "Alloy Rod":      {"name": "Cần Hợp Kim",    "price": 20000,      "power": 18,   "luck": 10,  "emoji": emojis.ROD_ALLOY, "durability": 80},
+    "Fiberglass Rod": {"name": "Cần Sợi Thủy Tinh", "price": 40000,   "power": 22,   "luck": 12,  "emoji": emojis.ROD_FIBERGLASS, "durability": 100},
+    "Golden Rod":     {"name": "Cần Vàng",       "price": 80000,      "power": 30,   "luck": 20,  "emoji": emojis.ROD_GOLDEN, "durability": 150},
+    "Floating Rod":   {"name": "Cần Nổi",        "price": 100000,      "power": 40,   "luck": 25,  "emoji": emojis.ROD_FLOATING, "durability": 180},
+    "Heavy Rod":      {"name": "Cần Hạng Nặng",  "price": 130000,      "power": 55,   "luck": 15,  "emoji": emojis.ROD_HEAVY, "durability": 200},
+    "Heavier Rod":    {"name": "Cần Siêu Nặng",  "price": 150000,      "power": 70,   "luck": 20,  "emoji": emojis.ROD_HEAVIER, "durability": 220},
+    "Lava Rod":       {"name": "Cần Dung Nham",  "price": 180000,     "power": 85,   "luck": 30,  "emoji": emojis.ROD_LAVA, "durability": 250},
+    "Magma Rod":      {"name": "Cần Magma",      "price": 200000,     "power": 100,  "luck": 35,  "emoji": emojis.ROD_MAGMA, "durability": 300},
+    "Oceanium Rod":   {"name": "Cần Đại Dương",  "price": 250000,     "power": 120,  "luck": 50,  "emoji": emojis.ROD_OCEANIUM, "durability": 400},
+    "Sky Rod":        {"name": "Cần Bầu Trời",   "price": 500000,     "power": 150,  "luck": 60,  "emoji": emojis.ROD_SKY, "durability": 500},
+    "Meteor Rod":     {"name": "Cần Thiên Thạch","price": 800000,     "power": 180,  "luck": 70,  "emoji": emojis.ROD_METEOR, "durability": 600},
+    "Space Rod":      {"name": "Cần Vũ Trụ",     "price": 1000000,    "power": 300,  "luck": 250, "emoji": emojis.ROD_SPACE, "durability": 800},
+    "Superium Rod":   {"name": "Cần Siêu Cấp",   "price": 2000000,    "power": 500,  "luck": 500, "emoji": emojis.ROD_SUPERIUM, "durability": 1000},
+    "Diamond Rod":    {"name": "Cần Kim Cương",  "price": 3000000,    "power": 4500,  "luck": 1000, "emoji": emojis.ROD_DIAMOND, "durability": 1200},
+    "Alien Rod":      {"name": "Cần Alien",      "price": 5000000,   "power": 6000,  "luck": 2500, "emoji": emojis.ROD_ALIEN, "durability": 1500},
+    "Saltspreader":   {"name": "Cần Rắc Muối",   "price": 75000000,   "power": 7500,  "luck": 3000, "emoji": emojis.ROD_SALTSPREADER, "durability": 2000},
+    "Infinity Rod":   {"name": "Cần Vô Cực",     "price": 100000000,   "power": 10000, "luck": 5000, "emoji": emojis.ROD_INFINITY, "durability": 5000},
+    "Donator Rod":    {"name": "Cần Nhà Tài Trợ","price": 0,          "power": 50, "luck": 20, "emoji": emojis.ROD_DONATOR, "description": "Cần câu dành riêng cho Nhà Tài Trợ (Không thể mua)", "durability": None},
+}
+# Map old keys to new if necessary, but here we assume clean slate or migration
+ROD_LIST = list(RODS.keys())
+
+BADGES = {
+    "Bronze":    {"name": "Huy hiệu Đồng", "desc": "Câu được tổng cộng 100 con cá", "emoji": emojis.BADGE_BRONZE, "req_type": "total_fish", "req_val": 100},
+    "Silver":    {"name": "Huy hiệu Bạc",  "desc": "Câu được tổng cộng 500 con cá", "emoji": emojis.BADGE_SILVER, "req_type": "total_fish", "req_val": 500},
+    "Gold":      {"name": "Huy hiệu Vàng", "desc": "Câu được tổng cộng 1000 con cá", "emoji": emojis.BADGE_GOLD, "req_type": "total_fish", "req_val": 1000},
+    "Platinum":  {"name": "Huy hiệu Bạch Kim", "desc": "Câu được tổng cộng 5000 con cá", "emoji": emojis.BADGE_PLATINUM, "req_type": "total_fish", "req_val": 5000},
+    "Amethyst":  {"name": "Huy hiệu Thạch Anh", "desc": "Kiếm được 1 triệu Coiz từ câu cá", "emoji": emojis.BADGE_AMETHYST, "req_type": "total_earn", "req_val": 1000000},
+    "Emerald":   {"name": "Huy hiệu Lục Bảo", "desc": "Kiếm được 10 triệu Coiz từ câu cá", "emoji": emojis.BADGE_EMERALD, "req_type": "total_earn", "req_val": 10000000},
+    "Ruby":      {"name": "Huy hiệu Hồng Ngọc", "desc": "Kiếm được 100 triệu Coiz từ câu cá", "emoji": emojis.BADGE_RUBY, "req_type": "total_earn", "req_val": 100000000},
+    "Sapphire":  {"name": "Huy hiệu Sapphire", "desc": "Sở hữu 10 loại Cần câu khác nhau", "emoji": emojis.BADGE_SAPPHIRE, "req_type": "rod_count", "req_val": 10},
+    "50Shades":  {"name": "50 Sắc Thái", "desc": "Sở hữu 20 loại Cần câu khác nhau", "emoji": emojis.BADGE_50_SHADES, "req_type": "rod_count", "req_val": 20},
+    "Admin":     {"name": "Admin", "desc": "Dành cho Admin", "emoji": emojis.BADGE_ADMIN, "req_type": "admin", "req_val": 0},
+    "Supporter": {"name": "Người Ủng Hộ", "desc": "Dành cho Donator", "emoji": emojis.BADGE_SUPPORTER, "req_type": "manual", "req_val": 0},
+    "DragonHunter": {"name": "Thợ Săn Rồng", "desc": "Sưu tập đủ 7 Viên Ngọc Rồng", "emoji": emojis.DRAGONBALL_FULL, "req_type": "dragon_balls", "req_val": 7},
+    "KingFisher": {"name": "Vua Câu Cá", "desc": "Câu được tất cả các loài Boss", "emoji": emojis.KING_ALIEN2, "req_type": "king_fish_all", "req_val": 0},
+}
+
+DRAGON_BALLS = {
+    1: {"name": "1 Sao", "emoji": emojis.DRAGONBALL_1},
+    2: {"name": "2 Sao", "emoji": emojis.DRAGONBALL_2},
+    3: {"name": "3 Sao", "emoji": emojis.DRAGONBALL_3},
+    4: {"name": "4 Sao", "emoji": emojis.DRAGONBALL_4},
+    5: {"name": "5 Sao", "emoji": emojis.DRAGONBALL_5},
+    6: {"name": "6 Sao", "emoji": emojis.DRAGONBALL_6},
+    7: {"name": "7 Sao", "emoji": emojis.DRAGONBALL_7},
+}
+
+BAITS = {
+    "Worms":           {"name": "Mồi Giun",    "price": 0,     "power": 0,  "luck": 0,  "desc": "Mồi câu cơ bản (Miễn phí).", "emoji": emojis.BAIT_WORM},
+    "Cricket":         {"name": "Dế Mèn",      "price": 200,    "power": 5,  "luck": 2,  "desc": "Thu hút cá nhỏ.", "emoji": emojis.BAIT_CRICKET},
+    "Leeches":         {"name": "Đỉa",         "price": 500,    "power": 8,  "luck": 4,  "desc": "Bám dính tốt.", "emoji": emojis.BAIT_LEECH},
+    "Minnows":         {"name": "Cá Con",      "price": 1500,   "power": 12, "luck": 8,  "desc": "Dụ cá săn mồi.", "emoji": emojis.BAIT_MINNOW},
+    "Support Bait":    {"name": "Mồi Hỗ Trợ",  "price": 15000,  "power": 30, "luck": 25, "desc": "Tăng khả năng câu.", "emoji": emojis.BAIT_SUPPORT},
+    "Magic Bait":      {"name": "Mồi Ma Thuật","price": 50000,  "power": 50, "luck": 40, "desc": "Có ma thuật huyền bí.", "emoji": emojis.BAIT_MAGIC},
+    "Wise Bait":       {"name": "Mồi Thông Thái","price": 100000,"power": 80, "luck": 60, "desc": "Dụ cá hiếm cực tốt.", "emoji": emojis.BAIT_WISE},
+    "Magnet":          {"name": "Nam Châm",    "price": 200000, "power": 30, "luck": 20, "desc": "Hút 2-4 con cá một lúc!", "emoji": emojis.BAIT_MAGNET, "is_special": True},
+}
+
+TREASURES = [
+    {"name": "Rương Gỗ",        "value": 2000,   "emoji": emojis.CHEST_UNCOMMON},
+    {"name": "Rương Sắt",       "value": 5000,   "emoji": emojis.CHEST_RARE},
+    {"name": "Rương Vàng",      "value": 20000,  "emoji": emojis.CHEST_EPIC},
+    {"name": "Rương Kim Cương", "value": 100000, "emoji": emojis.CHEST_LEGENDARY},
+    {"name": "Rương Kho Báu",   "value": 500000, "emoji": emojis.CHEST_SUPER},
+    {"name": "Cổ Vật",          "value": 1000000,"emoji": emojis.CHEST_ARTIFACT},
+]
+
+CHARMS = {
+    "Lucky Charm": {"name": "Bùa May Mắn", "price": 50000, "power": 0, "luck": 50, "duration_min": 1, "duration_max": 60, "emoji": emojis.CHARM_GREEN},
+    "Power Charm": {"name": "Bùa Sức Mạnh", "price": 50000, "power": 50, "luck": 0, "duration_min": 1, "duration_max": 60, "emoji": emojis.CHARM_RED},
+    "Golden Charm": {"name": "Bùa Vàng", "price": 50000, "power": 50, "luck": 50, "duration_min": 1, "duration_max": 60, "emoji": emojis.CHARM_YELLOW},
+    "XP Charm": {"name": "Bùa Kinh Nghiệm I", "price": 100000, "power": 0, "luck": 0, "xp_mul": 1.5, "duration_min": 1, "duration_max": 60, "emoji": "📗"},
+    "Super XP Charm": {"name": "Bùa Kinh Nghiệm II", "price": 200000, "power": 0, "luck": 0, "xp_mul": 2.0, "duration_min": 1, "duration_max": 60, "emoji": "📘"},
+}
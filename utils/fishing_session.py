@@ -0,0 +1,49 @@
+"""
+Fishing Session - Unit-of-work cho dữ liệu câu cá của một user trong một interaction
+Đọc fishing_inventory một lần, mọi thay đổi làm trên RAM, cuối cùng ghi một lần
+"""
+from typing import Dict
+
+FISHING_COLUMNS = ('rod_type', 'boat_type', 'inventory', 'upgrades', 'stats')
+
+
+class FishingSession:
+    """Giữ record get_fishing_data (VersionedRecord) và commit các cột đã thay đổi"""
+
+    def __init__(self, db, user_id: int, data):
+        self.db = db
+        self.user_id = user_id
+        self.data = data
+
+    @classmethod
+    async def load(cls, db, user_id: int) -> "FishingSession":
+        return cls(db, user_id, await db.get_fishing_data(user_id))
+
+    @property
+    def inventory(self) -> Dict:
+        return self.data['inventory']
+
+    @property
+    def stats(self) -> Dict:
+        return self.data['stats']
+
+    @property
+    def rod_type(self) -> str:
+        return self.data.get('rod_type', 'Plastic Rod')
+
+    @rod_type.setter
+    def rod_type(self, value: str):
+        self.data['rod_type'] = value
+
+    def changes(self) -> Dict:
+        """Các cột khác với lúc đọc (so với bản gốc của record)"""
+        return {
+            column: self.data[column] for column in FISHING_COLUMNS
+            if column in self.data and self.data[column] != self.data.base.get(column)
+        }
+
+    async def commit(self):
+        """Ghi tất cả thay đổi bằng một lệnh update_fishing_data (không có thay đổi thì không ghi)"""
+        changes = self.changes()
+        if changes:
+            await self.db.update_fishing_data(self.user_id, **changes, base=self.data)
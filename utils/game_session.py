@@ -0,0 +1,258 @@
+"""
+Game Session - Trạng thái game nối từ giữ trong RAM (write-behind)
+Session là nguồn dữ liệu chính trong lúc chơi, database chỉ nhận checkpoint định kỳ
+"""
+import asyncio
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import config
+from utils.bot_engine import DEFAULT_DIFFICULTY
+
+
+class GameSession:
+    """Trạng thái của một game nối từ trong một kênh"""
+
+    def __init__(self, channel_id: int, guild_id: int, language: str, current_word: str,
+                 current_player_id: int, used_words: List[str] = None, players: List[int] = None,
+                 turn_count: int = 0, started_at=None, is_bot_challenge: bool = False,
+                 turn_start_time: float = 0, wrong_attempts: int = 0, scores: Dict[str, int] = None,
+                 bot_difficulty: str = DEFAULT_DIFFICULTY):
+        self.channel_id = channel_id
+        self.guild_id = guild_id
+        self.language = language
+        self.current_word = current_word
+        self.current_player_id = current_player_id
+        self.used_words = list(used_words or [])
+        self.used_set = set(self.used_words)
+        self.players = list(players or [current_player_id])
+        self.turn_count = turn_count
+        self.started_at = started_at
+        self.is_bot_challenge = is_bot_challenge
+        self.bot_difficulty = bot_difficulty
+        self.turn_start_time = turn_start_time or time.time()
+        self.wrong_attempts = wrong_attempts
+        self.scores = dict(scores or {})
+        self.dirty = False
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "GameSession":
+        """Tạo session từ dict game_states (format của get_game_state)"""
+        return cls(
+            channel_id=state['channel_id'],
+            guild_id=state['guild_id'],
+            language=state['language'],
+            current_word=state['current_word'],
+            current_player_id=state['current_player_id'],
+            used_words=state.get('used_words') or [],
+            players=state.get('players') or [],
+            turn_count=state.get('turn_count', 0),
+            started_at=state.get('started_at'),
+            is_bot_challenge=bool(state.get('is_bot_challenge')),
+            turn_start_time=state.get('turn_start_time') or 0,
+            wrong_attempts=state.get('wrong_attempts', 0),
+            scores=state.get('scores') or {},
+            bot_difficulty=state.get('bot_difficulty') or DEFAULT_DIFFICULTY
+        )
+
+    def to_state(self) -> Dict:
+        """Xuất ra dict cùng format với get_game_state"""
+        return {
+            'channel_id': self.channel_id,
+            'guild_id': self.guild_id,
+            'language': self.language,
+            'current_word': self.current_word,
+            'current_player_id': self.current_player_id,
+            'used_words': list(self.used_words),
+            'players': list(self.players),
+            'turn_count': self.turn_count,
+            'started_at': self.started_at,
+            'is_bot_challenge': self.is_bot_challenge,
+            'turn_start_time': self.turn_start_time,
+            'wrong_attempts': self.wrong_attempts,
+            'scores': dict(self.scores),
+            'bot_difficulty': self.bot_difficulty  # Chỉ giữ trong RAM, DB không có cột này
+        }
+
+    @property
+    def turn_deadline(self) -> float:
+        """Thời điểm hết lượt hiện tại (epoch seconds)"""
+        return self.turn_start_time + config.TURN_TIMEOUT
+
+    def is_used(self, word: str) -> bool:
+        return word.lower() in self.used_set
+
+    def advance(self, new_word: str, next_player_id: int):
+        """Chuyển lượt: ghi nhận từ mới (nếu có) và reset số lần sai"""
+        word = new_word.lower()
+        if word not in self.used_set:
+            self.used_set.add(word)
+            self.used_words.append(word)
+        # Thách đấu bot: lượt của bot không thêm bot vào danh sách người chơi (stats / thưởng tính theo players)
+        if not self.is_bot_challenge and next_player_id not in self.players:
+            self.players.append(next_player_id)
+
+        self.current_word = new_word
+        self.current_player_id = next_player_id
+        self.turn_count += 1
+        self.turn_start_time = time.time()
+        self.wrong_attempts = 0
+        self.dirty = True
+
+    def add_score(self, player_id: int, points_delta: int):
+        """Cộng điểm trong phiên (key là string giống JSON)"""
+        key = str(player_id)
+        self.scores[key] = self.scores.get(key, 0) + points_delta
+        self.dirty = True
+
+    def record_wrong(self) -> int:
+        """Tăng số lần trả lời sai, trả về số lần hiện tại"""
+        self.wrong_attempts += 1
+        self.dirty = True
+        return self.wrong_attempts
+
+    def next_player_id(self, current_user_id: int) -> int:
+        """Người chơi kế tiếp theo vòng (thách đấu bot: luôn là người chơi)"""
+        if self.is_bot_challenge or current_user_id not in self.players:
+            return current_user_id
+        index = self.players.index(current_user_id)
+        return self.players[(index + 1) % len(self.players)]
+
+
+class GameSessionManager:
+    """Quản lý các GameSession và checkpoint chúng xuống database"""
+
+    def __init__(self, db, interval: float = None,
+                 on_open: Callable[[int], None] = None, on_close: Callable[[int], None] = None):
+        self.db = db
+        self.on_open = on_open    # Gọi với channel_id khi game bắt đầu (vd: đăng ký message router)
+        self.on_close = on_close  # Gọi với channel_id khi game kết thúc
+        self.interval = interval if interval is not None else config.GAME_CHECKPOINT_INTERVAL
+        self.sessions: Dict[int, GameSession] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Bắt đầu vòng checkpoint nền"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._checkpoint_loop())
+
+    async def stop(self):
+        """Dừng checkpoint và flush lần cuối"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def get(self, channel_id: int) -> Optional[GameSession]:
+        """Lấy session (nạp lười từ database nếu chưa có trong RAM)"""
+        session = self.sessions.get(channel_id)
+        if session:
+            return session
+
+        if not self.db.has_active_game(channel_id):
+            return None
+
+        state = await self.db.get_game_state(channel_id)
+        if not state:
+            return None
+
+        # Có thể đã được tạo trong lúc chờ database
+        session = self.sessions.setdefault(channel_id, GameSession.from_state(state))
+        return session
+
+    def restore(self, states: List[Dict]) -> List[GameSession]:
+        """Nạp sẵn session từ các row game_states (khôi phục lúc khởi động)"""
+        return [self.sessions.setdefault(state['channel_id'], GameSession.from_state(state)) for state in states]
+
+    async def create(self, channel_id: int, guild_id: int, language: str, first_word: str,
+                     players: List[int], is_bot_challenge: bool = False,
+                     bot_difficulty: str = DEFAULT_DIFFICULTY) -> GameSession:
+        """Tạo game mới: ghi row game_states một lần rồi giữ session trong RAM"""
+        await self.db.create_game(
+            channel_id=channel_id,
+            guild_id=guild_id,
+            language=language,
+            first_word=first_word,
+            first_player_id=players[0],
+            is_bot_challenge=is_bot_challenge
+        )
+
+        session = GameSession(
+            channel_id=channel_id,
+            guild_id=guild_id,
+            language=language,
+            current_word=first_word,
+            current_player_id=players[0],
+            used_words=[first_word.lower()],
+            players=players,
+            started_at=datetime.now().isoformat(),
+            is_bot_challenge=is_bot_challenge,
+            bot_difficulty=bot_difficulty
+        )
+        self.sessions[channel_id] = session
+        if self.on_open:
+            self.on_open(channel_id)
+
+        if len(players) > 1:
+            await self.save(session)
+        return session
+
+    async def save(self, session: GameSession):
+        """Ghi toàn bộ session xuống game_states"""
+        session.dirty = False
+        try:
+            await self.db.save_game_state(session.to_state())
+        except Exception as e:
+            session.dirty = True
+            print(f"⚠️ Game checkpoint failed for channel {session.channel_id}: {e}")
+
+    async def commit_turn(self, session: GameSession, user_id: int, word: str, points: int,
+                          is_correct: bool, next_player_id: Optional[int] = None):
+        """Áp dụng một lượt vào session rồi ghi xuống DB bằng một lệnh atomic (commit_turn)"""
+        was_dirty = session.dirty
+        session.add_score(user_id, points)
+        if is_correct:
+            session.advance(word, next_player_id)
+        else:
+            session.record_wrong()
+            if next_player_id is not None:
+                session.advance(session.current_word, next_player_id)
+        # commit_turn ghi đúng những thay đổi này -> không cần checkpoint lại
+        session.dirty = was_dirty
+
+        try:
+            await self.db.commit_turn(
+                channel_id=session.channel_id,
+                guild_id=session.guild_id,
+                user_id=user_id,
+                word=word,
+                points=points,
+                is_correct=is_correct,
+                next_player_id=next_player_id
+            )
+        except Exception as e:
+            session.dirty = True
+            print(f"⚠️ commit_turn failed for channel {session.channel_id}: {e}")
+
+    async def flush(self):
+        """Ghi tất cả session đang dirty"""
+        dirty = [s for s in self.sessions.values() if s.dirty]
+        if dirty:
+            await asyncio.gather(*(self.save(s) for s in dirty))
+
+    async def end(self, channel_id: int):
+        """Kết thúc game: bỏ session và xóa row game_states"""
+        self.sessions.pop(channel_id, None)
+        if self.on_close:
+            self.on_close(channel_id)
+        await self.db.delete_game(channel_id)
+
+    async def _checkpoint_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
@@ -0,0 +1,103 @@
+"""
+Hedging - Đo latency từng provider và đua provider dự phòng khi provider chính chậm
+Provider chính vượt p95 của chính nó thì bắn thêm provider dự phòng,
+câu trả lời "có" đầu tiên thắng, bên thua bị hủy
+Latency đo được cũng dùng cho timeout thích nghi (p99)
+"""
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+LATENCY_WINDOW = 200        # Số mẫu gần nhất giữ lại mỗi provider
+MIN_SAMPLES = 20            # Chưa đủ mẫu thì dùng delay mặc định
+HEDGE_DEFAULT_DELAY = 1.5   # giây
+HEDGE_MIN_DELAY = 0.2       # Không hedge sớm hơn mức này (tránh bắn backup cho mọi request)
+TIMEOUT_P99_MUL = 3         # Timeout thích nghi = p99 * 3 (kẹp trong [TIMEOUT_FLOOR, timeout tĩnh])
+TIMEOUT_FLOOR = 1.0         # giây
+
+
+class LatencyTracker:
+    """Cửa sổ trượt latency (giây) của một provider"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.samples: deque = deque(maxlen=window)
+        self.calls = 0
+        self.hedged = 0  # Số lần provider này chậm quá p95 và bị đua
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+        self.calls += 1
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+    def hedge_delay(self) -> float:
+        """Chờ provider này tới p95 rồi mới hedge"""
+        if len(self.samples) < MIN_SAMPLES:
+            return HEDGE_DEFAULT_DELAY
+        return max(HEDGE_MIN_DELAY, self.percentile(0.95))
+
+    def adaptive_timeout(self, ceiling: float) -> float:
+        """Timeout theo latency thực tế: provider thường nhanh thì không phải chờ hết timeout tĩnh khi nó treo"""
+        if len(self.samples) < MIN_SAMPLES:
+            return ceiling
+        return round(min(ceiling, max(TIMEOUT_FLOOR, self.percentile(0.99) * TIMEOUT_P99_MUL)), 1)
+
+    def get_stats(self) -> Dict:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            'calls': self.calls,
+            'hedged': self.hedged,
+            'p50_ms': round(p50 * 1000) if p50 is not None else None,
+            'p95_ms': round(p95 * 1000) if p95 is not None else None
+        }
+
+
+def _answer(task: Optional[asyncio.Task]) -> Any:
+    """Kết quả của task, None nếu chưa xong / bị hủy / lỗi"""
+    if task is None or not task.done() or task.cancelled() or task.exception():
+        return None
+    return task.result()
+
+
+async def hedged_race(
+    primary: Callable[[], Awaitable[Any]],
+    backup: Callable[[], Awaitable[Any]],
+    primary_latency: LatencyTracker
+) -> Tuple[Any, Any]:
+    """Chạy primary, quá p95 của primary thì chạy thêm backup
+
+    Câu trả lời truthy đầu tiên thắng, bên còn lại bị hủy. Một bên trả "không" hoặc lỗi thì chờ bên kia.
+    Primary trả "không"/lỗi trước hạn hedge thì vẫn hỏi backup (như fallback tuần tự).
+    Trả về (kết quả primary, kết quả backup); bên bị hủy, lỗi hoặc không chạy là None.
+    Không bên nào trả "có" mà có bên lỗi -> raise lỗi đó (không đủ căn cứ để kết luận "không").
+    """
+    primary_task = asyncio.ensure_future(primary())
+    backup_task = None
+    try:
+        done, _ = await asyncio.wait({primary_task}, timeout=primary_latency.hedge_delay())
+        if not done:
+            primary_latency.hedged += 1
+        elif _answer(primary_task):
+            return primary_task.result(), None
+
+        backup_task = asyncio.ensure_future(backup())
+        pending = {primary_task, backup_task} - done
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if any(_answer(task) for task in done):
+                break
+
+        primary_result, backup_result = _answer(primary_task), _answer(backup_task)
+        if not (primary_result or backup_result):
+            for task in (primary_task, backup_task):
+                if task.done() and not task.cancelled() and task.exception():
+                    raise task.exception()
+        return primary_result, backup_result
+    finally:
+        for task in (primary_task, backup_task):
+            if task is not None and not task.done():
+                task.cancel()
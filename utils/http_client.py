@@ -0,0 +1,111 @@
+"""
+HTTP - Một aiohttp session dùng chung cho các dictionary provider và donation monitor
+Connector keep-alive có giới hạn theo host + cache DNS, timeout dựng sẵn, metrics theo host
+"""
+import time
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Optional
+
+import aiohttp
+
+import config
+
+# Timeout dựng sẵn (không tạo ClientTimeout mới mỗi request)
+TIMEOUT_PAGE = aiohttp.ClientTimeout(total=8)   # Trang HTML (Cambridge)
+TIMEOUT_API = aiohttp.ClientTimeout(total=5)    # JSON API (Free Dictionary, Tracau)
+
+
+
+@lru_cache(maxsize=64)
+def client_timeout(total: float) -> aiohttp.ClientTimeout:
+    """ClientTimeout dùng lại cho timeout thích nghi (làm tròn 0.1s để số object có hạn)"""
+    return aiohttp.ClientTimeout(total=total)
+
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+class HttpMetrics:
+    """Đếm request/lỗi/latency và số connection mới vs dùng lại, theo host"""
+
+    def __init__(self):
+        self.hosts: Dict[str, Dict] = defaultdict(lambda: {
+            'requests': 0, 'errors': 0, 'total_ms': 0.0, 'new_connections': 0, 'reused_connections': 0
+        })
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_request_end.append(self._on_request_end)
+        trace.on_request_exception.append(self._on_request_exception)
+        trace.on_connection_create_end.append(self._on_connection_create)
+        trace.on_connection_reuseconn.append(self._on_connection_reuse)
+        return trace
+
+    async def _on_request_start(self, session, ctx, params):
+        ctx.start = time.monotonic()
+        ctx.host = params.url.host
+
+    async def _on_request_end(self, session, ctx, params):
+        stats = self.hosts[ctx.host]
+        stats['requests'] += 1
+        stats['total_ms'] += (time.monotonic() - ctx.start) * 1000
+
+    async def _on_request_exception(self, session, ctx, params):
+        stats = self.hosts[ctx.host]
+        stats['requests'] += 1
+        stats['errors'] += 1
+
+    async def _on_connection_create(self, session, ctx, params):
+        self.hosts[ctx.host]['new_connections'] += 1
+
+    async def _on_connection_reuse(self, session, ctx, params):
+        self.hosts[ctx.host]['reused_connections'] += 1
+
+    def get_stats(self) -> Dict:
+        return {
+            host: {
+                **stats,
+                'total_ms': round(stats['total_ms']),
+                'avg_ms': round(stats['total_ms'] / stats['requests']) if stats['requests'] else None
+            }
+            for host, stats in self.hosts.items()
+        }
+
+
+http_metrics = HttpMetrics()
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Session dùng chung (tạo lần đầu khi được gọi trong event loop)"""
+    global _session
+
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=config.HTTP_POOL_LIMIT,
+            limit_per_host=config.HTTP_LIMIT_PER_HOST,
+            ttl_dns_cache=config.HTTP_DNS_TTL,
+            keepalive_timeout=config.HTTP_KEEPALIVE,
+            enable_cleanup_closed=True
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            headers={'User-Agent': USER_AGENT},
+            trace_configs=[http_metrics.trace_config()]
+        )
+    return _session
+
+
+async def close_http_session():
+    """Đóng session dùng chung (gọi khi bot shutdown)"""
+    global _session
+
+    if _session and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+def get_http_stats() -> Dict:
+    return http_metrics.get_stats()
@@ -0,0 +1,249 @@
+"""
+Lexicon - Bộ từ điển offline bất biến, nạp một lần và dùng chung
+Định dạng nhị phân gọn (mmap được): từ đã sắp xếp nối liền + mảng offset + bảng băm
+- Kiểm tra từ: O(k) (crc32 + so sánh bytes)
+- Duyệt theo tiền tố: bisect trên thứ tự đã sắp xếp
+- Lấy từ ngẫu nhiên: O(1) qua mảng offset
+- Ứng viên cho bot: index theo chữ cái đầu / âm tiết đầu, sắp sẵn theo độ ưu tiên (dựng một lần, lazy)
+"""
+import mmap
+import os
+import random
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import config
+
+MAGIC = b'LEX1'
+HEADER = struct.Struct('<4sBIII')  # magic, byteorder (1 = little), count, table_size, blob_len
+LOAD_FACTOR = 2                    # Số slot bảng băm / số từ
+LEXICON_SUFFIX = '.lex'            # words_vi.txt -> words_vi.txt.lex
+
+
+def _normalize(word: str) -> str:
+    return word.strip().lower()
+
+
+def _first_char(word: str) -> str:
+    return word[0]
+
+
+def _first_syllable(word: str) -> str:
+    return word.split(' ', 1)[0]
+
+
+INDEX_KEYS: Dict[str, Callable[[str], str]] = {
+    'char': _first_char,
+    'syllable': _first_syllable
+}
+
+
+class Lexicon:
+    """Tập từ bất biến trên một buffer (bytes hoặc mmap)"""
+
+    def __init__(self, buffer, source: Optional[mmap.mmap] = None):
+        magic, order, count, table_size, blob_len = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a lexicon file")
+        if order != (sys.byteorder == 'little'):
+            raise ValueError("Lexicon built on a machine with different byte order")
+
+        view = memoryview(buffer)
+        pos = HEADER.size
+        self._offsets = view[pos:pos + 4 * (count + 1)].cast('I')
+        pos += 4 * (count + 1)
+        self._table = view[pos:pos + 4 * table_size].cast('I')
+        pos += 4 * table_size
+        self._blob = view[pos:pos + blob_len]
+        self._count = count
+        self._mask = table_size - 1
+        self._mmap = source  # Giữ tham chiếu để mmap không bị đóng
+        self._indexes: Dict[str, Dict[str, array]] = {}
+        self._max_length: Optional[int] = None
+        self._index_lock = threading.Lock()
+
+    # ===== BUILD / LOAD =====
+
+    @staticmethod
+    def encode(words: Iterable[str]) -> bytes:
+        """Dựng buffer nhị phân từ danh sách từ (chuẩn hóa, bỏ trùng, sắp xếp theo UTF-8)"""
+        encoded = sorted({_normalize(w).encode('utf-8') for w in words if w and w.strip()})
+        count = len(encoded)
+
+        offsets = array('I', [0])
+        for word in encoded:
+            offsets.append(offsets[-1] + len(word))
+
+        table_size = 1
+        while table_size < max(1, count * LOAD_FACTOR):
+            table_size <<= 1
+        table = array('I', bytes(4 * table_size))
+        mask = table_size - 1
+        for index, word in enumerate(encoded):
+            slot = zlib.crc32(word) & mask
+            while table[slot]:
+                slot = (slot + 1) & mask
+            table[slot] = index + 1
+
+        blob = b''.join(encoded)
+        header = HEADER.pack(MAGIC, sys.byteorder == 'little', count, table_size, len(blob))
+        return header + offsets.tobytes() + table.tobytes() + blob
+
+    @classmethod
+    def build(cls, words: Iterable[str]) -> "Lexicon":
+        return cls(cls.encode(words))
+
+    @classmethod
+    def from_text(cls, path: str) -> "Lexicon":
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.build(f)
+
+    @classmethod
+    def from_file(cls, path: str) -> "Lexicon":
+        """Memory-map file nhị phân đã build sẵn (các process dùng chung page cache)"""
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mm, source=mm)
+
+    @staticmethod
+    def compile(text_path: str, lex_path: str):
+        """Build file nhị phân từ file text (ghi file tạm rồi rename để không đọc phải file dở)"""
+        with open(text_path, 'r', encoding='utf-8') as f:
+            data = Lexicon.encode(f)
+        tmp_path = lex_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, lex_path)
+
+    # ===== LOOKUP =====
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def max_length(self) -> int:
+        """Độ dài (bytes UTF-8) của từ dài nhất, cận trên cho số ký tự"""
+        if self._max_length is None:
+            offsets = self._offsets
+            self._max_length = max((offsets[i + 1] - offsets[i] for i in range(self._count)), default=0)
+        return self._max_length
+
+    def _bytes_at(self, index: int):
+        return self._blob[self._offsets[index]:self._offsets[index + 1]]
+
+    def word_at(self, index: int) -> str:
+        return bytes(self._bytes_at(index)).decode('utf-8')
+
+    def __contains__(self, word) -> bool:
+        if not isinstance(word, str) or not self._count:
+            return False
+        key = _normalize(word).encode('utf-8')
+        slot = zlib.crc32(key) & self._mask
+        while True:
+            entry = self._table[slot]
+            if not entry:
+                return False
+            if self._bytes_at(entry - 1) == key:
+                return True
+            slot = (slot + 1) & self._mask
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._count):
+            yield self.word_at(index)
+
+    def _lower_bound(self, key: bytes) -> int:
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if bytes(self._bytes_at(mid)) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def iter_prefix(self, prefix: str) -> Iterator[str]:
+        """Các từ bắt đầu bằng prefix (theo thứ tự đã sắp xếp)"""
+        key = _normalize(prefix).encode('utf-8')
+        for index in range(self._lower_bound(key), self._count):
+            word = bytes(self._bytes_at(index))
+            if not word.startswith(key):
+                break
+            yield word.decode('utf-8')
+
+    # ===== START INDEX =====
+
+    def start_index(self, kind: str = 'char') -> Dict[str, array]:
+        """key (chữ cái đầu / âm tiết đầu) -> index các từ, sắp theo ưu tiên của bot (dài trước)
+
+        Dựng một lần O(n log n) rồi giữ lại; gọi được từ thread khác (asyncio.to_thread) để làm nóng.
+        """
+        index = self._indexes.get(kind)
+        if index is None:
+            with self._index_lock:
+                index = self._indexes.get(kind)
+                if index is None:
+                    key_fn = INDEX_KEYS[kind]
+                    buckets = defaultdict(list)
+                    for i, word in enumerate(self):
+                        buckets[key_fn(word)].append((-len(word), i))
+                    index = {key: array('I', (i for _, i in sorted(items))) for key, items in buckets.items()}
+                    self._indexes[kind] = index
+        return index
+
+    def preferred(self, key: str, kind: str = 'char') -> Iterator[str]:
+        """Các từ có chữ cái đầu / âm tiết đầu = key, từ dài nhất trước"""
+        for i in self.start_index(kind).get(_normalize(key), ()):
+            yield self.word_at(i)
+
+    def random_word(self, rng=random) -> Optional[str]:
+        if not self._count:
+            return None
+        return self.word_at(rng.randrange(self._count))
+
+    def sample(self, k: int, rng=random) -> List[str]:
+        return [self.word_at(i) for i in rng.sample(range(self._count), min(k, self._count))]
+
+
+# ===== SHARED INSTANCES =====
+
+LEXICON_PATHS = {
+    'vi': config.WORDS_VI_PATH,
+    'en': config.WORDS_EN_PATH
+}
+
+_lexicons: Dict[str, Lexicon] = {}
+
+
+def load_lexicon(text_path: str) -> Lexicon:
+    """Dùng file .lex nếu mới hơn file text, không thì build lại (và lưu .lex nếu ghi được)"""
+    lex_path = text_path + LEXICON_SUFFIX
+    try:
+        if os.path.exists(lex_path) and os.path.getmtime(lex_path) >= os.path.getmtime(text_path):
+            return Lexicon.from_file(lex_path)
+    except (OSError, ValueError) as e:
+        print(f"  ⚠️  Could not map {lex_path}: {e}, rebuilding")
+
+    try:
+        Lexicon.compile(text_path, lex_path)
+        return Lexicon.from_file(lex_path)
+    except OSError:
+        # Thư mục chỉ đọc: giữ bản build trong RAM
+        return Lexicon.from_text(text_path)
+
+
+def get_lexicon(language: str) -> Lexicon:
+    """Lexicon dùng chung của một ngôn ngữ (nạp lần đầu khi được gọi, lỗi thì trả lexicon rỗng)"""
+    lexicon = _lexicons.get(language)
+    if lexicon is None:
+        try:
+            lexicon = load_lexicon(LEXICON_PATHS[language])
+        except Exception as e:
+            print(f"  ⚠️  Could not load {language} lexicon: {e}")
+            lexicon = Lexicon.build([])
+        _lexicons[language] = lexicon
+    return lexicon
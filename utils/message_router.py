@@ -0,0 +1,73 @@
+"""
+Message Router - Một listener on_message duy nhất, chuyển tin nhắn tới đúng cog đang có game trong kênh
+Bảng channel -> handler nằm trong RAM: kênh không có game thì bỏ qua ngay, không cog nào phải chạy
+Tin nhắn rõ ràng không phải câu trả lời (nhiều dòng, mention, file đính kèm, quá dài) bị loại trước khi gọi handler
+"""
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import discord
+
+Handler = Callable[[discord.Message], Awaitable[None]]
+
+
+class MessageRouter:
+    """channel_id -> các route {'owner', 'handler', 'max_length'}, route đăng ký sau cùng nhận tin nhắn"""
+
+    def __init__(self):
+        self.routes: Dict[int, List[Dict]] = {}
+        self.dispatched = 0
+        self.rejected = 0
+
+    def register(self, channel_id: int, owner: str, handler: Handler, max_length: Optional[int] = None):
+        """Cog nhận tin nhắn của kênh (gọi lại khi đã đăng ký thì chỉ đưa route lên đầu)"""
+        routes = [r for r in self.routes.get(channel_id, []) if r['owner'] != owner]
+        routes.append({'owner': owner, 'handler': handler, 'max_length': max_length})
+        self.routes[channel_id] = routes
+
+    def unregister(self, channel_id: int, owner: str):
+        """Bỏ route của owner, route còn lại (nếu có) nhận tin nhắn tiếp"""
+        routes = [r for r in self.routes.get(channel_id, []) if r['owner'] != owner]
+        if routes:
+            self.routes[channel_id] = routes
+        else:
+            self.routes.pop(channel_id, None)
+
+    def owner(self, channel_id: int) -> Optional[str]:
+        routes = self.routes.get(channel_id)
+        return routes[-1]['owner'] if routes else None
+
+    @staticmethod
+    def accepts(message: discord.Message, max_length: Optional[int]) -> bool:
+        """Lọc rẻ: câu trả lời game luôn là một dòng chữ ngắn, không mention, không file"""
+        content = message.content.strip()
+        if not content or '\n' in content:
+            return False
+        # So độ dài sau khi gộp khoảng trắng (cog chuẩn hóa như vậy trước khi so đáp án)
+        if max_length is not None and len(content) > max_length and len(' '.join(content.split())) > max_length:
+            return False
+        if message.attachments or message.mentions or message.role_mentions or message.mention_everyone:
+            return False
+        return True
+
+    async def dispatch(self, message: discord.Message):
+        """Listener on_message: gọi đúng một handler (hoặc không gọi gì)"""
+        if message.author.bot:
+            return
+        routes = self.routes.get(message.channel.id)
+        if not routes:
+            return
+
+        route = routes[-1]
+        if not self.accepts(message, route['max_length']):
+            self.rejected += 1
+            return
+
+        self.dispatched += 1
+        await route['handler'](message)
+
+    def get_stats(self) -> Dict:
+        return {
+            'channels': len(self.routes),
+            'dispatched': self.dispatched,
+            'rejected': self.rejected
+        }
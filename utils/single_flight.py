@@ -0,0 +1,47 @@
+"""
+Single Flight - Gộp các lookup trùng nhau đang chạy cùng lúc
+Nhiều caller cùng key chỉ tạo một request upstream, tất cả nhận chung kết quả
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Bảng future đang bay theo key (mỗi provider giữ một bảng riêng)"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[Hashable, int] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Chạy fn() nếu chưa có request nào cho key, nếu có thì chờ chung request đó"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            # shield: một caller bị cancel (timeout lượt chơi, thua hedge...) không hủy request của những caller còn lại
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # Caller cuối cùng bỏ cuộc -> hủy luôn request upstream
+            if self._waiters.get(key) == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            remaining = self._waiters.get(key, 1) - 1
+            if remaining > 0:
+                self._waiters[key] = remaining
+            else:
+                self._waiters.pop(key, None)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Đánh dấu đã xử lý lỗi nếu không còn ai chờ
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
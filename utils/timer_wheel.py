@@ -0,0 +1,210 @@
+"""
+Timer Wheel - Bộ hẹn giờ dùng chung cho mọi timeout của các game
+Hierarchical timing wheel: đặt / hủy timer O(1), một task nền duy nhất quay bánh xe theo tick
+thay vì mỗi lượt chơi một task asyncio.sleep riêng
+Timer định danh theo key (vd: (channel_id, 'turn')), đặt lại cùng key thì thay timer cũ
+"""
+import asyncio
+import math
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set
+
+import config
+
+WHEEL_BITS = 6                    # 64 slot mỗi tầng
+WHEEL_SIZE = 1 << WHEEL_BITS
+WHEEL_MASK = WHEEL_SIZE - 1
+WHEEL_LEVELS = 3                  # Tick 0.1s: tầng 0 ~6.4s, tầng 1 ~7 phút, tầng 2 ~7 giờ (xa hơn thì quay vòng lại)
+
+
+class Timer:
+    __slots__ = ('key', 'deadline', 'expires', 'callback', 'args', 'slot')
+
+    def __init__(self, key: Hashable, deadline: float, expires: int, callback: Callable, args: tuple):
+        self.key = key
+        self.deadline = deadline  # Thời điểm hẹn (loop.time())
+        self.expires = expires    # Tick hết hạn
+        self.callback = callback
+        self.args = args
+        self.slot: Optional[Set["Timer"]] = None
+
+
+class TimerWheel:
+    """Scheduler dùng chung: schedule(key, delay, callback, *args) / cancel(key)
+
+    callback có thể là hàm thường hoặc coroutine function (được chạy thành task lúc timer nổ).
+    """
+
+    def __init__(self, tick: float = None):
+        self.tick = tick if tick is not None else config.TIMER_TICK
+        self.wheels: List[List[Set[Timer]]] = [[set() for _ in range(WHEEL_SIZE)] for _ in range(WHEEL_LEVELS)]
+        self.timers: Dict[Hashable, Timer] = {}
+        self.current = 0              # Tick đã xử lý tới
+        self._origin: Optional[float] = None
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+        # Thống kê
+        self.fired = 0
+        self.cancelled = 0
+        self.total_late = 0.0
+        self.max_late = 0.0
+
+    # ===== LIFECYCLE =====
+
+    def start(self):
+        if self._task is None or self._task.done():
+            if self._origin is None:
+                self._origin = self._now()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Dừng bánh xe, bỏ các timer chưa nổ và hủy callback đang chạy"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._running):
+            task.cancel()
+        for timer in list(self.timers.values()):
+            self._unlink(timer)
+
+    # ===== API =====
+
+    def _now(self) -> float:
+        return asyncio.get_running_loop().time()
+
+    def _tick_of(self, when: float) -> int:
+        return math.ceil((when - self._origin) / self.tick)
+
+    def schedule(self, key: Hashable, delay: float, callback: Callable, *args: Any) -> Timer:
+        """Hẹn callback(*args) sau `delay` giây (thay timer cũ cùng key nếu có)"""
+        if self._origin is None:
+            self._origin = self._now()
+        self.cancel(key)
+
+        now = self._now()
+        if not self.timers:
+            # Bánh xe rảnh: đồng bộ lại tick hiện tại (không có timer nào bị ảnh hưởng)
+            self.current = max(self.current, int((now - self._origin) / self.tick))
+
+        deadline = now + max(0.0, delay)
+        timer = Timer(key, deadline, max(self.current + 1, self._tick_of(deadline)), callback, args)
+        self.timers[key] = timer
+        self._place(timer)
+        self._wakeup.set()
+        return timer
+
+    def cancel(self, key: Hashable) -> bool:
+        """Hủy timer theo key, trả về True nếu có timer đang chờ"""
+        timer = self.timers.get(key)
+        if timer is None:
+            return False
+        self._unlink(timer)
+        self.cancelled += 1
+        return True
+
+    def remaining(self, key: Hashable) -> Optional[float]:
+        """Số giây còn lại trước khi timer nổ, None nếu không có"""
+        timer = self.timers.get(key)
+        if timer is None:
+            return None
+        return max(0.0, timer.deadline - self._now())
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.timers
+
+    def pending(self) -> int:
+        return len(self.timers)
+
+    # ===== WHEEL =====
+
+    def _place(self, timer: Timer):
+        delta = timer.expires - self.current
+        for level in range(WHEEL_LEVELS):
+            if delta < WHEEL_SIZE << (WHEEL_BITS * level) or level == WHEEL_LEVELS - 1:
+                break
+        # Quá tầm tầng cao nhất: đặt ở slot xa nhất, tới lượt slot đó sẽ được xếp lại
+        expires = min(timer.expires, self.current + (WHEEL_SIZE << (WHEEL_BITS * level)) - 1)
+        slot = self.wheels[level][(expires >> (WHEEL_BITS * level)) & WHEEL_MASK]
+        slot.add(timer)
+        timer.slot = slot
+
+    def _unlink(self, timer: Timer):
+        if timer.slot is not None:
+            timer.slot.discard(timer)
+            timer.slot = None
+        if self.timers.get(timer.key) is timer:
+            del self.timers[timer.key]
+
+    def _advance(self):
+        """Xử lý tick kế tiếp: hạ các timer tầng trên xuống khi tầng dưới quay hết vòng, rồi nổ slot tầng 0"""
+        self.current += 1
+        tick = self.current
+        wrapped = 1
+        while wrapped < WHEEL_LEVELS and not tick & ((1 << (WHEEL_BITS * wrapped)) - 1):
+            wrapped += 1
+        # Tầng cao trước: timer hạ từ tầng 2 có thể rơi vào đúng slot tầng 1 sắp được hạ tiếp
+        for level in range(wrapped - 1, 0, -1):
+            slot = self.wheels[level][(tick >> (WHEEL_BITS * level)) & WHEEL_MASK]
+            timers = list(slot)
+            slot.clear()
+            for timer in timers:
+                timer.slot = None
+                self._place(timer)
+
+        slot = self.wheels[0][tick & WHEEL_MASK]
+        if not slot:
+            return
+        due = [timer for timer in slot if timer.expires <= tick]
+        for timer in due:
+            self._unlink(timer)
+            self._fire(timer)
+
+    def _fire(self, timer: Timer):
+        late = max(0.0, self._now() - timer.deadline)
+        self.fired += 1
+        self.total_late += late
+        self.max_late = max(self.max_late, late)
+        try:
+            result = timer.callback(*timer.args)
+        except Exception as e:
+            print(f"⚠️ Timer {timer.key} failed: {e}")
+            return
+        if asyncio.iscoroutine(result):
+            task = asyncio.create_task(result)
+            self._running.add(task)
+            task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task):
+        self._running.discard(task)
+        if not task.cancelled() and task.exception():
+            print(f"⚠️ Timer callback failed: {task.exception()}")
+
+    async def _run(self):
+        while True:
+            if not self.timers:
+                # Không có timer: ngủ tới khi có schedule mới, không quay tick vô ích
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            target = int((self._now() - self._origin) / self.tick)
+            while self.current < target and self.timers:
+                self._advance()
+            if not self.timers:
+                continue
+            next_tick = self._origin + (self.current + 1) * self.tick
+            await asyncio.sleep(max(0.0, next_tick - self._now()))
+
+    def get_stats(self) -> Dict:
+        return {
+            'pending': len(self.timers),
+            'running': len(self._running),
+            'fired': self.fired,
+            'cancelled': self.cancelled,
+            'avg_late_ms': round(self.total_late / self.fired * 1000, 1) if self.fired else None,
+            'max_late_ms': round(self.max_late * 1000, 1) if self.fired else None
+        }
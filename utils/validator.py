@@ -7,18 +7,21 @@ import unicodedata
 import re
 from typing import List, Tuple, Optional
 from utils.dictionary_api import dictionary_service
+from utils.lexicon import Lexicon
+from utils.bot_engine import BotEngine, DEFAULT_DIFFICULTY
 
 class WordValidator:
-    def __init__(self, language: str, word_list: List[str]):
+    def __init__(self, language: str, lexicon: Lexicon):
         """
-        Initialize validator với ngôn ngữ và danh sách từ
+        Initialize validator với ngôn ngữ và lexicon
         
         Args:
             language: 'vi' hoặc 'en'
-            word_list: Danh sách các từ hợp lệ
+            lexicon: Lexicon dùng chung (utils.lexicon.get_lexicon)
         """
         self.language = language
-        self.word_list = set(w.lower().strip() for w in word_list)
+        self.lexicon = lexicon
+        self.bot_engine = BotEngine(lexicon, self.get_last_char)
     
     def normalize_vietnamese(self, text: str) -> str:
         """
@@ -62,7 +65,7 @@ class WordValidator:
             return await dictionary_service.is_valid_word(word, self.language)
         
         # Fallback: check local list
-        return word in self.word_list
+        return word in self.lexicon
     
     async def can_chain(self, previous_word: str, new_word: str) -> Tuple[bool, str]:
         """
@@ -106,39 +109,39 @@ class WordValidator:
         """
         return self.get_last_char(word).upper()
     
-    def find_possible_words(self, start_char: str, used_words: set, limit: int = 5) -> List[str]:
+    def find_possible_words(self, start: str, used_words: set, limit: int = 5) -> List[str]:
         """
-        Tìm các từ có thể dùng bắt đầu bằng start_char (chưa dùng)
+        Tìm các từ có thể dùng (chưa dùng), từ dài nhất trước
+        Dùng index dựng sẵn của lexicon: chỉ duyệt tới khi đủ `limit` từ chưa có trong used_words
         
         Args:
-            start_char: Ký tự bắt đầu
-            used_words: Set các từ đã dùng
+            start: Ký tự bắt đầu, hoặc cả âm tiết đầu (tiếng Việt)
+            used_words: Set các từ đã dùng trong game
             limit: Số lượng từ tối đa trả về
         
         Returns:
             List các từ có thể dùng
         """
-        start_char = start_char.lower()
-        possible = [
-            word for word in self.word_list 
-            if word.startswith(start_char) and word not in used_words
-        ]
+        kind = 'syllable' if self.language == 'vi' and len(start.strip()) > 1 else 'char'
+        possible = []
+        for word in self.lexicon.preferred(start, kind):
+            if word not in used_words:
+                possible.append(word)
+                if len(possible) >= limit:
+                    break
         
-        # Sắp xếp theo độ dài (ưu tiên từ dài cho bot challenge)
-        possible.sort(key=len, reverse=True)
-        
-        return possible[:limit]
+        return possible
     
-    def get_bot_word(self, start_char: str, used_words: set) -> str:
+    def get_bot_word(self, start_char: str, used_words: set, difficulty: str = DEFAULT_DIFFICULTY) -> str:
         """
-        Bot chọn từ khó (dài và ít phổ biến) để thách đấu người chơi
+        Bot chọn từ theo độ khó (easy / normal / hard) để thách đấu người chơi
         """
-        possible = self.find_possible_words(start_char, used_words, limit=10)
-        
-        # Chọn từ dài nhất
-        if possible:
-            return possible[0]
-        
+        return self.bot_engine.choose(start_char, used_words, difficulty)
+
+    async def get_word_info(self, word: str) -> Optional[dict]:
+        """Word info (phonetic, definition, level) qua dictionary service (có cache)"""
+        if dictionary_service:
+            return await dictionary_service.get_word_info(word, self.language)
         return None
 
     @property
@@ -7,13 +7,20 @@ import urllib.parse
 import datetime
 import random
 import time
-SUPABASE_IMPORT_ERROR = None
-try:
-    from supabase import create_client, Client
-except ImportError as e:
-    print(f"CRITICAL ERROR: Could not import supabase in views.py: {e}")
-    SUPABASE_IMPORT_ERROR = str(e)
-    create_client = None
+from utils.http_client import get_http_session
+from database.postgrest_client import PostgrestClient
+
+
+def get_donation_client():
+    """PostgREST async trên session HTTP dùng chung (như cogs/donation.py), None nếu chưa cấu hình Supabase"""
+    if not (config.SUPABASE_URL and config.SUPABASE_KEY):
+        return None
+    return PostgrestClient(
+        config.SUPABASE_URL.strip(), config.SUPABASE_KEY.strip(),
+        timeout=config.SUPABASE_TIMEOUT,
+        retries=config.SUPABASE_RETRIES,
+        session_factory=get_http_session
+    )
 
 
 class DonationModal(ui.Modal):
@@ -51,23 +58,23 @@ class DonationModal(ui.Modal):
         expiry_timestamp = int(expiry_time.timestamp())
         
         # Insert Pending Transaction to Supabase
-        if not (config.SUPABASE_URL and config.SUPABASE_KEY and create_client):
-             print(f"DEBUG: Supabase Config Error. URL={bool(config.SUPABASE_URL)}, Key={bool(config.SUPABASE_KEY)}, Lib={bool(create_client)}")
-             error_msg = f"❌ Lỗi hệ thống: Bot chưa tải được thư viện Supabase.\nLỗi chi tiết: `{SUPABASE_IMPORT_ERROR}`"
+        rest = get_donation_client()
+        if not rest:
+             print(f"DEBUG: Supabase Config Error. URL={bool(config.SUPABASE_URL)}, Key={bool(config.SUPABASE_KEY)}")
+             error_msg = "❌ Lỗi hệ thống: Bot chưa được cấu hình Supabase."
              if not config.SUPABASE_KEY: error_msg += "\n(Thiếu KEY)"
              await interaction.response.send_message(error_msg, ephemeral=True)
              return
 
         try:
-            sb = create_client(config.SUPABASE_URL.strip(), config.SUPABASE_KEY.strip())
-            sb.table('transactions').insert({
+            await rest.insert('transactions', {
                 'user_id': interaction.user.id,
                 'amount': amount_val,
                 'description': order_content,
                 'status': 'pending',
                 'created_at': datetime.datetime.now().isoformat(),
                 'metadata': {'method': self.method}
-            }).execute()
+            })
         except Exception as e:
             print(f"Error creating pending txn: {e}")
             await interaction.response.send_message(f"❌ Không thể tạo đơn hàng: {e}", ephemeral=True)
@@ -107,16 +114,12 @@ class DonationModal(ui.Modal):
         await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
         
         # Start background task to monitor transaction status
-        asyncio.create_task(monitor_transaction(interaction, order_content, expiry_seconds))
+        asyncio.create_task(monitor_transaction(interaction, order_content, expiry_seconds, rest))
 
-async def monitor_transaction(interaction: discord.Interaction, order_code: str, duration: int):
-    # Initialize Supabase client for this task
-    sb = None
-    if config.SUPABASE_URL and config.SUPABASE_KEY and create_client:
-        try:
-            sb = create_client(config.SUPABASE_URL, config.SUPABASE_KEY)
-        except Exception as e:
-            print(f"Error initializing Supabase in monitor: {e}")
+async def monitor_transaction(interaction: discord.Interaction, order_code: str, duration: int,
+                              rest: PostgrestClient = None):
+    # Client async trên session dùng chung (không chặn event loop mỗi 5 giây)
+    sb = rest or get_donation_client()
 
     end_time = time.time() + duration
     
@@ -124,9 +127,9 @@ async def monitor_transaction(interaction: discord.Interaction, order_code: str,
         if sb:
             try:
                 # Check status
-                response = sb.table('transactions').select("status, amount").eq('description', order_code).execute()
-                if response.data:
-                    data = response.data[0]
+                rows = await sb.select('transactions', "status, amount", {'description': order_code})
+                if rows:
+                    data = rows[0]
                     status = data.get('status')
                     
                     if status == 'success':
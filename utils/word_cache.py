@@ -0,0 +1,162 @@
+"""
+Word Cache - Cache kết quả tra từ (hợp lệ + word info) lưu xuống SQLite
+Key dạng `language:word`, từ hợp lệ và không hợp lệ có TTL riêng
+Lúc khởi động nạp các từ hay dùng nhất lên RAM (LRU giới hạn theo CACHE_SIZE)
+"""
+import aiosqlite
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WordCache:
+    """LRU trên RAM + bảng word_cache trên đĩa (write-through)"""
+
+    def __init__(self, path: str, size: int = 1000, positive_ttl: int = 30 * 86400, negative_ttl: int = 86400):
+        self.path = path
+        self.size = size
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.conn: Optional[aiosqlite.Connection] = None
+        # key -> {'valid', 'info', 'updated_at', 'persist'}
+        self.memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._pending_hits: Dict[str, int] = {}  # Hit chưa ghi xuống đĩa (flush khi close)
+        self.hits = 0
+        self.misses = 0
+
+    async def initialize(self):
+        """Mở DB, dọn entry hết hạn và nạp các entry nóng lên RAM"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = await aiosqlite.connect(self.path)
+        await self.conn.execute("PRAGMA journal_mode=WAL")
+        await self.conn.execute("PRAGMA synchronous=NORMAL")
+        await self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS word_cache (
+                key TEXT PRIMARY KEY,
+                valid INTEGER NOT NULL,
+                info TEXT,
+                updated_at REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        await self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_word_cache_hits ON word_cache(hits DESC)"
+        )
+
+        now = time.time()
+        await self.conn.execute(
+            "DELETE FROM word_cache WHERE (valid = 1 AND updated_at < ?) OR (valid = 0 AND updated_at < ?)",
+            (now - self.positive_ttl, now - self.negative_ttl)
+        )
+        await self.conn.commit()
+
+        # Từ nhiều hit nhất vào cuối OrderedDict (gần MRU) để bị evict sau cùng
+        async with self.conn.execute(
+            "SELECT key, valid, info, updated_at FROM word_cache ORDER BY hits DESC, updated_at DESC LIMIT ?",
+            (self.size,)
+        ) as cursor:
+            rows = await cursor.fetchall()
+        for key, valid, info, updated_at in reversed(rows):
+            self.memory[key] = self._entry(valid, info, updated_at)
+
+        logger.info(f"💾 Word cache: loaded {len(self.memory)} hot entries from {self.path}")
+
+    async def close(self):
+        """Ghi số hit còn treo rồi đóng DB"""
+        if self.conn:
+            await self._flush_hits()
+            await self.conn.close()
+            self.conn = None
+
+    @staticmethod
+    def _entry(valid, info, updated_at: float, persist: bool = True) -> Dict:
+        if isinstance(info, str):
+            info = json.loads(info)
+        return {'valid': bool(valid), 'info': info, 'updated_at': updated_at, 'persist': persist}
+
+    def _expired(self, entry: Dict, now: float) -> bool:
+        ttl = self.positive_ttl if entry['valid'] else self.negative_ttl
+        return now - entry['updated_at'] > ttl
+
+    def _remember(self, key: str, entry: Dict):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.size:
+            self.memory.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[Dict]:
+        """Trả về {'valid', 'info'} nếu còn hạn, None nếu chưa có/hết hạn"""
+        now = time.time()
+        entry = self.memory.get(key)
+
+        if entry is None and self.conn:
+            async with self.conn.execute(
+                "SELECT valid, info, updated_at FROM word_cache WHERE key = ?", (key,)
+            ) as cursor:
+                row = await cursor.fetchone()
+            if row:
+                entry = self._entry(*row)
+                self._remember(key, entry)
+
+        if entry is None or self._expired(entry, now):
+            if entry is not None:
+                self.memory.pop(key, None)
+            self.misses += 1
+            return None
+
+        self.memory.move_to_end(key)
+        self.hits += 1
+        if entry['persist']:
+            self._pending_hits[key] = self._pending_hits.get(key, 0) + 1
+        return entry
+
+    async def put(self, key: str, valid: bool, info: Optional[Dict] = None, persist: bool = True):
+        """Lưu kết quả tra từ
+
+        info=None nghĩa là chưa tra word info ({} = đã tra nhưng không có).
+        persist=False chỉ giữ trên RAM (vd: kết quả từ local fallback khi API lỗi).
+        """
+        if info is None and key in self.memory:
+            info = self.memory[key]['info']
+        entry = self._entry(valid, info, time.time(), persist)
+        self._remember(key, entry)
+        if not persist or not self.conn:
+            return
+
+        info_json = json.dumps(info, ensure_ascii=False) if info is not None else None
+        await self.conn.execute('''
+            INSERT INTO word_cache (key, valid, info, updated_at, hits) VALUES (?, ?, ?, ?, 0)
+            ON CONFLICT(key) DO UPDATE SET
+                valid = excluded.valid,
+                info = COALESCE(excluded.info, word_cache.info),
+                updated_at = excluded.updated_at
+        ''', (key, int(valid), info_json, entry['updated_at']))
+        await self.conn.commit()
+
+    async def _flush_hits(self):
+        if not self._pending_hits:
+            return
+        pending, self._pending_hits = self._pending_hits, {}
+        await self.conn.executemany(
+            "UPDATE word_cache SET hits = hits + ? WHERE key = ?",
+            [(count, key) for key, count in pending.items()]
+        )
+        await self.conn.commit()
+
+    def get_stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            'size': len(self.memory),
+            'limit': self.size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': f"{self.hits / total:.1%}" if total else 'N/A'
+        }